@@ -0,0 +1,56 @@
+"""sports_centers.geohash for radius search
+
+Revision ID: 3b7d2e91c4a0
+Revises: 8aa66d94db33
+Create Date: 2026-10-18 10:12:41.512907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from utils.geo import geohash_encode
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7d2e91c4a0'
+down_revision: Union[str, Sequence[str], None] = '8aa66d94db33'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('sports_centers', sa.Column('geohash', sa.String(length=12), nullable=True))
+
+    # Preenche o geohash dos centros já cadastrados
+    conn = op.get_bind()
+    sports_centers = sa.table(
+        'sports_centers',
+        sa.column('id', sa.Integer),
+        sa.column('latitude', sa.Numeric),
+        sa.column('longitude', sa.Numeric),
+        sa.column('geohash', sa.String),
+    )
+    rows = conn.execute(
+        sa.select(sports_centers.c.id, sports_centers.c.latitude, sports_centers.c.longitude)
+    ).all()
+    if rows:
+        conn.execute(
+            sports_centers.update()
+            .where(sports_centers.c.id == sa.bindparam('row_id'))
+            .values(geohash=sa.bindparam('row_geohash')),
+            [
+                {'row_id': id_, 'row_geohash': geohash_encode(float(lat), float(lon))}
+                for id_, lat, lon in rows
+            ],
+        )
+
+    op.create_index(op.f('ix_sports_centers_geohash'), 'sports_centers', ['geohash'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_sports_centers_geohash'), table_name='sports_centers')
+    op.drop_column('sports_centers', 'geohash')
@@ -0,0 +1,53 @@
+"""bookings.end_time
+
+Revision ID: 5e0c8a17f2d9
+Revises: 3b7d2e91c4a0
+Create Date: 2026-10-18 14:03:27.118402
+
+"""
+from datetime import timedelta
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e0c8a17f2d9'
+down_revision: Union[str, Sequence[str], None] = '3b7d2e91c4a0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('bookings', sa.Column('end_time', sa.DateTime(), nullable=True))
+
+    # Reservas antigas não tinham fim: assume 1 hora (preço é por hora)
+    conn = op.get_bind()
+    bookings = sa.table(
+        'bookings',
+        sa.column('id', sa.Integer),
+        sa.column('start_time', sa.DateTime),
+        sa.column('end_time', sa.DateTime),
+    )
+    rows = conn.execute(sa.select(bookings.c.id, bookings.c.start_time)).all()
+    if rows:
+        conn.execute(
+            bookings.update()
+            .where(bookings.c.id == sa.bindparam('row_id'))
+            .values(end_time=sa.bindparam('row_end_time')),
+            [
+                {'row_id': id_, 'row_end_time': start + timedelta(hours=1)}
+                for id_, start in rows
+            ],
+        )
+
+    with op.batch_alter_table('bookings') as batch_op:
+        batch_op.alter_column('end_time', existing_type=sa.DateTime(), nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('bookings') as batch_op:
+        batch_op.drop_column('end_time')
@@ -0,0 +1,68 @@
+"""bookings: no overlapping active bookings per field
+
+Revision ID: 9f41b6d3a8e2
+Revises: 5e0c8a17f2d9
+Create Date: 2026-10-18 16:41:09.730255
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9f41b6d3a8e2'
+down_revision: Union[str, Sequence[str], None] = '5e0c8a17f2d9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Cópia congelada do DDL de models.models nesta revisão: a migração não pode
+# mudar se o model mudar depois
+CONSTRAINT = 'ex_bookings_field_time'
+
+_SQLITE_OVERLAP_CHECK = """
+    WHEN COALESCE(NEW.status, '') <> 'cancelled' AND EXISTS (
+        SELECT 1 FROM bookings
+        WHERE field_id = NEW.field_id
+          AND COALESCE(status, '') <> 'cancelled'
+          AND start_time < NEW.end_time
+          AND end_time > NEW.start_time
+          {extra}
+    )
+    BEGIN SELECT RAISE(ABORT, 'ex_bookings_field_time'); END
+"""
+
+DDL = {
+    'postgresql': [
+        'CREATE EXTENSION IF NOT EXISTS btree_gist',
+        'ALTER TABLE bookings ADD CONSTRAINT ex_bookings_field_time'
+        ' EXCLUDE USING gist (field_id WITH =, tsrange(start_time, end_time) WITH &&)'
+        " WHERE (status IS DISTINCT FROM 'cancelled')",
+    ],
+    'sqlite': [
+        'CREATE TRIGGER ex_bookings_field_time_insert BEFORE INSERT ON bookings'
+        + _SQLITE_OVERLAP_CHECK.format(extra=''),
+        'CREATE TRIGGER ex_bookings_field_time_update'
+        ' BEFORE UPDATE OF field_id, start_time, end_time, status ON bookings'
+        + _SQLITE_OVERLAP_CHECK.format(extra='AND id <> NEW.id'),
+    ],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Falha se já houver reservas sobrepostas: resolva-as antes de migrar
+    op.create_index('ix_bookings_field_id_start_time', 'bookings', ['field_id', 'start_time'], unique=False)
+    for statement in DDL.get(op.get_bind().dialect.name, []):
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.drop_constraint(CONSTRAINT, 'bookings', type_='exclude')
+    elif dialect == 'sqlite':
+        op.execute('DROP TRIGGER IF EXISTS ex_bookings_field_time_insert')
+        op.execute('DROP TRIGGER IF EXISTS ex_bookings_field_time_update')
+    op.drop_index('ix_bookings_field_id_start_time', table_name='bookings')
@@ -0,0 +1,34 @@
+"""foreign-key and lookup indexes for the service filters
+
+Revision ID: a3d8c5f1e604
+Revises: f5a1c3e9b247
+Create Date: 2026-10-18 21:32:08.415376
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3d8c5f1e604'
+down_revision: Union[str, Sequence[str], None] = 'f5a1c3e9b247'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Levantados com `python -m scripts.index_advisor`; CONCURRENTLY (só
+    # PostgreSQL) não bloqueia escritas durante o build. fields(sports_center_id,
+    # name) e availabilities(field_id, start_time, end_time) já nascem únicos
+    # na b6e0d2a9c153, para não construir cada índice duas vezes.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_reviews_user_id', 'reviews', ['user_id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_sports_centers_latitude_longitude', 'sports_centers', ['latitude', 'longitude'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_sports_centers_latitude_longitude', table_name='sports_centers')
+    op.drop_index('ix_reviews_user_id', table_name='reviews')
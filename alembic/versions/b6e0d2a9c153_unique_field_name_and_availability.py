@@ -0,0 +1,38 @@
+"""fields/availabilities: unique indexes backing the single-statement creates
+
+Revision ID: b6e0d2a9c153
+Revises: a3d8c5f1e604
+Create Date: 2026-10-18 22:10:37.902114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6e0d2a9c153'
+down_revision: Union[str, Sequence[str], None] = 'a3d8c5f1e604'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Únicos já na criação (também servem às buscas e à FK de fields). Falha
+    # se já houver duplicatas (o SELECT prévio dos creates não impedia
+    # corridas).
+    with op.get_context().autocommit_block():
+        op.create_index('uq_fields_sports_center_id_name', 'fields', ['sports_center_id', 'name'], unique=True, postgresql_concurrently=True)
+        op.create_index('uq_availabilities_field_id_start_time_end_time', 'availabilities', ['field_id', 'start_time', 'end_time'], unique=True, postgresql_concurrently=True)
+        # Bancos que rodaram a primeira versão da a3d8c5f1e604 têm os índices
+        # comuns das mesmas colunas; remove depois de os únicos existirem
+        op.drop_index('ix_fields_sports_center_id_name', table_name='fields', if_exists=True, postgresql_concurrently=True)
+        op.drop_index('ix_availabilities_field_id_start_time_end_time', table_name='availabilities', if_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('uq_availabilities_field_id_start_time_end_time', table_name='availabilities', postgresql_concurrently=True)
+        op.drop_index('uq_fields_sports_center_id_name', table_name='fields', postgresql_concurrently=True)
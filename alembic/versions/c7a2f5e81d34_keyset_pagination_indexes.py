@@ -0,0 +1,31 @@
+"""indexes for keyset pagination of list endpoints
+
+Revision ID: c7a2f5e81d34
+Revises: 9f41b6d3a8e2
+Create Date: 2026-10-18 19:12:40.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7a2f5e81d34'
+down_revision: Union[str, Sequence[str], None] = '9f41b6d3a8e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_sports_centers_user_id_id', 'sports_centers', ['user_id', 'id'], unique=False)
+    op.create_index('ix_fields_sports_center_id_id', 'fields', ['sports_center_id', 'id'], unique=False)
+    op.create_index('ix_bookings_user_id_start_time_id', 'bookings', ['user_id', 'start_time', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_bookings_user_id_start_time_id', table_name='bookings')
+    op.drop_index('ix_fields_sports_center_id_id', table_name='fields')
+    op.drop_index('ix_sports_centers_user_id_id', table_name='sports_centers')
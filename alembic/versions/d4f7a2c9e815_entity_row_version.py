@@ -0,0 +1,34 @@
+"""sports_centers/fields/availabilities: row version for ETags
+
+Revision ID: d4f7a2c9e815
+Revises: b6e0d2a9c153
+Create Date: 2026-10-18 23:02:14.518306
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4f7a2c9e815'
+down_revision: Union[str, Sequence[str], None] = 'b6e0d2a9c153'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ['sports_centers', 'fields', 'availabilities']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in reversed(TABLES):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('version')
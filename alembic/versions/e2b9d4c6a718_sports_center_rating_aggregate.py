@@ -0,0 +1,45 @@
+"""sports_centers: denormalized rating aggregate
+
+Revision ID: e2b9d4c6a718
+Revises: c7a2f5e81d34
+Create Date: 2026-10-18 20:03:27.914466
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b9d4c6a718'
+down_revision: Union[str, Sequence[str], None] = 'c7a2f5e81d34'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = ['rating_count', 'rating_sum', 'stars_1', 'stars_2', 'stars_3', 'stars_4', 'stars_5']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('sports_centers') as batch_op:
+        for name in COLUMNS:
+            batch_op.add_column(sa.Column(name, sa.Integer(), server_default='0', nullable=False))
+
+    # Preenche a partir das reviews existentes (um UPDATE, subconsultas correlacionadas)
+    def reviews(expr, where=''):
+        return f'(SELECT {expr} FROM reviews r WHERE r.sports_center_id = sports_centers.id{where})'
+
+    assignments = [
+        f'rating_count = {reviews("COUNT(*)")}',
+        f'rating_sum = {reviews("COALESCE(SUM(r.rating), 0)")}',
+        *(f'stars_{s} = {reviews("COUNT(*)", f" AND r.rating = {s}")}' for s in range(1, 6)),
+    ]
+    op.execute(f'UPDATE sports_centers SET {", ".join(assignments)}')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('sports_centers') as batch_op:
+        for name in reversed(COLUMNS):
+            batch_op.drop_column(name)
@@ -0,0 +1,31 @@
+"""reviews: covering indexes for the per-center feed
+
+Revision ID: f5a1c3e9b247
+Revises: e2b9d4c6a718
+Create Date: 2026-10-18 20:41:55.207913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5a1c3e9b247'
+down_revision: Union[str, Sequence[str], None] = 'e2b9d4c6a718'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY (só PostgreSQL) não bloqueia escritas em reviews durante o build
+    with op.get_context().autocommit_block():
+        op.create_index('ix_reviews_center_created_at_id', 'reviews', ['sports_center_id', 'created_at', 'id'], unique=False, postgresql_include=['rating'], postgresql_concurrently=True)
+        op.create_index('ix_reviews_center_rating_created_at_id', 'reviews', ['sports_center_id', 'rating', 'created_at', 'id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_reviews_center_rating_created_at_id', table_name='reviews')
+    op.drop_index('ix_reviews_center_created_at_id', table_name='reviews')
@@ -0,0 +1,85 @@
+"""
+Teste de estresse de reservas: N clientes tentam reservar, ao mesmo tempo,
+horários sobrepostos do mesmo campo. Só um pode vencer por rodada.
+
+Uso (com a API rodando):
+
+    python -m benchmarks.booking_stress --url http://127.0.0.1:8000 \
+        --field-id 1 --clients 200 --rounds 5
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta
+
+import httpx
+
+from benchmarks.load_benchmark import percentile
+
+
+async def _attempt(client, field_id, start, statuses, latencies):
+    payload = {
+        "user_id": str(uuid.uuid4()),
+        "field_id": field_id,
+        "start_time": start.isoformat(),
+        "end_time": (start + timedelta(hours=1)).isoformat(),
+    }
+    t0 = time.perf_counter()
+    try:
+        response = await client.post("/api/v1/bookings/create", json=payload)
+        statuses[response.status_code] += 1
+        if response.status_code not in (201, 409):
+            print(response.status_code, response.text[:200])
+    except httpx.HTTPError as e:
+        statuses[type(e).__name__] += 1
+    latencies.append(time.perf_counter() - t0)
+
+
+async def run(url, field_id, clients, rounds, base):
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    print(f"{'rodada':>6} {'201':>5} {'409':>5} {'outros':>7} {'p50 ms':>8} {'p99 ms':>8}")
+    ok = True
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30) as client:
+        for r in range(rounds):
+            slot = base + timedelta(days=r)
+            statuses: Counter = Counter()
+            latencies: list[float] = []
+            await asyncio.gather(
+                *(
+                    # Início varia em passos de 15 min: todos cruzam `slot`
+                    _attempt(client, field_id, slot - timedelta(minutes=i % 4 * 15),
+                             statuses, latencies)
+                    for i in range(clients)
+                )
+            )
+            latencies.sort()
+            others = sum(v for k, v in statuses.items() if k not in (201, 409))
+            print(
+                f"{r + 1:>6} {statuses[201]:>5} {statuses[409]:>5} {others:>7}"
+                f" {percentile(latencies, 0.5) * 1000:8.1f}"
+                f" {percentile(latencies, 0.99) * 1000:8.1f}"
+            )
+            ok = ok and statuses[201] == 1 and others == 0
+    print("OK: uma reserva por rodada" if ok else "FALHA: reservas duplicadas ou erros")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--field-id", type=int, default=1)
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument(
+        "--start", type=datetime.fromisoformat, default=datetime(2030, 1, 7, 19, 0),
+        help="horário disputado na 1ª rodada (as seguintes somam 1 dia)",
+    )
+    args = parser.parse_args()
+    ok = asyncio.run(run(args.url, args.field_id, args.clients, args.rounds, args.start))
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
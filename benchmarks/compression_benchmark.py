@@ -0,0 +1,88 @@
+"""
+Bytes no fio e CPU por resposta comprimida, por tamanho de resposta e
+codificação (gzip em níveis 1/6/9; brotli e zstd se instalados). O corpo
+é a lista de centros como a API devolve (response_model + orjson).
+
+A última coluna é o ganho líquido num link de --mbps: tempo de transmissão
+economizado menos a CPU da compressão. Negativo = não compensa comprimir.
+
+    python -m benchmarks.compression_benchmark --mbps 10 --repeat 50
+"""
+import argparse
+import statistics
+import time
+import uuid
+
+import orjson
+
+from core.compression import _Brotli, _Gzip, _Zstd, brotli, zstandard
+from schemas.sports_center_schemas import SportsCenterResponse
+
+# Quantidade de centros por resposta: de ~400 B a ~1 MB
+ITEMS = (1, 2, 3, 5, 10, 40, 160, 640, 2560)
+
+
+def _centers(n: int) -> list[dict]:
+    return [
+        SportsCenterResponse(
+            id=i,
+            user_id=uuid.UUID(int=(0xA << 124) | i),
+            name=f"Centro Esportivo {i}",
+            cnpj=f"{i:014d}",
+            latitude=-23.5 + i * 1e-4,
+            longitude=-46.6 - i * 1e-4,
+            photo_path=f"uploads/centers/{i}.jpg" if i % 3 else None,
+            description="Quadras society e futsal, vestiário e estacionamento.",
+            rating_count=i % 50,
+            rating_sum=4 * (i % 50),
+            rating_average=4.0 if i % 50 else None,
+            stars_4=(i % 50) // 2,
+            stars_5=(i % 50) - (i % 50) // 2,
+        ).model_dump(mode="json")
+        for i in range(n)
+    ]
+
+
+def _encoders():
+    encoders = [(f"gzip-{level}", lambda level=level: _Gzip(level)) for level in (1, 6, 9)]
+    if brotli is not None:
+        encoders += [(f"br-{q}", lambda q=q: _Brotli(q)) for q in (4, 11)]
+    if zstandard is not None:
+        encoders += [(f"zstd-{level}", lambda level=level: _Zstd(level)) for level in (3, 9)]
+    return encoders
+
+
+def _measure(body: bytes, factory, repeat: int) -> tuple[int, float]:
+    factory().finish(body)  # aquecimento (alocação do estado do compressor)
+    samples = []
+    for _ in range(repeat):
+        start = time.process_time_ns()
+        compressed = factory().finish(body)
+        samples.append(time.process_time_ns() - start)
+    return len(compressed), statistics.median(samples) / 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--mbps", type=float, default=10.0, help="banda do cliente")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    centers = _centers(max(ITEMS))
+    print(f"{'bytes':>9} {'codificação':>12} {'saída':>9} {'%':>6} {'CPU µs':>9}"
+          f" {f'ganho @{args.mbps:g}Mbps ms':>20}")
+    for n in ITEMS:
+        body = orjson.dumps(centers[:n])
+        for name, factory in _encoders():
+            # Respostas grandes: menos repetições, a mediana estabiliza rápido
+            repeat = max(5, args.repeat * 4096 // max(len(body), 4096))
+            size, cpu_us = _measure(body, factory, repeat)
+            saved_ms = (len(body) - size) * 8 / (args.mbps * 1e6) * 1000
+            print(
+                f"{len(body):9d} {name:>12} {size:9d} {100 * size / len(body):5.1f}%"
+                f" {cpu_us:9.1f} {saved_ms - cpu_us / 1000:20.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
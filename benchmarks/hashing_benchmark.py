@@ -0,0 +1,105 @@
+"""
+Benchmark de /users/signin: logins/s em função do tamanho do pool do bcrypt.
+
+Roda a API em processo (httpx + ASGITransport) sobre um SQLite temporário:
+
+    python -m benchmarks.hashing_benchmark --pool-sizes 1 2 4 8 \
+        --concurrency 32 --requests 200
+
+"inline" é o comportamento antigo (bcrypt no próprio event loop); os demais
+usam o HashingPool com N processos.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+_tmpdir = tempfile.mkdtemp()
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmpdir}/bench.db")
+for _var in ("POSTGRES_SERVER", "POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_DB"):
+    os.environ.setdefault(_var, "bench")
+os.environ.setdefault("SECRET_KEY", "bench")
+
+import httpx  # noqa: E402
+
+import services.user_service as user_service  # noqa: E402
+import utils.security as security  # noqa: E402
+from core.database import Base, SessionLocal, async_engine, engine  # noqa: E402
+from main import app  # noqa: E402
+from models.models import User  # noqa: E402
+from utils.hashing import HashingPool, check_password, hash_password  # noqa: E402
+
+EMAIL = "bench@example.com"
+PASSWORD = "Bench123!"
+
+
+def seed() -> None:
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        if not db.query(User).filter_by(email=EMAIL).first():
+            db.add(
+                User(
+                    name="Bench",
+                    email=EMAIL,
+                    cpf="12345678901",
+                    hashed_password=hash_password(PASSWORD),
+                )
+            )
+            db.commit()
+
+
+async def _inline_verify(plain_password: str, hashed_password: str) -> bool:
+    return check_password(plain_password, hashed_password)
+
+
+async def run(total: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def signin(client):
+        async with semaphore:
+            resp = await client.post(
+                "/api/v1/users/signin", json={"email": EMAIL, "password": PASSWORD}
+            )
+            resp.raise_for_status()
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+        await signin(c)  # aquece conexões e workers
+        start = time.perf_counter()
+        await asyncio.gather(*(signin(c) for _ in range(total)))
+        elapsed = time.perf_counter() - start
+
+    # Conexões aiosqlite ficam presas ao event loop desta execução
+    await async_engine.dispose()
+    return total / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pool-sizes", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    seed()
+    print(f"CPUs: {os.cpu_count()}")
+    print(f"{'pool':>8} {'logins/s':>10}")
+
+    original_verify = user_service.verify_password_async
+    user_service.verify_password_async = _inline_verify
+    print(f"{'inline':>8} {asyncio.run(run(args.requests, args.concurrency)):>10.1f}")
+    user_service.verify_password_async = original_verify
+
+    for size in args.pool_sizes:
+        security.hashing_pool.shutdown()
+        security.hashing_pool = HashingPool(
+            workers=size, queue_depth=args.requests, timeout=120
+        )
+        rps = asyncio.run(run(args.requests, args.concurrency))
+        print(f"{size:>8} {rps:>10.1f}")
+    security.hashing_pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Microbenchmark do decode de JWT: custo por request sem cache (jwt.decode com
+verificação HMAC) vs. com o token já no cache de utils.security.
+
+    python -m benchmarks.jwt_benchmark --iterations 20000
+"""
+import argparse
+import os
+import timeit
+
+for _var in ("POSTGRES_SERVER", "POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_DB"):
+    os.environ.setdefault(_var, "bench")
+os.environ.setdefault("SECRET_KEY", "bench")
+
+from jose import jwt  # noqa: E402
+
+from core.config import settings  # noqa: E402
+from utils.security import _decode_token, create_access_token, jwt_cache  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    token = create_access_token(subject="3fa85f64-5717-4562-b3fc-2c963f66afa6")
+
+    def cold():
+        jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+
+    jwt_cache.clear()
+    _decode_token(token)
+
+    def cached():
+        _decode_token(token)
+
+    for name, fn in (("sem cache", cold), ("com cache", cached)):
+        seconds = timeit.timeit(fn, number=args.iterations)
+        print(f"{name:>10}: {seconds / args.iterations * 1e6:8.2f} µs/decode")
+
+
+if __name__ == "__main__":
+    main()
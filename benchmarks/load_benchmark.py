@@ -0,0 +1,92 @@
+"""
+Benchmark de carga: requests/s de um endpoint GET com N clientes concorrentes.
+
+Uso (com a API rodando, ex.: `uvicorn main:app --workers 1`):
+
+    python -m benchmarks.load_benchmark --url http://127.0.0.1:8000 \
+        --path /api/v1/sports_center/1 --concurrency 50 100 250 500
+
+Para comparar antes/depois, rode o mesmo comando contra as duas versões da API
+apontando para o mesmo banco.
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * q))
+    return sorted_values[index]
+
+
+async def _worker(
+    client: httpx.AsyncClient, path: str, deadline: float, latencies, errors
+):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            response = await client.get(path)
+            if response.status_code >= 500:
+                errors.append(response.status_code)
+        except httpx.HTTPError as e:
+            errors.append(type(e).__name__)
+            continue
+        latencies.append(time.perf_counter() - start)
+
+
+async def run_level(url: str, path: str, concurrency: int, duration: float) -> dict:
+    latencies: list[float] = []
+    errors: list = []
+    limits = httpx.Limits(
+        max_connections=concurrency, max_keepalive_connections=concurrency
+    )
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30) as client:
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(
+            *(
+                _worker(client, path, deadline, latencies, errors)
+                for _ in range(concurrency)
+            )
+        )
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "rps": len(latencies) / duration,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "errors": len(errors),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--path", default="/api/v1/sports_center/1")
+    parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=[50, 100, 250, 500]
+    )
+    parser.add_argument(
+        "--duration", type=float, default=10.0, help="segundos por nível"
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'clientes':>8} {'reqs':>8} {'req/s':>10} "
+        f"{'p50 ms':>9} {'p99 ms':>9} {'erros':>6}"
+    )
+    for concurrency in args.concurrency:
+        r = asyncio.run(run_level(args.url, args.path, concurrency, args.duration))
+        print(
+            f"{r['concurrency']:>8} {r['requests']:>8} {r['rps']:>10.1f} "
+            f"{r['p50_ms']:>9.1f} {r['p99_ms']:>9.1f} {r['errors']:>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Benchmark de busca por proximidade (k mais próximos num raio) em SQLite com
+centros sintéticos: índice de geohash vs. bounding box sem índice vs. o
+KD-tree em memória de services/spatial_index.py.
+
+    python -m benchmarks.nearby_benchmark --centers 1000000 --queries 200
+"""
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+import uuid
+
+for _var in ("POSTGRES_SERVER", "POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_DB"):
+    os.environ.setdefault(_var, "bench")
+os.environ.setdefault("SECRET_KEY", "bench")
+
+from sqlalchemy import create_engine, select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402
+
+from core.database import Base  # noqa: E402
+from models.models import SportsCenter  # noqa: E402
+from services.spatial_index import spatial_index  # noqa: E402
+from services.sports_center_service import (  # noqa: E402
+    get_nearby_sports_centers_service,
+)
+from utils.geo import bounding_box, geohash_encode, haversine_km  # noqa: E402
+
+# Retângulo aproximado do Brasil
+LAT_RANGE = (-33.0, 5.0)
+LON_RANGE = (-73.0, -35.0)
+
+
+def _synthetic_centers(n: int, rnd: random.Random, hubs: list[tuple[float, float]]):
+    # 80% concentrados em "cidades", 20% espalhados
+    for i in range(n):
+        if rnd.random() < 0.8:
+            lat0, lon0 = rnd.choice(hubs)
+            lat, lon = rnd.gauss(lat0, 0.15), rnd.gauss(lon0, 0.15)
+        else:
+            lat, lon = rnd.uniform(*LAT_RANGE), rnd.uniform(*LON_RANGE)
+        lat, lon = round(lat, 6), round(lon, 6)
+        # Primeiro dígito "a": hex só com números viraria inteiro no SQLite
+        owner = uuid.UUID(int=(0xA << 124) | rnd.getrandbits(124)).hex
+        yield (owner, f"Centro {i}", str(i), lat, lon, geohash_encode(lat, lon))
+
+
+def _populate(path: str, n: int, rnd: random.Random, hubs) -> None:
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine, tables=[SportsCenter.__table__])
+    engine.dispose()
+
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.executemany(
+            "INSERT INTO sports_centers (user_id, name, cnpj, latitude, longitude, geohash)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            _synthetic_centers(n, rnd, hubs),
+        )
+    conn.close()
+
+
+async def _bbox_scan(session, lat, lon, radius_km, limit):
+    lat_min, lat_max, lon_min, lon_max = bounding_box(lat, lon, radius_km)
+    result = await session.execute(
+        select(SportsCenter)
+        .where(SportsCenter.latitude.between(lat_min, lat_max))
+        .where(SportsCenter.longitude.between(lon_min, lon_max))
+    )
+    nearby = [
+        (c, d)
+        for c in result.scalars()
+        if (d := haversine_km(lat, lon, float(c.latitude), float(c.longitude))) <= radius_km
+    ]
+    nearby.sort(key=lambda item: item[1])
+    return nearby[:limit]
+
+
+async def _measure(path, fn, origins, radius_km, k, with_index=False):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    latencies = []
+    found = 0
+    try:
+        async with AsyncSession(engine) as session:
+            if with_index:
+                start = time.perf_counter()
+                await spatial_index.load(session)
+                print(f"KD-tree carregado em {time.perf_counter() - start:.1f}s")
+            for lat, lon in origins:
+                start = time.perf_counter()
+                found += len(await fn(session, lat, lon, radius_km, k))
+                latencies.append((time.perf_counter() - start) * 1000)
+                session.expunge_all()
+    finally:
+        spatial_index.clear()
+        await engine.dispose()
+    latencies.sort()
+    return {
+        "p50": statistics.median(latencies),
+        "p99": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+        "avg_found": found / len(origins),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--centers", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=20)
+    parser.add_argument("--radius-km", type=float, default=5.0)
+    parser.add_argument("--db", help="arquivo SQLite (padrão: temporário)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rnd = random.Random(args.seed)
+    hubs = [(rnd.uniform(*LAT_RANGE), rnd.uniform(*LON_RANGE)) for _ in range(100)]
+    path = args.db or os.path.join(tempfile.mkdtemp(), "nearby.db")
+
+    if not os.path.exists(path):
+        start = time.perf_counter()
+        _populate(path, args.centers, rnd, hubs)
+        print(f"{args.centers} centros inseridos em {time.perf_counter() - start:.1f}s")
+
+    origins = [
+        (rnd.gauss(lat, 0.1), rnd.gauss(lon, 0.1))
+        for lat, lon in (rnd.choice(hubs) for _ in range(args.queries))
+    ]
+
+    strategies = [
+        ("geohash", get_nearby_sports_centers_service, False),
+        ("bbox sem índice", _bbox_scan, False),
+        ("kd-tree", get_nearby_sports_centers_service, True),
+    ]
+
+    results = [
+        (name, asyncio.run(_measure(path, fn, origins, args.radius_km, args.k, idx)))
+        for name, fn, idx in strategies
+    ]
+    print(f"{'estratégia':>18} {'p50 ms':>9} {'p99 ms':>9} {'média encontrados':>18}")
+    for name, r in results:
+        print(f"{name:>18} {r['p50']:9.2f} {r['p99']:9.2f} {r['avg_found']:18.1f}")
+
+
+if __name__ == "__main__":
+    main()
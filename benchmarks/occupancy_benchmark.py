@@ -0,0 +1,108 @@
+"""
+Benchmark da busca "quais campos estão livres em [início, fim)?"
+(services/occupancy_service.py): bitmaps em cache vs. checagem linha a linha
+das janelas e reservas de cada campo.
+
+    python -m benchmarks.occupancy_benchmark --fields 5000
+"""
+import argparse
+import os
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+from datetime import time as dtime
+
+import numpy as np
+
+for _var in ("POSTGRES_SERVER", "POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_DB"):
+    os.environ.setdefault(_var, "bench")
+os.environ.setdefault("SECRET_KEY", "bench")
+
+from services.occupancy_service import (  # noqa: E402
+    availability_bits,
+    booking_bits,
+    interval_masks,
+    week_start,
+)
+
+WEEK = week_start(datetime(2026, 10, 19))
+
+
+def _synthetic(n_fields: int, bookings_per_day: int, rnd: random.Random):
+    windows, busy = {}, {}
+    for field_id in range(n_fields):
+        windows[field_id] = [
+            (dow, dtime(rnd.choice((6, 7, 8))), dtime(rnd.choice((22, 23))))
+            for dow in range(7)
+        ]
+        busy[field_id] = []
+        for day in range(7):
+            for _ in range(bookings_per_day):
+                s = WEEK + timedelta(days=day, hours=rnd.randrange(6, 22))
+                busy[field_id].append((s, s + timedelta(hours=1)))
+    return windows, busy
+
+
+def _row_check(windows, busy, start, end):
+    free = []
+    dow = start.isoweekday() % 7
+    day = start.replace(hour=0, minute=0, second=0, microsecond=0)
+    for field_id, field_windows in windows.items():
+        inside = any(
+            w_dow == dow
+            and datetime.combine(day.date(), ws) <= start
+            and end <= datetime.combine(day.date(), we)
+            for w_dow, ws, we in field_windows
+        )
+        if inside and not any(bs < end and be > start for bs, be in busy[field_id]):
+            free.append(field_id)
+    return free
+
+
+def _timeit(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--fields", type=int, default=5000)
+    parser.add_argument("--bookings-per-day", type=int, default=6)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    windows, busy = _synthetic(args.fields, args.bookings_per_day, random.Random(1))
+    ids = list(windows)
+    start = WEEK + timedelta(days=3, hours=19)
+    end = start + timedelta(hours=1)
+    print(f"{args.fields} campos, {sum(len(b) for b in busy.values())} reservas na semana")
+
+    def build():
+        available = np.stack([np.packbits(availability_bits(windows[f])) for f in ids])
+        booked = np.stack([np.packbits(booking_bits(busy[f], WEEK)) for f in ids])
+        return available, booked
+
+    available, booked = build()
+    (_, query), = interval_masks(start, end)
+
+    def bitmap():
+        mask = ((available & ~booked & query) == query).all(axis=1)
+        return [ids[i] for i in np.flatnonzero(mask)]
+
+    assert bitmap() == _row_check(windows, busy, start, end)
+
+    print(f"{'implementação':>26} {'mediana ms':>11}")
+    print(f"{'bitmap (cache quente)':>26} {_timeit(bitmap, args.repeat):11.2f}")
+    print(f"{'montagem dos bitmaps':>26} {_timeit(build, 3):11.1f}")
+    row_ms = _timeit(lambda: _row_check(windows, busy, start, end), args.repeat)
+    print(f"{'linha a linha':>26} {row_ms:11.1f}")
+    print(f"memória: {available.nbytes + booked.nbytes} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Benchmark do feed de reviews por centro (/sports_center/{id}/reviews) em
+SQLite: páginas com keyset, com e sem os índices de reviews.
+
+    python -m benchmarks.reviews_benchmark --reviews 300000
+"""
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+for _var in ("POSTGRES_SERVER", "POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_DB"):
+    os.environ.setdefault(_var, "bench")
+os.environ.setdefault("SECRET_KEY", "bench")
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402
+
+from core.database import Base  # noqa: E402
+from models.models import Review  # noqa: E402
+from services.review_service import get_reviews_by_sports_center_service  # noqa: E402
+
+HOT_CENTER = 1
+START = datetime(2024, 1, 1)
+# Notas 1 a 5: as baixas são raras
+RATING_WEIGHTS = (2, 3, 10, 35, 50)
+
+
+def _synthetic_reviews(n_hot: int, n_other: int, centers: int, rnd: random.Random):
+    for i in range(n_hot + n_other):
+        center = HOT_CENTER if i < n_hot else rnd.randint(2, centers)
+        rating = rnd.choices(range(1, 6), RATING_WEIGHTS)[0]
+        created = START + timedelta(seconds=rnd.randrange(86400 * 600))
+        # Primeiro dígito "a": hex só com números viraria inteiro no SQLite
+        user = uuid.UUID(int=(0xA << 124) | rnd.getrandbits(124)).hex
+        yield (center, user, rating, f"review {i}", created.isoformat(" ", "microseconds"))
+
+
+def _populate(path, n_hot, n_other, centers, rnd) -> None:
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine, tables=[Review.__table__])
+    engine.dispose()
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.executemany(
+            "INSERT INTO reviews (sports_center_id, user_id, rating, comment, created_at)"
+            " VALUES (?, ?, ?, ?, ?)",
+            _synthetic_reviews(n_hot, n_other, centers, rnd),
+        )
+        conn.execute("ANALYZE")
+    conn.close()
+
+
+async def _measure(path, scenarios, repeat):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    results = {}
+    try:
+        async with AsyncSession(engine) as session:
+            for name, kwargs in scenarios:
+                samples = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    await get_reviews_by_sports_center_service(session, HOT_CENTER, **kwargs)
+                    samples.append((time.perf_counter() - start) * 1000)
+                    session.expunge_all()
+                results[name] = statistics.median(samples)
+    finally:
+        await engine.dispose()
+    return results
+
+
+def _set_indexes(path, enabled: bool) -> None:
+    conn = sqlite3.connect(path)
+    with conn:
+        for index in Review.__table__.indexes:
+            conn.execute(f"DROP INDEX IF EXISTS {index.name}")
+            if enabled:
+                columns = ", ".join(c.name for c in index.columns)
+                conn.execute(f"CREATE INDEX {index.name} ON reviews ({columns})")
+        conn.execute("ANALYZE")
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--reviews", type=int, default=300_000, help="no centro quente")
+    parser.add_argument("--other-reviews", type=int, default=700_000)
+    parser.add_argument("--centers", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--db", help="arquivo SQLite (padrão: temporário)")
+    args = parser.parse_args()
+
+    rnd = random.Random(1)
+    path = args.db or os.path.join(tempfile.mkdtemp(), "reviews.db")
+    if not os.path.exists(path):
+        start = time.perf_counter()
+        _populate(path, args.reviews, args.other_reviews, args.centers, rnd)
+        total = args.reviews + args.other_reviews
+        print(f"{total} reviews inseridas em {time.perf_counter() - start:.1f}s")
+
+    middle = (START + timedelta(days=300), 10**9)
+    scenarios = [
+        ("página 1", {"limit": 50}),
+        ("página no meio", {"limit": 50, "after": middle}),
+        ("rating=1, página 1", {"limit": 50, "ratings": [1]}),
+        ("rating=1, meio", {"limit": 50, "after": middle, "ratings": [1]}),
+    ]
+    print(f"{'cenário':>22} {'com índices ms':>15} {'sem índices ms':>15}")
+    _set_indexes(path, True)
+    indexed = asyncio.run(_measure(path, scenarios, args.repeat))
+    _set_indexes(path, False)
+    plain = asyncio.run(_measure(path, scenarios, max(1, args.repeat // 5)))
+    _set_indexes(path, True)
+    for name, _ in scenarios:
+        print(f"{name:>22} {indexed[name]:15.2f} {plain[name]:15.1f}")
+
+
+if __name__ == "__main__":
+    main()
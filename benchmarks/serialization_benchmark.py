@@ -0,0 +1,137 @@
+"""
+Custo de serializar uma lista de centros esportivos (ORM -> JSON) nas três
+formas que a API já usou: sem response_model (jsonable_encoder genérico),
+com response_model + JSONResponse e com response_model + ORJSONResponse (o
+padrão do app). Os centros são carregados uma vez; só a resposta é medida.
+
+    python -m benchmarks.serialization_benchmark --centers 10000 --repeat 15
+"""
+import argparse
+import asyncio
+import os
+import sqlite3
+import statistics
+import tempfile
+import time
+import tracemalloc
+import uuid
+
+for _var in ("POSTGRES_SERVER", "POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_DB"):
+    os.environ.setdefault(_var, "bench")
+os.environ.setdefault("SECRET_KEY", "bench")
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+from fastapi.responses import JSONResponse, ORJSONResponse  # noqa: E402
+from sqlalchemy import create_engine, select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402
+
+from core.database import Base  # noqa: E402
+from models.models import SportsCenter  # noqa: E402
+from schemas.sports_center_schemas import SportsCenterResponse  # noqa: E402
+
+SCENARIOS = ("sem response_model", "response_model + json", "response_model + orjson")
+
+
+def _populate(path: str, n: int) -> None:
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine, tables=[SportsCenter.__table__])
+    engine.dispose()
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.executemany(
+            "INSERT INTO sports_centers (user_id, name, cnpj, latitude, longitude,"
+            " description, rating_count, rating_sum, stars_1, stars_2, stars_3,"
+            " stars_4, stars_5) VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0, 0, 0, ?, ?)",
+            (
+                (
+                    # Primeiro dígito "a": hex só com números viraria inteiro no SQLite
+                    uuid.UUID(int=(0xA << 124) | i).hex,
+                    f"Centro {i}",
+                    f"{i:014d}",
+                    -23.5 + i * 1e-4,
+                    -46.6 - i * 1e-4,
+                    "Quadras society e futsal, vestiário e estacionamento.",
+                    i % 50,
+                    4 * (i % 50),
+                    (i % 50) // 2,
+                    (i % 50) - (i % 50) // 2,
+                )
+                for i in range(n)
+            ),
+        )
+    conn.close()
+
+
+async def _load(path: str) -> list[SportsCenter]:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    try:
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            return list((await session.execute(select(SportsCenter))).scalars())
+    finally:
+        await engine.dispose()
+
+
+def _app(centers: list[SportsCenter]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/raw", response_class=JSONResponse)
+    async def raw():
+        return centers
+
+    @app.get(
+        "/json", response_model=list[SportsCenterResponse], response_class=JSONResponse
+    )
+    async def json_model():
+        return centers
+
+    @app.get(
+        "/orjson",
+        response_model=list[SportsCenterResponse],
+        response_class=ORJSONResponse,
+    )
+    async def orjson_model():
+        return centers
+
+    return app
+
+
+async def _measure(centers, repeat: int) -> dict:
+    transport = httpx.ASGITransport(app=_app(centers))
+    results = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, path in zip(SCENARIOS, ("/raw", "/json", "/orjson")):
+            await client.get(path)  # aquecimento
+            samples = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                response = await client.get(path)
+                samples.append((time.perf_counter() - start) * 1000)
+            # Alocações numa rodada à parte: o tracemalloc distorce o tempo
+            tracemalloc.start()
+            await client.get(path)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            results[name] = (statistics.median(samples), peak, len(response.content))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--centers", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=15)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "serialization.db")
+    _populate(path, args.centers)
+    centers = asyncio.run(_load(path))
+    results = asyncio.run(_measure(centers, args.repeat))
+
+    print(f"{args.centers} centros por resposta")
+    print(f"{'cenário':>26} {'mediana ms':>11} {'pico MiB':>9} {'KiB':>7}")
+    for name, (median, peak, size) in results.items():
+        print(f"{name:>26} {median:11.1f} {peak / 2**20:9.1f} {size / 1024:7.0f}")
+
+
+if __name__ == "__main__":
+    main()
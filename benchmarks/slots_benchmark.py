@@ -0,0 +1,121 @@
+"""
+Benchmark do cálculo de horários livres (services/slot_service.py): engine
+vetorizado vs. uma implementação em Python puro, campo a campo.
+
+    python -m benchmarks.slots_benchmark --fields 300 --days 90
+"""
+import argparse
+import os
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+from datetime import time as dtime
+
+for _var in ("POSTGRES_SERVER", "POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_DB"):
+    os.environ.setdefault(_var, "bench")
+os.environ.setdefault("SECRET_KEY", "bench")
+
+from services.slot_service import compute_free_slots  # noqa: E402
+
+START = datetime(2026, 1, 5)
+
+
+def _synthetic(n_fields: int, n_days: int, bookings_per_day: int, rnd: random.Random):
+    windows, busy = {}, {}
+    for field_id in range(1, n_fields + 1):
+        # Manhã e noite, todos os dias da semana
+        windows[field_id] = [
+            (dow, dtime(rnd.choice((6, 7, 8))), dtime(12)) for dow in range(7)
+        ] + [(dow, dtime(17), dtime(rnd.choice((22, 23)))) for dow in range(7)]
+        busy[field_id] = []
+        for day in range(n_days):
+            base = START + timedelta(days=day)
+            for _ in range(bookings_per_day):
+                s = base + timedelta(hours=rnd.randrange(6, 23))
+                busy[field_id].append((s, s + timedelta(hours=1)))
+    return windows, busy
+
+
+def _python_free_slots(windows, busy, range_start, range_end, min_duration):
+    result = {}
+    for field_id, field_windows in windows.items():
+        intervals = []
+        day = range_start.replace(hour=0, minute=0, second=0) - timedelta(days=1)
+        while day < range_end:
+            dow = (day.weekday() + 1) % 7
+            for w_dow, w_start, w_end in field_windows:
+                if w_dow != dow:
+                    continue
+                s = datetime.combine(day.date(), w_start)
+                e = datetime.combine(day.date(), w_end)
+                if e <= s:
+                    e += timedelta(days=1)
+                s, e = max(s, range_start), min(e, range_end)
+                if s < e:
+                    intervals.append((s, e))
+            day += timedelta(days=1)
+        intervals.sort()
+        booked = sorted(busy.get(field_id, []))
+
+        free = []
+        for s, e in intervals:
+            cursor = s
+            for bs, be in booked:
+                if be <= cursor or bs >= e:
+                    continue
+                if bs > cursor:
+                    free.append((cursor, bs))
+                cursor = max(cursor, be)
+            if cursor < e:
+                free.append((cursor, e))
+        result[field_id] = [(s, e) for s, e in free if e - s >= min_duration]
+    return result
+
+
+def _timeit(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--fields", type=int, default=300)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--bookings-per-day", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    windows, busy = _synthetic(
+        args.fields, args.days, args.bookings_per_day, random.Random(1)
+    )
+    range_end = START + timedelta(days=args.days)
+    min_duration = timedelta(hours=1)
+    n_bookings = sum(len(b) for b in busy.values())
+    print(f"{args.fields} campos, {args.days} dias, {n_bookings} reservas")
+
+    print(f"{'implementação':>24} {'mediana ms':>11}")
+    engine_ms = _timeit(
+        lambda: compute_free_slots(windows, busy, START, range_end, min_duration),
+        args.repeat,
+    )
+    print(f"{'vetorizado (todos)':>24} {engine_ms:11.1f}")
+    single = {1: windows[1]}
+    single_ms = _timeit(
+        lambda: compute_free_slots(single, busy, START, range_end, min_duration),
+        args.repeat,
+    )
+    print(f"{'vetorizado (1 campo)':>24} {single_ms:11.2f}")
+    python_ms = _timeit(
+        lambda: _python_free_slots(windows, busy, START, range_end, min_duration),
+        max(1, args.repeat // 2),
+    )
+    print(f"{'python puro (todos)':>24} {python_ms:11.1f}")
+
+
+if __name__ == "__main__":
+    main()
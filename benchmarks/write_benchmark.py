@@ -0,0 +1,148 @@
+"""
+Latência (p50/p99) e queries por request de cada endpoint de escrita:
+creates, PATCHes e DELETEs de centro, campo, disponibilidade, reserva e
+review, em sequência (um request por vez).
+
+Com a API rodando (ex.: Postgres local; SQL_INSTRUMENTATION_ENABLED=True
+para a coluna de queries):
+
+    python -m benchmarks.write_benchmark --url http://127.0.0.1:8000 --rounds 500
+
+Sem --url, sobe o app no processo contra um SQLite temporário.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+import httpx
+
+from benchmarks.load_benchmark import percentile
+
+API = "/api/v1"
+BASE = datetime(2030, 1, 7)
+
+
+async def _call(client, samples, name, method, path, **kwargs):
+    start = time.perf_counter()
+    response = await client.request(method, f"{API}{path}", **kwargs)
+    elapsed = time.perf_counter() - start
+    if response.status_code >= 400:
+        raise RuntimeError(f"{name}: {response.status_code} {response.text[:200]}")
+    queries = response.headers.get("x-db-query-count")
+    samples[name].append((elapsed, int(queries) if queries else None))
+    return response.json()
+
+
+async def _round(client, samples, i: int, run_id: int):
+    start = BASE + timedelta(days=i)
+    booking = {
+        "user_id": str(uuid.uuid4()),
+        "start_time": (start + timedelta(hours=19)).isoformat(),
+        "end_time": (start + timedelta(hours=20)).isoformat(),
+    }
+    center = await _call(client, samples, "POST centro", "POST", "/sports_center/create", json={
+        "user_id": str(uuid.uuid4()),
+        "name": f"Centro {i}",
+        "cnpj": f"{run_id % 10**6:06d}{i:08d}",
+        "latitude": -23.5,
+        "longitude": -46.6,
+    })
+    field = await _call(client, samples, "POST campo", "POST", "/field/create", json={
+        "sports_center_id": center["id"],
+        "name": "Quadra",
+        "field_type": "futsal",
+        "price_per_hour": 100,
+    })
+    availability = await _call(
+        client, samples, "POST disponibilidade", "POST", "/availability/create", json={
+            "field_id": field["id"],
+            "day_of_week": 1,
+            "start_time": (start + timedelta(hours=8)).isoformat(),
+            "end_time": (start + timedelta(hours=22)).isoformat(),
+        })
+    created = await _call(client, samples, "POST reserva", "POST", "/bookings/create",
+                          json={**booking, "field_id": field["id"]})
+    review = await _call(client, samples, "POST review", "POST", "/review/create", json={
+        "user_id": str(uuid.uuid4()),
+        "sports_center_id": center["id"],
+        "rating": 1 + i % 5,
+    })
+
+    await _call(client, samples, "PATCH centro", "PATCH",
+                f"/sports_center/update/{center['id']}", json={"name": f"C{i}"})
+    await _call(client, samples, "PATCH campo", "PATCH", f"/field/{field['id']}",
+                json={"price_per_hour": 120})
+    await _call(client, samples, "PATCH disponibilidade", "PATCH",
+                f"/availability/{availability['id']}", json={"day_of_week": 1})
+    booking["start_time"] = (start + timedelta(hours=18)).isoformat()
+    await _call(client, samples, "PATCH reserva", "PATCH", f"/bookings/{created['id']}",
+                json={**booking, "field_id": field["id"]})
+
+    await _call(client, samples, "DELETE review", "DELETE", f"/review/{review['id']}")
+    await _call(client, samples, "DELETE reserva", "DELETE", f"/bookings/{created['id']}")
+    await _call(client, samples, "DELETE disponibilidade", "DELETE",
+                f"/availability/{availability['id']}")
+    await _call(client, samples, "DELETE campo", "DELETE", f"/field/{field['id']}")
+    await _call(client, samples, "DELETE centro", "DELETE",
+                f"/sports_center/{center['id']}")
+
+
+def _in_process_client() -> httpx.AsyncClient:
+    path = os.path.join(tempfile.mkdtemp(), "writes.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    os.environ["SQL_INSTRUMENTATION_ENABLED"] = "True"
+    for var in ("POSTGRES_SERVER", "POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_DB"):
+        os.environ.setdefault(var, "bench")
+    os.environ.setdefault("SECRET_KEY", "bench")
+
+    from core.database import Base, engine
+    from main import app
+
+    Base.metadata.create_all(engine)
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://app")
+
+
+async def run(url: str | None, rounds: int, warmup: int) -> dict:
+    client = httpx.AsyncClient(base_url=url, timeout=30) if url else _in_process_client()
+    samples: dict[str, list] = defaultdict(list)
+    run_id = time.time_ns() // 1000
+    try:
+        async with client:
+            for i in range(warmup):
+                await _round(client, defaultdict(list), i, run_id)
+            for i in range(warmup, warmup + rounds):
+                await _round(client, samples, i, run_id)
+    finally:
+        if not url:
+            from core.database import async_engine
+
+            await async_engine.dispose()
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", help="API rodando (padrão: app no processo + SQLite)")
+    parser.add_argument("--rounds", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=20)
+    args = parser.parse_args()
+
+    samples = asyncio.run(run(args.url, args.rounds, args.warmup))
+    print(f"{'endpoint':>24} {'p50 ms':>8} {'p99 ms':>8} {'queries':>8}")
+    for name, values in samples.items():
+        latencies = sorted(v for v, _ in values)
+        queries = [q for _, q in values if q is not None]
+        per_request = f"{sum(queries) / len(queries):.1f}" if queries else "-"
+        print(
+            f"{name:>24} {percentile(latencies, 0.5) * 1000:8.2f}"
+            f" {percentile(latencies, 0.99) * 1000:8.2f} {per_request:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
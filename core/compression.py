@@ -0,0 +1,208 @@
+"""
+Compressão das respostas HTTP (gzip; zstd e brotli se os pacotes estiverem
+instalados), negociada pelo Accept-Encoding do cliente.
+
+Só comprime tipos da lista permitida (JSON, texto...) e corpos a partir de
+`minimum_size` bytes: abaixo disso o ganho não paga a CPU (ver
+benchmarks/compression_benchmark.py). Respostas em streaming são
+acumuladas até o limite; passando dele, seguem comprimidas pedaço a pedaço
+(flush a cada pedaço, o cliente não espera o fim do stream).
+
+Uma ETag forte vira fraca na resposta comprimida (como o nginx faz): os
+bytes mudam com a codificação, mas o If-None-Match usa comparação fraca e
+continua batendo com a versão da linha (ver utils/etag.py).
+"""
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from core.config import DEFAULT_CONTENT_TYPES
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depende do ambiente
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depende do ambiente
+    zstandard = None
+
+
+class _Gzip:
+    def __init__(self, level: int):
+        # wbits=31: formato gzip (cabeçalho + CRC), não zlib puro
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+class _Brotli:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.process(data) + self._compressor.finish()
+
+
+class _Zstd:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+def available_encoders(gzip_level: int = 6, brotli_quality: int = 4, zstd_level: int = 3):
+    """Codificações disponíveis, na ordem de preferência do servidor."""
+    encoders = {}
+    if zstandard is not None:
+        encoders["zstd"] = lambda: _Zstd(zstd_level)
+    if brotli is not None:
+        encoders["br"] = lambda: _Brotli(brotli_quality)
+    encoders["gzip"] = lambda: _Gzip(gzip_level)
+    return encoders
+
+
+def choose_encoding(accept_encoding: str, offered) -> str | None:
+    """Primeira codificação de `offered` aceita (q > 0) pelo cliente."""
+    accepted, wildcard = {}, None
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if name == "*":
+            wildcard = q
+        elif name:
+            accepted[name] = q
+    for encoding in offered:
+        q = accepted.get(encoding, wildcard)
+        if q:
+            return encoding
+    return None
+
+
+class CompressionMiddleware:
+    """Middleware ASGI que comprime respostas elegíveis."""
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = 1024,
+        content_types=DEFAULT_CONTENT_TYPES,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        zstd_level: int = 3,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.content_types = frozenset(content_types)
+        self.encoders = available_encoders(gzip_level, brotli_quality, zstd_level)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(
+            Headers(scope=scope).get("accept-encoding", ""), self.encoders
+        )
+        responder = _Responder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _Responder:
+    """Estado de uma resposta: segura o start até decidir se comprime."""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding, send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self.start = None
+        self.pending: list[bytes] = []
+        self.pending_size = 0
+        self.compressor = None
+        self.passthrough = False
+
+    def _eligible(self, headers: Headers) -> bool:
+        content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        return (
+            self.start["status"] not in (204, 304)
+            and "content-encoding" not in headers
+            and content_type in self.middleware.content_types
+        )
+
+    async def send(self, message):
+        kind = message["type"]
+        if kind == "http.response.start":
+            self.start = message
+            headers = Headers(raw=message["headers"])
+            if not self._eligible(headers):
+                self.passthrough = True
+                await self._send(message)
+                return
+            # A representação varia com o Accept-Encoding, comprimida ou não
+            vary = MutableHeaders(raw=message["headers"])
+            vary.add_vary_header("Accept-Encoding")
+            length = headers.get("content-length")
+            if self.encoding is None or (
+                length is not None and int(length) < self.middleware.minimum_size
+            ):
+                self.passthrough = True
+                await self._send(message)
+            return
+
+        if kind != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.compressor is not None:
+            data = self.compressor.compress(body) if more_body else self.compressor.finish(body)
+            await self._send({**message, "body": data})
+            return
+
+        self.pending.append(body)
+        self.pending_size += len(body)
+        if self.pending_size < self.middleware.minimum_size:
+            if more_body:
+                return
+            # Terminou abaixo do limite: vai como veio
+            await self._send(self.start)
+            await self._send({**message, "body": b"".join(self.pending)})
+            return
+
+        self.compressor = self.middleware.encoders[self.encoding]()
+        buffered = b"".join(self.pending)
+        self.pending = []
+        headers = MutableHeaders(raw=self.start["headers"])
+        headers["Content-Encoding"] = self.encoding
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+        if more_body:
+            del headers["Content-Length"]
+            data = self.compressor.compress(buffered)
+        else:
+            data = self.compressor.finish(buffered)
+            headers["Content-Length"] = str(len(data))
+        await self._send(self.start)
+        await self._send({**message, "body": data})
@@ -1,8 +1,22 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
+from sqlalchemy.engine import make_url
 from typing import Optional
 
 
+# Tipos comprimidos quando COMPRESSION_CONTENT_TYPES não é definido
+DEFAULT_CONTENT_TYPES = (
+    "application/json",
+    "application/geo+json",
+    "application/javascript",
+    "image/svg+xml",
+    "text/css",
+    "text/csv",
+    "text/html",
+    "text/plain",
+)
+
+
 class Settings(BaseSettings):
     PROJECT_NAME: str = "Bola Marcada"
     API_V1_STR: str = "/api/v1"
@@ -12,6 +26,27 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str = Field(..., validation_alias="POSTGRES_PASSWORD")
     POSTGRES_DB: str = Field(..., validation_alias="POSTGRES_DB")
     DATABASE_URL: Optional[str] = None
+    # Réplicas de leitura: URLs separadas por vírgula (vazio = só primário)
+    DATABASE_REPLICA_URLS: Optional[str] = None
+    REPLICA_RETRY_SECONDS: float = Field(
+        default=30.0, validation_alias="REPLICA_RETRY_SECONDS"
+    )
+
+    # Pool de conexões (ignorado para SQLite)
+    DB_POOL_SIZE: int = Field(default=5, validation_alias="DB_POOL_SIZE")
+    DB_MAX_OVERFLOW: int = Field(default=10, validation_alias="DB_MAX_OVERFLOW")
+    DB_POOL_RECYCLE: int = Field(default=1800, validation_alias="DB_POOL_RECYCLE")
+    DB_POOL_PRE_PING: bool = Field(default=True, validation_alias="DB_POOL_PRE_PING")
+    DB_POOL_TIMEOUT: float = Field(default=30.0, validation_alias="DB_POOL_TIMEOUT")
+    DB_ECHO: bool = Field(default=False, validation_alias="DB_ECHO")
+
+    # Instrumentação de SQL por request (Server-Timing + logs + alerta de N+1)
+    SQL_INSTRUMENTATION_ENABLED: bool = Field(
+        default=False, validation_alias="SQL_INSTRUMENTATION_ENABLED"
+    )
+    SQL_N_PLUS_ONE_THRESHOLD: int = Field(
+        default=3, validation_alias="SQL_N_PLUS_ONE_THRESHOLD"
+    )
 
     SECRET_KEY: str = Field(..., validation_alias="SECRET_KEY")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(
@@ -19,6 +54,109 @@ class Settings(BaseSettings):
     )
     ALGORITHM: str = "HS256"
 
+    # Cache de tokens JWT já verificados
+    JWT_CACHE_SIZE: int = Field(default=10000, validation_alias="JWT_CACHE_SIZE")
+    JWT_CACHE_MAX_TTL_SECONDS: float = Field(
+        default=300.0, validation_alias="JWT_CACHE_MAX_TTL_SECONDS"
+    )
+
+    # Cache do usuário autenticado em get_current_user
+    AUTH_USER_CACHE_SIZE: int = Field(
+        default=10000, validation_alias="AUTH_USER_CACHE_SIZE"
+    )
+    AUTH_USER_CACHE_TTL_SECONDS: float = Field(
+        default=60.0, validation_alias="AUTH_USER_CACHE_TTL_SECONDS"
+    )
+
+    # Pool de processos do bcrypt (None = nº de CPUs; 0 = threads)
+    HASH_POOL_SIZE: Optional[int] = Field(
+        default=None, validation_alias="HASH_POOL_SIZE"
+    )
+    HASH_QUEUE_DEPTH: int = Field(default=32, validation_alias="HASH_QUEUE_DEPTH")
+    HASH_TIMEOUT_SECONDS: float = Field(
+        default=5.0, validation_alias="HASH_TIMEOUT_SECONDS"
+    )
+
+    # Geocodificação de cidades (busca de centros por cidade)
+    GEOCODER_URL: str = Field(
+        default="https://nominatim.openstreetmap.org/search",
+        validation_alias="GEOCODER_URL",
+    )
+    GEOCODER_TIMEOUT_SECONDS: float = Field(
+        default=5.0, validation_alias="GEOCODER_TIMEOUT_SECONDS"
+    )
+    GEOCODE_CACHE_PATH: str = Field(
+        default="geocode_cache.sqlite3", validation_alias="GEOCODE_CACHE_PATH"
+    )
+    GEOCODE_CACHE_TTL_SECONDS: float = Field(
+        default=30 * 24 * 3600, validation_alias="GEOCODE_CACHE_TTL_SECONDS"
+    )
+    GEOCODE_NEGATIVE_TTL_SECONDS: float = Field(
+        default=24 * 3600, validation_alias="GEOCODE_NEGATIVE_TTL_SECONDS"
+    )
+    # CSV local de cidades (ver services/gazetteer_service.py); consultado
+    # antes do geocoder remoto. OFFLINE_ONLY desliga o remoto de vez.
+    GAZETTEER_PATH: Optional[str] = Field(default=None, validation_alias="GAZETTEER_PATH")
+    GEOCODER_OFFLINE_ONLY: bool = Field(
+        default=False, validation_alias="GEOCODER_OFFLINE_ONLY"
+    )
+
+    # Índice espacial em memória (KD-tree sobre NumPy) para busca por
+    # proximidade/bbox; o refresh recarrega do banco (0 = nunca)
+    SPATIAL_INDEX_ENABLED: bool = Field(
+        default=False, validation_alias="SPATIAL_INDEX_ENABLED"
+    )
+    SPATIAL_INDEX_REFRESH_SECONDS: float = Field(
+        default=300, validation_alias="SPATIAL_INDEX_REFRESH_SECONDS"
+    )
+
+    # Cache de ocupação em bitmap (busca de campos livres)
+    OCCUPANCY_CACHE_SIZE: int = Field(
+        default=100_000, validation_alias="OCCUPANCY_CACHE_SIZE"
+    )
+    OCCUPANCY_CACHE_TTL_SECONDS: float = Field(
+        default=60, validation_alias="OCCUPANCY_CACHE_TTL_SECONDS"
+    )
+
+    # Cache das leituras por id (ver core/entity_cache.py): "memory" (LRU
+    # no processo), "redis" (ENTITY_CACHE_REDIS_URL) ou "none"
+    ENTITY_CACHE_BACKEND: str = Field(
+        default="memory", validation_alias="ENTITY_CACHE_BACKEND"
+    )
+    ENTITY_CACHE_REDIS_URL: Optional[str] = Field(
+        default=None, validation_alias="ENTITY_CACHE_REDIS_URL"
+    )
+    ENTITY_CACHE_SIZE: int = Field(default=50_000, validation_alias="ENTITY_CACHE_SIZE")
+    ENTITY_CACHE_MAX_BYTES: int = Field(
+        default=64 * 2**20, validation_alias="ENTITY_CACHE_MAX_BYTES"
+    )
+    ENTITY_CACHE_TTL_SECONDS: float = Field(
+        default=60, validation_alias="ENTITY_CACHE_TTL_SECONDS"
+    )
+
+    # Cache-Control dos GETs por id (com ETag); "no-cache" = o cliente guarda
+    # e revalida com If-None-Match a cada uso
+    SPORTS_CENTER_CACHE_CONTROL: str = Field(
+        default="private, no-cache", validation_alias="SPORTS_CENTER_CACHE_CONTROL"
+    )
+    FIELD_CACHE_CONTROL: str = Field(
+        default="private, no-cache", validation_alias="FIELD_CACHE_CONTROL"
+    )
+    AVAILABILITY_CACHE_CONTROL: str = Field(
+        default="private, no-cache", validation_alias="AVAILABILITY_CACHE_CONTROL"
+    )
+
+    # Compressão das respostas (gzip; zstd/brotli se instalados). Tipos
+    # separados por vírgula; vazio = lista padrão de core/compression.py
+    COMPRESSION_ENABLED: bool = Field(default=True, validation_alias="COMPRESSION_ENABLED")
+    COMPRESSION_MINIMUM_SIZE: int = Field(
+        default=1024, validation_alias="COMPRESSION_MINIMUM_SIZE"
+    )
+    COMPRESSION_GZIP_LEVEL: int = Field(default=6, validation_alias="COMPRESSION_GZIP_LEVEL")
+    COMPRESSION_CONTENT_TYPES: Optional[str] = Field(
+        default=None, validation_alias="COMPRESSION_CONTENT_TYPES"
+    )
+
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
     def assemble_db_connection(self) -> str:
@@ -28,5 +166,37 @@ class Settings(BaseSettings):
                f"@{self.POSTGRES_SERVER}/{self.POSTGRES_DB}"
         )
 
+    def assemble_async_db_connection(self) -> str:
+        """Mesma URL de assemble_db_connection, trocando o driver por um assíncrono."""
+        return _to_async_url(self.assemble_db_connection())
+
+    def compression_content_types(self) -> tuple[str, ...]:
+        """Tipos de conteúdo comprimidos pelo CompressionMiddleware."""
+        if not self.COMPRESSION_CONTENT_TYPES:
+            return DEFAULT_CONTENT_TYPES
+        return tuple(
+            t.strip().lower() for t in self.COMPRESSION_CONTENT_TYPES.split(",") if t.strip()
+        )
+
+    def assemble_replica_connections(self) -> list[str]:
+        """URLs (assíncronas) das réplicas de leitura configuradas."""
+        if not self.DATABASE_REPLICA_URLS:
+            return []
+        return [
+            _to_async_url(url.strip())
+            for url in self.DATABASE_REPLICA_URLS.split(",")
+            if url.strip()
+        ]
+
+
+def _to_async_url(raw_url: str) -> str:
+    url = make_url(raw_url)
+    backend = url.get_backend_name()
+    if backend == "postgresql":
+        url = url.set(drivername="postgresql+asyncpg")
+    elif backend == "sqlite":
+        url = url.set(drivername="sqlite+aiosqlite")
+    return url.render_as_string(hide_password=False)
+
 
 settings = Settings()
@@ -1,16 +1,139 @@
+import itertools
+import time
+
+from fastapi import Depends, Request
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
-from core.config import settings 
+from core.config import settings
+from core.pool_metrics import InstrumentedAsyncQueuePool, pool_status
 
 Base = declarative_base()
 
-engine = create_engine(settings.assemble_db_connection(), future=True, echo=True)
+
+def _pool_options(url: str) -> dict:
+    """Opções de pool vindas do Settings; SQLite usa o pool padrão do dialeto."""
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+    }
+
+
+# Engine síncrono: usado por scripts/ferramentas offline (alembic usa o seu próprio)
+engine = create_engine(
+    settings.assemble_db_connection(),
+    future=True,
+    echo=settings.DB_ECHO,
+    **_pool_options(settings.assemble_db_connection()),
+)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, future=True)
 
-def get_db():
-    db = SessionLocal()
+
+def _create_async_engine(url: str):
+    options = _pool_options(url)
+    if options:
+        options["poolclass"] = InstrumentedAsyncQueuePool
+    return create_async_engine(url, echo=settings.DB_ECHO, **options)
+
+
+# Engine assíncrono: usado pelas rotas (asyncpg no Postgres, aiosqlite nos testes)
+async_engine = _create_async_engine(settings.assemble_async_db_connection())
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+
+async def get_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+class ReplicaRouter:
+    """
+    Distribui leituras entre réplicas em round-robin.
+    Uma réplica que falha ao conectar fica fora da rotação por
+    `retry_seconds` e depois volta a ser testada.
+    """
+
+    def __init__(self, urls: list[str], retry_seconds: float = 30.0):
+        self.urls = urls
+        self.engines = [_create_async_engine(url) for url in urls]
+        self.sessionmakers = [
+            async_sessionmaker(
+                bind=e, class_=AsyncSession, autoflush=False, expire_on_commit=False
+            )
+            for e in self.engines
+        ]
+        self.retry_seconds = retry_seconds
+        self._down_until = [0.0] * len(urls)
+        self._next = itertools.count()
+
+    def is_healthy(self, index: int) -> bool:
+        return time.monotonic() >= self._down_until[index]
+
+    def mark_down(self, index: int) -> None:
+        self._down_until[index] = time.monotonic() + self.retry_seconds
+
+    async def session(self) -> AsyncSession | None:
+        """Sessão numa réplica saudável, ou None se nenhuma responder."""
+        start = next(self._next)
+        for offset in range(len(self.engines)):
+            index = (start + offset) % len(self.engines)
+            if not self.is_healthy(index):
+                continue
+            db = self.sessionmakers[index]()
+            try:
+                # Força o checkout (com pre-ping) para detectar réplica fora do ar
+                await db.connection()
+                return db
+            except (DBAPIError, OSError):
+                await db.close()
+                self.mark_down(index)
+        return None
+
+    def status(self) -> list[dict]:
+        return [
+            {
+                "url": make_url(url).render_as_string(hide_password=True),
+                "healthy": self.is_healthy(i),
+                **pool_status(engine.pool),
+            }
+            for i, (url, engine) in enumerate(zip(self.urls, self.engines))
+        ]
+
+
+replica_router = ReplicaRouter(
+    settings.assemble_replica_connections(), settings.REPLICA_RETRY_SECONDS
+)
+
+READ_METHODS = {"GET", "HEAD"}
+
+
+async def get_read_db(request: Request, primary: AsyncSession = Depends(get_db)):
+    """
+    Sessão para rotas de leitura: GET/HEAD vão para uma réplica; qualquer
+    outro método fica no primário. Rotas que escrevem usam get_db, então
+    leitura-após-escrita no mesmo request continua no primário.
+    Sem réplicas saudáveis, usa o primário.
+    """
+    if request.method not in READ_METHODS or not replica_router.engines:
+        yield primary
+        return
+
+    db = await replica_router.session()
+    if db is None:
+        yield primary
+        return
     try:
         yield db
     finally:
-        db.close()
+        await db.close()
@@ -0,0 +1,418 @@
+"""
+Cache read-through das leituras por id (centro, campo, disponibilidade).
+
+Cada entrada guarda as colunas da linha serializadas (orjson) e volta como
+uma instância do model fora de sessão: as rotas leem os atributos (e a
+`version` da ETag) como se viesse do banco. Só leitura: quem altera a linha
+carrega pelo banco.
+
+Entradas são marcadas com duas tags: a da entidade ("fields:12") e a do
+dono ("sports_centers:3:fields"). Os services de escrita invalidam por tag
+depois do commit; creates só invalidam quando mudam outra entidade (review
+muda o agregado do centro), porque "não encontrado" não é guardado.
+
+Backends:
+- MemoryBackend (padrão): LRU no processo, limitado em entradas e bytes.
+- RedisBackend: qualquer servidor do protocolo Redis (RESP), cliente
+  mínimo sem dependência; o limite de memória é o `maxmemory` do servidor
+  (use `maxmemory-policy allkeys-lru`). Erros do backend não derrubam a
+  leitura: contam em `errors` e a consulta vai ao banco.
+
+Uma invalidação durante o carregamento descarta o resultado (não volta ao
+cache um valor anterior ao UPDATE); entre processos, ou com réplica de
+leitura atrasada, o TTL limita quanto tempo um valor velho sobrevive.
+"""
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from decimal import Decimal
+from urllib.parse import unquote, urlparse
+
+import orjson
+from sqlalchemy import inspect
+from sqlalchemy.orm.attributes import set_committed_value
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def entity_tag(model, id) -> str:
+    return f"{model.__tablename__}:{id}"
+
+
+def owner_tag(owner_model, owner_id, model) -> str:
+    """Tag de tudo de `model` que pertence a um dono (ex.: campos de um centro)."""
+    return f"{owner_model.__tablename__}:{owner_id}:{model.__tablename__}"
+
+
+# Serialização das linhas
+def _converter(column):
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return None
+    if python_type is datetime:
+        return datetime.fromisoformat
+    if python_type in (Decimal, uuid.UUID):
+        return python_type
+    return None
+
+
+def _default(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError
+
+
+class _Codec:
+    def __init__(self, model):
+        self.mapper = inspect(model)
+        self.attrs = [
+            (attr.key, _converter(attr.columns[0])) for attr in self.mapper.column_attrs
+        ]
+
+    def dumps(self, obj) -> bytes:
+        values = {key: getattr(obj, key) for key, _ in self.attrs}
+        return orjson.dumps(values, default=_default)
+
+    def loads(self, data: bytes):
+        values = orjson.loads(data)
+        obj = self.mapper.class_manager.new_instance()
+        for key, convert in self.attrs:
+            value = values.get(key)
+            if value is not None and convert is not None:
+                value = convert(value)
+            set_committed_value(obj, key, value)
+        return obj
+
+
+# Backends
+class MemoryBackend:
+    """LRU em memória com TTL e índice tag -> chaves; limitado em itens e bytes."""
+
+    def __init__(self, maxsize: int = 50_000, max_bytes: int = 64 * 2**20):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.evictions = 0
+        self._data: OrderedDict[str, tuple[float, bytes, tuple[str, ...]]] = OrderedDict()
+        self._tags: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+
+    async def get(self, key: str) -> bytes | None:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            if item[0] <= time.monotonic():
+                self._remove(key)
+                return None
+            self._data.move_to_end(key)
+            return item[1]
+
+    async def set(self, key: str, value: bytes, ttl: float, tags) -> None:
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (time.monotonic() + ttl, value, tuple(tags))
+            self.bytes += len(value)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while self._data and (
+                len(self._data) > self.maxsize or self.bytes > self.max_bytes
+            ):
+                self._remove(next(iter(self._data)))
+                self.evictions += 1
+
+    async def invalidate(self, tags) -> None:
+        with self._lock:
+            for tag in tags:
+                for key in self._tags.pop(tag, ()):
+                    self._remove(key)
+
+    async def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._tags.clear()
+            self.bytes = 0
+
+    def _remove(self, key: str) -> None:
+        item = self._data.pop(key, None)
+        if item is None:
+            return
+        self.bytes -= len(item[1])
+        for tag in item[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def stats(self) -> dict:
+        return {
+            "backend": "memory",
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+        }
+
+
+class RedisError(Exception):
+    """Resposta de erro (-ERR ...) do servidor."""
+
+
+class RedisBackend:
+    """
+    Cliente RESP mínimo (GET/SET/SADD/EXPIRE/EVAL/SCAN/DEL) com pool de
+    conexões por event loop. Cada operação é um pipeline: uma ida e volta.
+    """
+
+    # Lê e apaga os membros das tags num passo só no servidor: um SET que
+    # entrasse entre o SMEMBERS e o DEL ficaria em cache sem tag nenhuma.
+    # (Os membros não vão em KEYS: não serve para Redis Cluster.)
+    _INVALIDATE = b"""
+        local removed = 0
+        for _, tag in ipairs(KEYS) do
+            local members = redis.call('SMEMBERS', tag)
+            for i = 1, #members, 1000 do
+                removed = removed + redis.call(
+                    'DEL', unpack(members, i, math.min(i + 999, #members)))
+            end
+            redis.call('DEL', tag)
+        end
+        return removed
+    """
+
+    def __init__(self, url: str, prefix: str = "bm:", timeout: float = 0.5):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.db = int(parsed.path.strip("/") or 0)
+        self.prefix = prefix
+        self.timeout = timeout
+        self._idle: list[tuple] = []
+
+    async def get(self, key: str) -> bytes | None:
+        (value,) = await self._pipeline([b"GET", self._key(key)])
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float, tags) -> None:
+        seconds = str(max(1, int(ttl))).encode()
+        commands = [[b"SET", self._key(key), value, b"EX", seconds]]
+        for tag in tags:
+            # O conjunto da tag expira junto com a entrada mais nova
+            commands.append([b"SADD", self._tag(tag), self._key(key)])
+            commands.append([b"EXPIRE", self._tag(tag), seconds])
+        await self._pipeline(*commands)
+
+    async def invalidate(self, tags) -> None:
+        tag_keys = [self._tag(tag) for tag in tags]
+        if tag_keys:
+            await self._pipeline(
+                [b"EVAL", self._INVALIDATE, str(len(tag_keys)).encode(), *tag_keys]
+            )
+
+    async def clear(self) -> None:
+        # Só as chaves deste cache (prefixo), não o banco inteiro
+        cursor = b"0"
+        while True:
+            ((cursor, keys),) = await self._pipeline(
+                [b"SCAN", cursor, b"MATCH", self.prefix.encode() + b"*", b"COUNT", b"1000"]
+            )
+            if keys:
+                await self._pipeline([b"DEL", *keys])
+            if cursor == b"0":
+                return
+
+    def stats(self) -> dict:
+        return {"backend": "redis", "host": f"{self.host}:{self.port}", "db": self.db}
+
+    def _key(self, key: str) -> bytes:
+        return f"{self.prefix}{key}".encode()
+
+    def _tag(self, tag: str) -> bytes:
+        return f"{self.prefix}tag:{tag}".encode()
+
+    async def _pipeline(self, *commands) -> list:
+        reader, writer = await self._acquire()
+        try:
+            payload = b"".join(_encode(command) for command in commands)
+            replies = await asyncio.wait_for(
+                _exchange(reader, writer, payload, len(commands)), self.timeout
+            )
+        except BaseException:
+            writer.close()
+            raise
+        self._idle.append((asyncio.get_running_loop(), reader, writer))
+        for reply in replies:
+            if isinstance(reply, RedisError):
+                raise reply
+        return replies
+
+    async def _acquire(self):
+        loop = asyncio.get_running_loop()
+        while self._idle:
+            owner, reader, writer = self._idle.pop()
+            # Conexão de outro event loop (ex.: TestClient) não serve neste
+            if owner is loop and not writer.is_closing():
+                return reader, writer
+            try:
+                writer.close()
+            except RuntimeError:  # loop de origem já fechado
+                pass
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), self.timeout
+        )
+        setup = []
+        if self.password:
+            setup.append([b"AUTH", self.password.encode()])
+        if self.db:
+            setup.append([b"SELECT", str(self.db).encode()])
+        if setup:
+            payload = b"".join(_encode(c) for c in setup)
+            for reply in await asyncio.wait_for(
+                _exchange(reader, writer, payload, len(setup)), self.timeout
+            ):
+                if isinstance(reply, RedisError):
+                    writer.close()
+                    raise reply
+        return reader, writer
+
+
+def _encode(command) -> bytes:
+    parts = [b"*%d\r\n" % len(command)]
+    for arg in command:
+        parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(parts)
+
+
+async def _read_reply(reader: asyncio.StreamReader):
+    line = await reader.readuntil(b"\r\n")
+    kind, rest = line[:1], line[1:-2]
+    if kind == b"+":
+        return rest
+    if kind == b"-":
+        return RedisError(rest.decode())
+    if kind == b":":
+        return int(rest)
+    if kind == b"$":
+        size = int(rest)
+        return None if size < 0 else (await reader.readexactly(size + 2))[:-2]
+    if kind == b"*":
+        size = int(rest)
+        return None if size < 0 else [await _read_reply(reader) for _ in range(size)]
+    raise RedisError(f"resposta RESP inválida: {line!r}")
+
+
+async def _exchange(reader, writer, payload: bytes, n: int) -> list:
+    writer.write(payload)
+    await writer.drain()
+    return [await _read_reply(reader) for _ in range(n)]
+
+
+class EntityCache:
+    """Leituras por id com read-through, invalidação por tag e métricas."""
+
+    def __init__(self, backend, ttl: float = 60.0):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.invalidations = 0
+        self._generation = 0
+        self._codecs: dict = {}
+
+    async def get(self, model, id, load, owner: tuple | None = None):
+        """
+        Devolve a linha `id` de `model` do cache ou de `load()` (que vai ao
+        banco). `owner` = (model do dono, atributo com o id dele), para a tag.
+        """
+        if self.backend is None:
+            return await load()
+        codec = self._codec(model)
+        key = entity_tag(model, id)
+        try:
+            data = await self.backend.get(key)
+        except Exception as e:
+            self._error("get", e)
+            return await load()
+        if data is not None:
+            self.hits += 1
+            return codec.loads(data)
+
+        self.misses += 1
+        generation = self._generation
+        obj = await load()
+        if obj is None or generation != self._generation:
+            return obj
+        tags = [key]
+        if owner is not None:
+            owner_model, attribute = owner
+            tags.append(owner_tag(owner_model, getattr(obj, attribute), model))
+        try:
+            await self.backend.set(key, codec.dumps(obj), self.ttl, tags)
+        except Exception as e:
+            self._error("set", e)
+        return obj
+
+    async def invalidate(self, *tags: str) -> None:
+        """Remove as entradas marcadas com qualquer uma das tags."""
+        self._generation += 1
+        self.invalidations += 1
+        if self.backend is None or not tags:
+            return
+        try:
+            await self.backend.invalidate(tags)
+        except Exception as e:
+            self._error("invalidate", e)
+
+    async def clear(self) -> None:
+        self._generation += 1
+        if self.backend is not None:
+            await self.backend.clear()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        stats = {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+            "errors": self.errors,
+            "invalidations": self.invalidations,
+            "ttl": self.ttl,
+        }
+        if self.backend is not None:
+            stats.update(self.backend.stats())
+        return stats
+
+    def _codec(self, model) -> _Codec:
+        codec = self._codecs.get(model)
+        if codec is None:
+            codec = self._codecs[model] = _Codec(model)
+        return codec
+
+    def _error(self, operation: str, error: Exception) -> None:
+        self.errors += 1
+        logger.warning("cache de entidades: falha no %s: %r", operation, error)
+
+
+def _backend_from_settings():
+    if settings.ENTITY_CACHE_BACKEND == "none":
+        return None
+    if settings.ENTITY_CACHE_BACKEND == "redis":
+        return RedisBackend(settings.ENTITY_CACHE_REDIS_URL or "redis://localhost:6379/0")
+    return MemoryBackend(
+        maxsize=settings.ENTITY_CACHE_SIZE, max_bytes=settings.ENTITY_CACHE_MAX_BYTES
+    )
+
+
+entity_cache = EntityCache(_backend_from_settings(), ttl=settings.ENTITY_CACHE_TTL_SECONDS)
@@ -0,0 +1,94 @@
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+# Limites (em ms) dos buckets do histograma de espera por conexão
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+
+class PoolMetrics:
+    """Contadores de checkout do pool: total, timeouts e histograma de espera."""
+
+    def __init__(self, buckets_ms: tuple = WAIT_BUCKETS_MS):
+        self.buckets_ms = buckets_ms
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.wait_total_ms = 0.0
+            self.wait_max_ms = 0.0
+            # Último bucket acumula tudo acima do maior limite
+            self.wait_histogram = [0] * (len(self.buckets_ms) + 1)
+
+    def record_wait(self, wait_ms: float) -> None:
+        index = len(self.buckets_ms)
+        for i, limit in enumerate(self.buckets_ms):
+            if wait_ms <= limit:
+                index = i
+                break
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total_ms += wait_ms
+            self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+            self.wait_histogram[index] += 1
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            labels = [f"le_{limit}ms" for limit in self.buckets_ms] + ["inf"]
+            return {
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.timeouts,
+                "wait_avg_ms": (
+                    self.wait_total_ms / self.checkouts if self.checkouts else 0.0
+                ),
+                "wait_max_ms": self.wait_max_ms,
+                "wait_histogram_ms": dict(zip(labels, self.wait_histogram)),
+            }
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool que mede o tempo de cada checkout."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.record_wait((time.perf_counter() - start) * 1000)
+        return connection
+
+    def recreate(self):
+        # engine.dispose() troca o pool; as métricas continuam acumulando
+        new_pool = super().recreate()
+        new_pool.metrics = self.metrics
+        return new_pool
+
+
+def pool_status(pool) -> dict:
+    """Estado atual do pool + métricas, quando o pool for instrumentado."""
+    status = {"pool_class": type(pool).__name__}
+    if hasattr(pool, "checkedout"):
+        status.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=pool.overflow(),
+        )
+    if isinstance(pool, InstrumentedAsyncQueuePool):
+        status.update(pool.metrics.snapshot())
+    return status
@@ -0,0 +1,128 @@
+"""
+Instrumentação de SQL por request: número de queries, tempo total no banco,
+query mais lenta e statements repetidos (provável N+1).
+
+Só é instalada quando SQL_INSTRUMENTATION_ENABLED=True; desligada, não há
+listeners nem middleware no caminho do request.
+"""
+import contextvars
+import logging
+import time
+from collections import Counter
+
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+_current_stats: contextvars.ContextVar["RequestSQLStats | None"] = (
+    contextvars.ContextVar("request_sql_stats", default=None)
+)
+
+
+class RequestSQLStats:
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.slowest_ms = 0.0
+        self.slowest_statement: str | None = None
+        self.statements: Counter = Counter()
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.statements[statement] += 1
+        if elapsed_ms > self.slowest_ms:
+            self.slowest_ms = elapsed_ms
+            self.slowest_statement = statement
+
+    def repeated(self, threshold: int) -> dict[str, int]:
+        """Statements idênticos executados `threshold` vezes ou mais."""
+        return {s: n for s, n in self.statements.items() if n >= threshold}
+
+    def server_timing(self) -> str:
+        return (
+            f'db;dur={self.total_ms:.2f};desc="{self.count} queries", '
+            f'db-slowest;dur={self.slowest_ms:.2f}'
+        )
+
+
+def _before_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+):
+    if _current_stats.get() is not None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+):
+    stats = _current_stats.get()
+    if stats is None or not conn.info.get("query_start"):
+        return
+    elapsed_ms = (time.perf_counter() - conn.info["query_start"].pop()) * 1000
+    stats.record(statement, elapsed_ms)
+
+
+def instrument_engine(sync_engine) -> None:
+    """Registra os hooks de cursor num Engine síncrono (`.sync_engine` no async)."""
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class SQLInstrumentationMiddleware:
+    """Middleware ASGI que abre um RequestSQLStats por request e publica o resumo."""
+
+    def __init__(self, app, n_plus_one_threshold: int = 3):
+        self.app = app
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestSQLStats()
+        token = _current_stats.set(stats)
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", stats.server_timing().encode()))
+                headers.append((b"x-db-query-count", str(stats.count).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _current_stats.reset(token)
+            self._log(scope, stats)
+
+    def _log(self, scope, stats: RequestSQLStats) -> None:
+        if not stats.count:
+            return
+        path = f"{scope['method']} {scope['path']}"
+        logger.info(
+            "%s: %d queries, %.2f ms no banco, mais lenta %.2f ms: %s",
+            path,
+            stats.count,
+            stats.total_ms,
+            stats.slowest_ms,
+            stats.slowest_statement,
+        )
+        for statement, times in stats.repeated(self.n_plus_one_threshold).items():
+            logger.warning(
+                "%s: possível N+1, statement executado %d vezes: %s",
+                path,
+                times,
+                statement,
+            )
+
+
+def install_sql_instrumentation(app, engines, n_plus_one_threshold: int = 3) -> None:
+    for sync_engine in engines:
+        instrument_engine(sync_engine)
+    app.add_middleware(
+        SQLInstrumentationMiddleware, n_plus_one_threshold=n_plus_one_threshold
+    )
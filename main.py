@@ -1,33 +1,46 @@
-try:
-    import bcrypt
+from contextlib import asynccontextmanager
 
-    if not hasattr(bcrypt, "__about__"):
-
-        class _About:
-            __version__ = getattr(bcrypt, "__version__", "4")
-
-        bcrypt.__about__ = _About()
-except Exception:
-    pass
-
-import logging
-
-logging.getLogger("passlib").setLevel(logging.ERROR)
-
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 
+from core.compression import CompressionMiddleware
 from core.config import settings
+from core.database import AsyncSessionLocal, async_engine, engine, replica_router
+from core.sql_instrumentation import install_sql_instrumentation
 
 from routes.availability_routes import availability_router
 from routes.booking_routes import booking_router
 from routes.field_routes import field_router
+from routes.internal_routes import internal_router
 from routes.review_routes import review_router
 from routes.sports_center_routes import sports_center_router
 from routes.user_routes import user_router
+from services.geocoding_service import geocoder
+from services.spatial_index import start_spatial_index
+from utils.hashing import HashingUnavailable
+from utils.security import hashing_pool
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Sobe os workers do bcrypt antes do primeiro login
+    hashing_pool.start()
+    spatial_refresh = await start_spatial_index(AsyncSessionLocal)
+    yield
+    if spatial_refresh is not None:
+        spatial_refresh.cancel()
+    hashing_pool.shutdown()
+    await geocoder.aclose()
 
-app = FastAPI(title=settings.PROJECT_NAME)
+
+# Respostas serializadas com orjson (os response_model validam antes)
+app = FastAPI(
+    title=settings.PROJECT_NAME,
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 # CORS p/ dev (ajuste origens conforme seu front)
 app.add_middleware(
@@ -38,12 +51,40 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        content_types=settings.compression_content_types(),
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    )
+
+if settings.SQL_INSTRUMENTATION_ENABLED:
+    install_sql_instrumentation(
+        app,
+        [engine, async_engine.sync_engine]
+        + [e.sync_engine for e in replica_router.engines],
+        n_plus_one_threshold=settings.SQL_N_PLUS_ONE_THRESHOLD,
+    )
+
+
+# Pool do bcrypt saturado: 503 para o cliente tentar de novo em seguida
+@app.exception_handler(HashingUnavailable)
+async def hashing_unavailable_handler(request: Request, exc: HashingUnavailable):
+    return ORJSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "1"},
+    )
+
+
 API_PREFIX = settings.API_V1_STR  # "/api/v1"
 
 # Monte TODOS os routers com o prefixo
 app.include_router(availability_router, prefix=API_PREFIX)
 app.include_router(booking_router, prefix=API_PREFIX)
 app.include_router(field_router, prefix=API_PREFIX)
+app.include_router(internal_router, prefix=API_PREFIX)
 app.include_router(review_router, prefix=API_PREFIX)
 app.include_router(sports_center_router, prefix=API_PREFIX)
 app.include_router(user_router, prefix=API_PREFIX)
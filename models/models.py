@@ -1,4 +1,5 @@
 from sqlalchemy import (
+    DDL,
     DateTime,
     Numeric,
     Text,
@@ -7,14 +8,32 @@ from sqlalchemy import (
     Integer,
     Boolean,
     ForeignKey,
+    Index,
+    event,
 )
 from sqlalchemy.sql import func
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 from core.database import Base
+from utils.geo import geohash_encode
 from sqlalchemy.types import CHAR, TypeDecorator
 
 
+# Coluna preenchida por server_default=now(). No SQLite o CURRENT_TIMESTAMP
+# grava só segundos ("AAAA-MM-DD HH:MM:SS") e a comparação é textual: os
+# valores ligados (cursores de paginação) precisam usar o mesmo formato.
+Timestamp = DateTime(timezone=True).with_variant(
+    sqlite.DATETIME(
+        storage_format=(
+            "%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"
+        ),
+        regexp=r"(\d+)-(\d+)-(\d+) (\d+):(\d+):(\d+)",
+    ),
+    "sqlite",
+)
+
+
 # Tabela Usuários
 class GUID(TypeDecorator):
     impl = CHAR
@@ -55,12 +74,18 @@ class User(Base):
     is_active = Column("active", Boolean, default=True, nullable=False)
     is_admin = Column("admin", Boolean, default=False, nullable=False)
     avatar = Column(String, nullable=False, default="default_avatar.png")
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(Timestamp, server_default=func.now())
 
 
 # Tabela de Espaço Esportivo
 class SportsCenter(Base):
     __tablename__ = "sports_centers"
+    __table_args__ = (
+        # Listagem por dono, paginada por id
+        Index("ix_sports_centers_user_id_id", "user_id", "id"),
+        # Busca por cidade (faixa de latitude/longitude) sem o índice em memória
+        Index("ix_sports_centers_latitude_longitude", "latitude", "longitude"),
+    )
 
     # Keys
     id = Column("id", Integer, primary_key=True, autoincrement=True)
@@ -71,9 +96,24 @@ class SportsCenter(Base):
     cnpj = Column("cnpj", String, unique=True, nullable=False)
     latitude = Column("latitude", Numeric(9, 6), nullable=False)
     longitude = Column("longitude", Numeric(9, 6), nullable=False)
+    # Geohash de (latitude, longitude); índice usado na busca por raio
+    geohash = Column("geohash", String(12), index=True)
     photo_path = Column("photo_path", String)
     description = Column("description", String)
 
+    # Agregado das reviews, mantido junto com cada review criada/removida
+    # (ver services/rating_service.py)
+    rating_count = Column("rating_count", Integer, nullable=False, default=0, server_default="0")
+    rating_sum = Column("rating_sum", Integer, nullable=False, default=0, server_default="0")
+    stars_1 = Column("stars_1", Integer, nullable=False, default=0, server_default="0")
+    stars_2 = Column("stars_2", Integer, nullable=False, default=0, server_default="0")
+    stars_3 = Column("stars_3", Integer, nullable=False, default=0, server_default="0")
+    stars_4 = Column("stars_4", Integer, nullable=False, default=0, server_default="0")
+    stars_5 = Column("stars_5", Integer, nullable=False, default=0, server_default="0")
+
+    # Versão da linha, incrementada a cada UPDATE (ETag, ver utils/etag.py)
+    version = Column("version", Integer, nullable=False, default=1, server_default="1")
+
     def __init__(
         self,
         user_id,
@@ -84,18 +124,49 @@ class SportsCenter(Base):
         photo_path=None,
         description=None,
     ):
-        self.user_id = user_id
+        # O schema recebe user_id como str; o tipo UUID (fora do Postgres) exige uuid.UUID
+        self.user_id = user_id if isinstance(user_id, uuid.UUID) else uuid.UUID(str(user_id))
         self.name = name
         self.cnpj = cnpj
         self.latitude = latitude
         self.longitude = longitude
+        self.geohash = geohash_encode(float(latitude), float(longitude))
         self.photo_path = photo_path
         self.description = description
 
+    @property
+    def rating_average(self) -> float | None:
+        return round(self.rating_sum / self.rating_count, 2) if self.rating_count else None
+
+    @property
+    def rating_histogram(self) -> dict[int, int]:
+        return {star: getattr(self, f"stars_{star}") for star in range(1, 6)}
+
 
 # Tabela de avaliações
 class Review(Base):
     __tablename__ = "reviews"
+    __table_args__ = (
+        # Feed do centro (mais novas primeiro, keyset em created_at, id); no
+        # PostgreSQL o rating vai junto no índice para filtrar sem ler a tabela
+        Index(
+            "ix_reviews_center_created_at_id",
+            "sports_center_id",
+            "created_at",
+            "id",
+            postgresql_include=["rating"],
+        ),
+        # Feed filtrado por nota: vai direto ao trecho daquela nota
+        Index(
+            "ix_reviews_center_rating_created_at_id",
+            "sports_center_id",
+            "rating",
+            "created_at",
+            "id",
+        ),
+        # FK: DELETE de usuário checa reviews.user_id
+        Index("ix_reviews_user_id", "user_id"),
+    )
 
     # Keys
     id = Column("id", Integer, primary_key=True, autoincrement=True)
@@ -107,18 +178,29 @@ class Review(Base):
     # Campos
     rating = Column("rating", Integer, nullable=False)
     comment = Column("comment", String)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(Timestamp, server_default=func.now())
 
-    def __init__(self, field_id, user_id, rating, comment=None):
-        self.field_id = field_id
-        self.user_id = user_id
+    def __init__(self, sports_center_id, user_id, rating, comment=None):
+        self.sports_center_id = sports_center_id
+        self.user_id = user_id if isinstance(user_id, uuid.UUID) else uuid.UUID(str(user_id))
         self.rating = rating
         self.comment = comment
 
 
+# Unicidades garantidas pelo banco (ver utils/returning.py)
+FIELD_NAME_UNIQUE = "uq_fields_sports_center_id_name"
+AVAILABILITY_UNIQUE = "uq_availabilities_field_id_start_time_end_time"
+
+
 # Tabela de campos
 class Field(Base):
     __tablename__ = "fields"
+    __table_args__ = (
+        # Listagem por centro, paginada por id
+        Index("ix_fields_sports_center_id_id", "sports_center_id", "id"),
+        # Nome único no centro: o create não faz SELECT prévio, o banco rejeita
+        Index(FIELD_NAME_UNIQUE, "sports_center_id", "name", unique=True),
+    )
 
     # Keys
     id = Column("id", Integer, primary_key=True, autoincrement=True)
@@ -132,6 +214,7 @@ class Field(Base):
     price_per_hour = Column("price_per_hour", Numeric, nullable=False)
     photo_path = Column("photo_path", String)
     description = Column("description", Text)
+    version = Column("version", Integer, nullable=False, default=1, server_default="1")
 
     def __init__(
         self,
@@ -153,6 +236,17 @@ class Field(Base):
 # Tabela de Disponibilidades
 class Availability(Base):
     __tablename__ = "availabilities"
+    __table_args__ = (
+        # Janelas por campo (slots, ocupação) e cobre a FK de fields; único:
+        # o create não faz SELECT prévio, o banco rejeita a duplicata
+        Index(
+            AVAILABILITY_UNIQUE,
+            "field_id",
+            "start_time",
+            "end_time",
+            unique=True,
+        ),
+    )
 
     # Keys
     id = Column("id", Integer, primary_key=True, autoincrement=True)
@@ -164,6 +258,7 @@ class Availability(Base):
     )  # 0 = domingo, 1 = segunda, ...
     start_time = Column("start_time", DateTime, nullable=False)
     end_time = Column("end_time", DateTime, nullable=False)
+    version = Column("version", Integer, nullable=False, default=1, server_default="1")
 
     def __init__(self, field_id, day_of_week, start_time, end_time):
         self.field_id = field_id
@@ -175,6 +270,11 @@ class Availability(Base):
 # Tabela de Reservas de campo
 class Booking(Base):
     __tablename__ = "bookings"
+    __table_args__ = (
+        Index("ix_bookings_field_id_start_time", "field_id", "start_time"),
+        # Reservas de um usuário, mais recentes primeiro
+        Index("ix_bookings_user_id_start_time_id", "user_id", "start_time", "id"),
+    )
 
     # Keys
     id = Column("id", Integer, primary_key=True, autoincrement=True)
@@ -184,16 +284,65 @@ class Booking(Base):
     # Campos
     day_of_week = Column("day_of_week", Integer, nullable=False)
     start_time = Column("start_time", DateTime, nullable=False)
+    end_time = Column("end_time", DateTime, nullable=False)
     status = Column("status", String, default="pending")
 
-    def __init__(self, user_id, field_id, day_of_week, start_time, status="pending"):
+    def __init__(
+        self, user_id, field_id, day_of_week, start_time, end_time, status="pending"
+    ):
         self.user_id = user_id
         self.field_id = field_id
         self.day_of_week = day_of_week
         self.start_time = start_time
+        self.end_time = end_time
         self.status = status
 
 
+# Reservas ativas de um campo não podem se sobrepor. O banco garante:
+# - PostgreSQL: exclusion constraint GiST sobre tsrange(start_time, end_time)
+# - SQLite: triggers que abortam o INSERT/UPDATE conflitante
+# O nome aparece na mensagem de erro nos dois casos (ver booking_service).
+BOOKING_OVERLAP_CONSTRAINT = "ex_bookings_field_time"
+
+_SQLITE_OVERLAP_CHECK = """
+    WHEN COALESCE(NEW.status, '') <> 'cancelled' AND EXISTS (
+        SELECT 1 FROM bookings
+        WHERE field_id = NEW.field_id
+          AND COALESCE(status, '') <> 'cancelled'
+          AND start_time < NEW.end_time
+          AND end_time > NEW.start_time
+          {extra}
+    )
+    BEGIN SELECT RAISE(ABORT, '{name}'); END
+"""
+
+BOOKING_OVERLAP_DDL = {
+    "postgresql": [
+        "CREATE EXTENSION IF NOT EXISTS btree_gist",
+        f"ALTER TABLE bookings ADD CONSTRAINT {BOOKING_OVERLAP_CONSTRAINT}"
+        " EXCLUDE USING gist (field_id WITH =, tsrange(start_time, end_time) WITH &&)"
+        " WHERE (status IS DISTINCT FROM 'cancelled')",
+    ],
+    "sqlite": [
+        f"CREATE TRIGGER {BOOKING_OVERLAP_CONSTRAINT}_insert BEFORE INSERT ON bookings"
+        + _SQLITE_OVERLAP_CHECK.format(extra="", name=BOOKING_OVERLAP_CONSTRAINT),
+        f"CREATE TRIGGER {BOOKING_OVERLAP_CONSTRAINT}_update"
+        " BEFORE UPDATE OF field_id, start_time, end_time, status ON bookings"
+        + _SQLITE_OVERLAP_CHECK.format(
+            extra="AND id <> NEW.id", name=BOOKING_OVERLAP_CONSTRAINT
+        ),
+    ],
+}
+
+for _dialect, _statements in BOOKING_OVERLAP_DDL.items():
+    for _statement in _statements:
+        event.listen(
+            Booking.__table__,
+            "after_create",
+            DDL(_statement).execute_if(dialect=_dialect),
+        )
+
+
 # alembic init alembic
 # alterar env.py
 # alterar alembic.ini
@@ -1,44 +1,140 @@
-from fastapi import APIRouter, HTTPException
-from schemas.availability_schemas import AvailabilityCreate, AvailabilityUpdate
+from fastapi import APIRouter, HTTPException, Request, Response
+
+from core.config import settings
+from models.models import Availability
+from schemas.availability_schemas import (
+    AvailabilityBulkCreate,
+    AvailabilityBulkUpdate,
+    AvailabilityCreate,
+    AvailabilityResponse,
+    AvailabilityUpdate,
+    AvailabilityWeeklyCreate,
+)
+from schemas.bulk_schemas import BulkDelete
 from services.availability_service import (
+    create_availabilities_bulk_service,
     create_availability_service,
+    create_availability_weekly_service,
+    delete_availabilities_bulk_service,
     delete_availability_by_id,
     get_availability_by_id,
+    update_availabilities_bulk_service,
+    update_availability_service,
 )
+from utils.bulk import bulk_response
+from utils.etag import EntityETag
 from fastapi import Depends
-from core.database import get_db
-from sqlalchemy.orm import Session
+from core.database import get_db, get_read_db
+from sqlalchemy.ext.asyncio import AsyncSession
 
 availability_router = APIRouter(prefix="/availability", tags=["availability"])
+availability_etag = EntityETag(
+    Availability, AvailabilityResponse, settings.AVAILABILITY_CACHE_CONTROL
+)
 
 
 @availability_router.post("/create", status_code=201)
 async def create_availability(
     availability_create: AvailabilityCreate,
-    session: Session = Depends(get_db),
+    session: AsyncSession = Depends(get_db),
 ):
     try:
-        new_id = create_availability_service(session, availability_create)
+        new_id = await create_availability_service(session, availability_create)
         return {"message": "Disponibilidade criada com sucesso.", "id": new_id}
     except ValueError as e:
         raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         raise HTTPException(
             status_code=400, detail=f"Erro ao criar disponibilidade: {str(e)}"
         )
 
 
-@availability_router.get("/{availability_id}")
-async def get_availability(availability_id: int, session: Session = Depends(get_db)):
+@availability_router.post("/weekly", status_code=201)
+async def create_availability_weekly(
+    availability_weekly: AvailabilityWeeklyCreate,
+    session: AsyncSession = Depends(get_db),
+):
+    # Padrão semanal para vários campos (ou um centro inteiro) de uma vez
+    try:
+        return await create_availability_weekly_service(session, availability_weekly)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        await session.rollback()
+        raise HTTPException(
+            status_code=400, detail=f"Erro ao criar disponibilidades: {str(e)}"
+        )
+
+
+@availability_router.post("/bulk/create")
+async def create_availabilities_bulk(
+    bulk: AvailabilityBulkCreate, session: AsyncSession = Depends(get_db)
+):
+    # Vários itens em uma transação; resultado por item
+    try:
+        summary = await create_availabilities_bulk_service(session, bulk)
+    except Exception as e:
+        await session.rollback()
+        raise HTTPException(
+            status_code=400, detail=f"Erro ao criar disponibilidades: {str(e)}"
+        )
+    return bulk_response(summary, bulk.atomic)
+
+
+@availability_router.post("/bulk/update")
+async def update_availabilities_bulk(
+    bulk: AvailabilityBulkUpdate, session: AsyncSession = Depends(get_db)
+):
+    try:
+        summary = await update_availabilities_bulk_service(session, bulk)
+    except Exception as e:
+        await session.rollback()
+        raise HTTPException(
+            status_code=400, detail=f"Erro ao atualizar disponibilidades: {str(e)}"
+        )
+    return bulk_response(summary, bulk.atomic)
+
+
+@availability_router.post("/bulk/delete")
+async def delete_availabilities_bulk(
+    bulk: BulkDelete, session: AsyncSession = Depends(get_db)
+):
+    try:
+        summary = await delete_availabilities_bulk_service(session, bulk)
+    except Exception as e:
+        await session.rollback()
+        raise HTTPException(
+            status_code=400, detail=f"Erro ao deletar disponibilidades: {str(e)}"
+        )
+    return bulk_response(summary, bulk.atomic)
+
+
+@availability_router.get(
+    "/{availability_id}",
+    response_model=AvailabilityResponse,
+    responses={304: {"description": "Não modificado (If-None-Match)"}},
+)
+async def get_availability(
+    availability_id: int,
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_read_db),
+):
+    # If-None-Match com a versão atual: 304 sem carregar a linha
+    not_modified = await availability_etag.not_modified(request, session, availability_id)
+    if not_modified:
+        return not_modified
+
     # Busca a disponibilidade pelo ID
-    availability = get_availability_by_id(session, availability_id)
+    availability = await get_availability_by_id(session, availability_id)
 
     # Se não existir, retorna erro 404
     if not availability:
         raise HTTPException(status_code=404, detail="Disponibilidade não encontrada.")
 
     # Retorna os dados da disponibilidade
+    availability_etag.tag(response, availability)
     return availability
 
 
@@ -46,42 +142,34 @@ async def get_availability(availability_id: int, session: Session = Depends(get_
 async def update_availability(
     availability_id: int,
     availability_update: AvailabilityUpdate,
-    session: Session = Depends(get_db),
+    session: AsyncSession = Depends(get_db),
 ):
     try:
-        # Tenta buscar a disponibilidade existente
-        existing_availability = get_availability_by_id(session, availability_id)
-        if not existing_availability:
-            raise HTTPException(
-                status_code=404, detail="Disponibilidade não encontrada."
-            )
-
-        # Atualiza os campos da disponibilidade existente
-        for key, value in availability_update.dict(exclude_unset=True).items():
-            setattr(existing_availability, key, value)
-
-        session.commit()
-        session.refresh(existing_availability)
+        await update_availability_service(
+            session, availability_id, availability_update
+        )
         return {"message": "Disponibilidade atualizada com sucesso."}
-    except HTTPException:
-        raise
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         raise HTTPException(
             status_code=400, detail=f"Erro ao atualizar disponibilidade: {str(e)}"
         )
 
 
 @availability_router.delete("/{availability_id}")
-async def delete_availability(availability_id: int, session: Session = Depends(get_db)):
+async def delete_availability(
+    availability_id: int, session: AsyncSession = Depends(get_db)
+):
     try:
         # Chama o método que tenta deletar a disponibilidade
-        delete_availability_by_id(session, availability_id)
+        await delete_availability_by_id(session, availability_id)
         return {"message": "Disponibilidade deletada com sucesso."}
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         raise HTTPException(
             status_code=400, detail=f"Erro ao deletar disponibilidade: {str(e)}"
         )
@@ -1,31 +1,85 @@
-from fastapi import APIRouter, Depends
-from requests import Session
+import uuid
+from datetime import datetime
 
-from core.database import get_db
-from schemas.booking_schemas import BookingCreate
-from services.booking_service import get_booking_by_id
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database import get_db, get_read_db
+from schemas.booking_schemas import (
+    BookingCreate,
+    BookingRecurrenceCreate,
+    BookingResponse,
+)
+from services.booking_service import (
+    create_booking_service,
+    create_recurring_bookings_service,
+    delete_booking_by_id,
+    get_booking_by_id,
+    get_bookings_by_user_service,
+    is_booking_overlap,
+    update_booking_service,
+)
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, cursor_values, paginate
+from utils.security import AuthPrincipal, get_current_user
 
 booking_router = APIRouter(prefix="/bookings", tags=["bookings"])
 
 
 @booking_router.post("/create", status_code=201)
 async def create_booking(
-    booking_create: BookingCreate, session: Session = Depends(get_db)
+    booking_create: BookingCreate, session: AsyncSession = Depends(get_db)
 ):
     try:
-        new_booking_id = create_booking_service(session, booking_create)
+        new_booking_id = await create_booking_service(session, booking_create)
         return {"message": "Reserva criada com sucesso.", "id": new_booking_id}
     except ValueError as e:
         raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         raise HTTPException(status_code=400, detail=f"Erro ao criar reserva: {str(e)}")
 
 
-@booking_router.get("/{booking_id}")
-async def get_booking(booking_id: int, session: Session = Depends(get_db)):
+@booking_router.post("/recurring", status_code=201)
+async def create_recurring_bookings(
+    recurrence: BookingRecurrenceCreate, session: AsyncSession = Depends(get_db)
+):
+    # Série semanal em uma requisição; conflitos são pulados ou cancelam tudo
+    try:
+        return await create_recurring_bookings_service(session, recurrence)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        await session.rollback()
+        raise HTTPException(
+            status_code=400, detail=f"Erro ao criar reservas recorrentes: {str(e)}"
+        )
+
+
+@booking_router.get("/user/{user_id}", response_model=list[BookingResponse])
+async def get_user_bookings(
+    user_id: uuid.UUID,
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    session: AsyncSession = Depends(get_read_db),
+    current_user: AuthPrincipal = Depends(get_current_user),
+):
+    # Reservas do usuário, mais recentes primeiro; só ele mesmo ou um admin
+    if current_user.id != user_id and not current_user.is_admin:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+    after = cursor_values(cursor, (datetime, int))
+    bookings = await get_bookings_by_user_service(session, user_id, limit, after)
+    return paginate(
+        request, response, bookings, limit, lambda b: (b.start_time, b.id)
+    )
+
+
+@booking_router.get("/{booking_id}", response_model=BookingResponse)
+async def get_booking(booking_id: int, session: AsyncSession = Depends(get_read_db)):
     # Busca a reserva pelo ID
-    booking = get_booking_by_id(session, booking_id)
+    booking = await get_booking_by_id(session, booking_id)
 
     # Se não existir, retorna erro 404
     if not booking:
@@ -39,38 +93,35 @@ async def get_booking(booking_id: int, session: Session = Depends(get_db)):
 async def update_booking(
     booking_id: int,
     booking_update: BookingCreate,
-    session: Session = Depends(get_db),
+    session: AsyncSession = Depends(get_db),
 ):
     try:
-        # Tenta buscar a reserva existente
-        existing_booking = get_booking_by_id(session, booking_id)
-        if not existing_booking:
-            raise HTTPException(status_code=404, detail="Reserva não encontrada.")
-
-        # Atualiza os campos da reserva existente
-        for key, value in booking_update.dict(exclude_unset=True).items():
-            setattr(existing_booking, key, value)
-
-        session.commit()
-        session.refresh(existing_booking)
+        await update_booking_service(session, booking_id, booking_update)
         return {"message": "Reserva atualizada com sucesso."}
-    except HTTPException:
-        raise
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except IntegrityError as e:
+        await session.rollback()
+        if is_booking_overlap(e):
+            raise HTTPException(
+                status_code=409, detail="Já existe uma reserva para esse campo e horário."
+            )
+        raise HTTPException(status_code=400, detail=f"Erro ao atualizar reserva: {str(e)}")
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         raise HTTPException(status_code=400, detail=f"Erro ao atualizar reserva: {str(e)}")
 
 
 @booking_router.delete("/{booking_id}")
-async def delete_booking(booking_id: int, session: Session = Depends(get_db)):
+async def delete_booking(booking_id: int, session: AsyncSession = Depends(get_db)):
     try:
         # Chama o método que tenta deletar a reserva
-        delete_booking_by_id(session, booking_id)
+        await delete_booking_by_id(session, booking_id)
         return {"message": "Reserva deletada com sucesso."}
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         raise HTTPException(
             status_code=400, detail=f"Erro ao deletar reserva: {str(e)}"
         )
@@ -1,77 +1,202 @@
-from fastapi import APIRouter, HTTPException
-from schemas.field_schemas import FieldCreate, FieldUpdate
-from sqlalchemy.orm import Session
-from core.database import get_db
+from datetime import datetime, timedelta
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+
+from core.config import settings
+from models.models import Field
+from schemas.bulk_schemas import BulkDelete
+from schemas.field_schemas import (
+    FieldBulkCreate,
+    FieldBulkUpdate,
+    FieldCreate,
+    FieldResponse,
+    FieldUpdate,
+    FieldUpdateResponse,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.database import get_db, get_read_db
 from fastapi import Depends
 from services.field_service import (
     create_field_service,
+    create_fields_bulk_service,
     get_field_by_id,
     delete_field_by_id,
+    delete_fields_bulk_service,
+    update_field_service,
+    update_fields_bulk_service,
 )
+from services.occupancy_service import search_free_fields_service
+from services.slot_service import MAX_RANGE_DAYS, get_free_slots_service
+from utils.bulk import bulk_response
+from utils.etag import EntityETag
 
 field_router = APIRouter(prefix="/field", tags=["field"])
+field_etag = EntityETag(Field, FieldResponse, settings.FIELD_CACHE_CONTROL)
 
 
 @field_router.post("/create", status_code=201)
 async def create_field(
     field_create: FieldCreate,
-    session: Session = Depends(get_db),
+    session: AsyncSession = Depends(get_db),
 ):
     try:
-        new_id = create_field_service(session, field_create)
+        new_id = await create_field_service(session, field_create)
         return {"message": "Campo criado com sucesso.", "id": new_id}
     except ValueError as e:
         raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         raise HTTPException(status_code=400, detail=f"Erro ao criar campo: {str(e)}")
 
 
-@field_router.get("/{field_id}")
-async def get_field(field_id: int, session: Session = Depends(get_db)):
+@field_router.post("/bulk/create")
+async def create_fields_bulk(
+    bulk: FieldBulkCreate, session: AsyncSession = Depends(get_db)
+):
+    # Vários itens em uma transação; resultado por item
+    try:
+        summary = await create_fields_bulk_service(session, bulk)
+    except Exception as e:
+        await session.rollback()
+        raise HTTPException(
+            status_code=400, detail=f"Erro ao criar campos: {str(e)}"
+        )
+    return bulk_response(summary, bulk.atomic)
+
+
+@field_router.post("/bulk/update")
+async def update_fields_bulk(
+    bulk: FieldBulkUpdate, session: AsyncSession = Depends(get_db)
+):
+    try:
+        summary = await update_fields_bulk_service(session, bulk)
+    except Exception as e:
+        await session.rollback()
+        raise HTTPException(
+            status_code=400, detail=f"Erro ao atualizar campos: {str(e)}"
+        )
+    return bulk_response(summary, bulk.atomic)
+
+
+@field_router.post("/bulk/delete")
+async def delete_fields_bulk(
+    bulk: BulkDelete, session: AsyncSession = Depends(get_db)
+):
+    try:
+        summary = await delete_fields_bulk_service(session, bulk)
+    except Exception as e:
+        await session.rollback()
+        raise HTTPException(
+            status_code=400, detail=f"Erro ao deletar campos: {str(e)}"
+        )
+    return bulk_response(summary, bulk.atomic)
+
+
+@field_router.get("/free")
+async def search_free_fields(
+    start: datetime,
+    duration: int = Query(60, ge=15, le=24 * 60, description="minutos"),
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(5.0, gt=0, le=100),
+    field_type: str | None = None,
+    limit: int = Query(50, ge=1, le=200),
+    session: AsyncSession = Depends(get_read_db),
+):
+    # Campos livres em [start, start + duration) perto de (lat, lon)
+    start = start.replace(tzinfo=None)
+    return await search_free_fields_service(
+        session,
+        lat,
+        lon,
+        radius_km,
+        start,
+        start + timedelta(minutes=duration),
+        field_type=field_type,
+        limit=limit,
+    )
+
+
+@field_router.get(
+    "/{field_id}",
+    response_model=FieldResponse,
+    responses={304: {"description": "Não modificado (If-None-Match)"}},
+)
+async def get_field(
+    field_id: int,
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_read_db),
+):
+    # If-None-Match com a versão atual: 304 sem carregar a linha
+    not_modified = await field_etag.not_modified(request, session, field_id)
+    if not_modified:
+        return not_modified
+
     # Busca o campo pelo ID
-    field = get_field_by_id(session, field_id)
+    field = await get_field_by_id(session, field_id)
 
     # Se não existir, retorna erro 404
     if not field:
         raise HTTPException(status_code=404, detail="Campo não encontrado.")
 
     # Retorna os dados do campo
+    field_etag.tag(response, field)
     return field
 
 
-@field_router.patch("/{field_id}")
-async def update_field(
-    field_id: int, field_update: FieldUpdate, session: Session = Depends(get_db)
+@field_router.get("/{field_id}/slots")
+async def get_field_free_slots(
+    field_id: int,
+    range_start: datetime = Query(..., alias="from"),
+    range_end: datetime = Query(..., alias="to"),
+    duration: int = Query(60, ge=1, le=24 * 60, description="minutos"),
+    session: AsyncSession = Depends(get_read_db),
 ):
-    try:
-        # Busca o campo pelo ID
-        field = get_field_by_id(session, field_id)
-        if not field:
-            raise HTTPException(status_code=404, detail="Campo não encontrado.")
+    # Intervalos livres do campo com pelo menos `duration` minutos.
+    # Horários no banco são locais, sem fuso: um offset recebido é ignorado.
+    range_start = range_start.replace(tzinfo=None)
+    range_end = range_end.replace(tzinfo=None)
+    if range_end <= range_start:
+        raise HTTPException(status_code=422, detail="'to' deve ser depois de 'from'.")
+    if range_end - range_start > timedelta(days=MAX_RANGE_DAYS):
+        raise HTTPException(
+            status_code=422, detail=f"Intervalo máximo de {MAX_RANGE_DAYS} dias."
+        )
+    if not await get_field_by_id(session, field_id):
+        raise HTTPException(status_code=404, detail="Campo não encontrado.")
+
+    slots = await get_free_slots_service(
+        session, [field_id], range_start, range_end, timedelta(minutes=duration)
+    )
+    return [{"start": start, "end": end} for start, end in slots[field_id]]
 
-        # Atualiza os campos fornecidos
-        for key, value in field_update.dict(exclude_unset=True).items():
-            setattr(field, key, value)
 
-        session.commit()
-        session.refresh(field)
+@field_router.patch("/{field_id}", response_model=FieldUpdateResponse)
+async def update_field(
+    field_id: int, field_update: FieldUpdate, session: AsyncSession = Depends(get_db)
+):
+    try:
+        # Um UPDATE ... RETURNING: sem SELECT antes nem refresh depois
+        field = await update_field_service(session, field_id, field_update)
         return {"message": "Campo atualizado com sucesso.", "field": field}
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         raise HTTPException(
             status_code=400, detail=f"Erro ao atualizar campo: {str(e)}"
         )
 
 
 @field_router.delete("/{field_id}")
-async def delete_field(field_id: int, session: Session = Depends(get_db)):
+async def delete_field(field_id: int, session: AsyncSession = Depends(get_db)):
     try:
         # Chama o método que tenta deletar o campo
-        delete_field_by_id(session, field_id)
+        await delete_field_by_id(session, field_id)
         return {"message": "Campo deletado com sucesso."}
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         raise HTTPException(status_code=400, detail=f"Erro ao deletar campo: {str(e)}")
@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends
+
+from core.database import async_engine, replica_router
+from core.entity_cache import entity_cache
+from core.pool_metrics import pool_status
+from services.occupancy_service import occupancy_index
+from utils.security import auth_user_cache, get_current_admin, jwt_cache
+
+# Endpoints operacionais (fora do Swagger), restritos a administradores
+internal_router = APIRouter(
+    prefix="/internal",
+    tags=["internal"],
+    include_in_schema=False,
+    dependencies=[Depends(get_current_admin)],
+)
+
+
+@internal_router.get("/db/pool")
+async def get_pool_metrics():
+    # Conexões em uso, overflow, histograma de espera e timeouts de checkout
+    return {
+        "primary": pool_status(async_engine.pool),
+        "replicas": replica_router.status(),
+    }
+
+
+@internal_router.get("/cache")
+async def get_cache_metrics():
+    # Tamanho e hit/miss dos caches deste processo
+    return {
+        "auth_users": auth_user_cache.stats(),
+        "entities": entity_cache.stats(),
+        "jwt": jwt_cache.stats(),
+        "occupancy": occupancy_index.stats(),
+    }
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
-from schemas.review_schemas import ReviewCreate
-from core.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from schemas.review_schemas import ReviewCreate, ReviewResponse
+from core.database import get_db, get_read_db
 from services.review_service import (
     create_review_service,
     get_review_by_id,
@@ -14,23 +14,23 @@ review_router = APIRouter(prefix="/review", tags=["review"])
 @review_router.post("/create", status_code=201)
 async def create_review(
     review_create: ReviewCreate,
-    session: Session = Depends(get_db),
+    session: AsyncSession = Depends(get_db),
 ):
     try:
-        new_id = create_review_service(session, review_create)
+        new_id = await create_review_service(session, review_create)
         return {"message": "Review criada com sucesso.", "id": new_id}
     except ValueError as e:
         raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         raise HTTPException(status_code=400, detail=f"Erro ao criar review: {str(e)}")
 
 
-@review_router.get("/{review_id}")
-async def get_review(review_id: int, session: Session = Depends(get_db)):
+@review_router.get("/{review_id}", response_model=ReviewResponse)
+async def get_review(review_id: int, session: AsyncSession = Depends(get_read_db)):
 
     # Busca a review pelo ID
-    review = get_review_by_id(session, review_id)
+    review = await get_review_by_id(session, review_id)
 
     # Se não existir, retorna erro 404
     if not review:
@@ -41,13 +41,13 @@ async def get_review(review_id: int, session: Session = Depends(get_db)):
 
 
 @review_router.delete("/{review_id}")
-async def delete_review(review_id: int, session: Session = Depends(get_db)):
+async def delete_review(review_id: int, session: AsyncSession = Depends(get_db)):
     try:
         # Chama o método que tenta deletar a review
-        delete_review_by_id(session, review_id)
+        await delete_review_by_id(session, review_id)
         return {"message": "Review deletada com sucesso."}
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         raise HTTPException(status_code=400, detail=f"Erro ao deletar review: {str(e)}")
\ No newline at end of file
@@ -1,13 +1,27 @@
-from fastapi import APIRouter, HTTPException
-from models.models import User
+import uuid
+from datetime import datetime
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from core.config import settings
+from models.models import SportsCenter, User
+from schemas.field_schemas import FieldResponse
+from schemas.review_schemas import ReviewResponse
 from schemas.sports_center_schemas import (
+    NearbySportsCenterResponse,
     SportsCenterCreate,
     SportsCenterResponse,
     SportsCenterUpdate,
 )
-from sqlalchemy.orm import Session
-from core.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.database import get_db, get_read_db
 from fastapi import Depends
+from services.gazetteer_service import Gazetteer
+from services.geocoding_service import (
+    Geocoder,
+    GeocodingError,
+    get_gazetteer,
+    get_geocoder,
+)
 from services.sports_center_service import (
     create_sports_center_service,
     get_all_sports_centers_by_user_id_service,
@@ -15,117 +29,238 @@ from services.sports_center_service import (
     delete_sports_center_by_id,
     update_sports_center_service,
     get_sports_center_by_city_service,
+    get_nearby_sports_centers_service,
 )
-import requests
+from services.field_service import get_fields_by_sports_center_service
+from services.review_service import get_reviews_by_sports_center_service
+from utils.etag import EntityETag
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, cursor_values, paginate
 
 sports_center_router = APIRouter(prefix="/sports_center", tags=["sports_center"])
+sports_center_etag = EntityETag(
+    SportsCenter, SportsCenterResponse, settings.SPORTS_CENTER_CACHE_CONTROL
+)
 
 
 @sports_center_router.post("/create", status_code=201)
 async def create_sports_center(
     sports_center_create: SportsCenterCreate,
-    session: Session = Depends(get_db),
+    session: AsyncSession = Depends(get_db),
     # current_user: User = Depends(get_current_user),
 ):
     try:
-        new_id = create_sports_center_service(session, sports_center_create)
+        new_id = await create_sports_center_service(session, sports_center_create)
         return {"message": "Centro esportivo criado com sucesso.", "id": new_id}
     except ValueError as e:
         raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         raise HTTPException(
             status_code=400, detail=f"Erro ao criar centro esportivo: {str(e)}"
         )
 
 
-@sports_center_router.get("/{sports_center_id}")
+@sports_center_router.get(
+    "/nearby", response_model=list[NearbySportsCenterResponse]
+)
+async def get_nearby_sports_centers(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(5.0, gt=0, le=100),
+    limit: int = Query(20, ge=1, le=100),
+    session: AsyncSession = Depends(get_read_db),
+):
+    # Centros ordenados pela distância até (lat, lon)
+    nearby = await get_nearby_sports_centers_service(
+        session, lat, lon, radius_km, limit
+    )
+    return [
+        {"sports_center": center, "distance_km": round(distance, 3)}
+        for center, distance in nearby
+    ]
+
+
+@sports_center_router.get(
+    "/{sports_center_id}",
+    response_model=SportsCenterResponse,
+    responses={304: {"description": "Não modificado (If-None-Match)"}},
+)
 async def get_sports_center(
     sports_center_id: int,
-    session: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_read_db),
     # current_user: User = Depends(get_current_user),
 ):
+    # If-None-Match com a versão atual: 304 sem carregar a linha
+    not_modified = await sports_center_etag.not_modified(request, session, sports_center_id)
+    if not_modified:
+        return not_modified
 
     # Busca o centro esportivo pelo ID
-    sports_center = get_sports_center_by_id_service(session, sports_center_id)
+    sports_center = await get_sports_center_by_id_service(session, sports_center_id)
 
     # Se não existir, retorna erro 404
     if not sports_center:
         raise HTTPException(status_code=404, detail="Centro esportivo não encontrado.")
 
     # Retorna os dados do centro esportivo
+    sports_center_etag.tag(response, sports_center)
     return sports_center
 
 
-@sports_center_router.get("/all/{user_id}")
+@sports_center_router.get(
+    "/all/{user_id}", response_model=list[SportsCenterResponse]
+)
 async def get_sports_centers_by_user_id(
-    owner_id: int,
-    session: Session = Depends(get_db),
+    user_id: uuid.UUID,
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    session: AsyncSession = Depends(get_read_db),
     # current_user: User = Depends(get_current_user),
 ):
-    # Busca todos os centros esportivos do dono
-    sports_centers = get_all_sports_centers_by_user_id_service(session, owner_id)
+    # Busca uma página dos centros esportivos do dono
+    after = cursor_values(cursor, (int,))
+    sports_centers = await get_all_sports_centers_by_user_id_service(
+        session, user_id, limit, after and after[0]
+    )
 
     # Se não existir nenhum, retorna erro 404
-    if not sports_centers:
+    if not sports_centers and cursor is None:
         raise HTTPException(
             status_code=404, detail="Nenhum centro esportivo encontrado para este dono."
         )
 
     # Retorna os dados dos centros esportivos
-    return sports_centers
+    return paginate(request, response, sports_centers, limit, lambda c: (c.id,))
 
 
-@sports_center_router.get("/city/{city_name}")
+@sports_center_router.get(
+    "/city/{city_name}", response_model=list[SportsCenterResponse]
+)
 async def get_sports_centers_by_city(
-    city_name: str, session: Session = Depends(get_db)
+    city_name: str,
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    session: AsyncSession = Depends(get_read_db),
+    geocoder: Geocoder = Depends(get_geocoder),
 ):
+    after = cursor_values(cursor, (int,))
     try:
-        url = "https://nominatim.openstreetmap.org/search"
-        params = {"city": city_name, "format": "json", "limit": 1}
-        response = requests.get(
-            url, params=params, headers={"User-Agent": "BolaMarcadaApp/1.0"}
-        )
-        data = response.json()
-
-        if not data:
+        bbox = await geocoder.geocode_city(city_name)
+        if not bbox:
             raise HTTPException(status_code=404, detail="Cidade não encontrada.")
 
-        bbox = data[0]["boundingbox"]
-        lat_min, lat_max = float(bbox[0]), float(bbox[1])
-        lon_min, lon_max = float(bbox[2]), float(bbox[3])
-
-        results = get_sports_center_by_city_service(
-            session, lat_min, lat_max, lon_min, lon_max
+        results = await get_sports_center_by_city_service(
+            session,
+            bbox.lat_min,
+            bbox.lat_max,
+            bbox.lon_min,
+            bbox.lon_max,
+            limit=limit,
+            after_id=after and after[0],
         )
 
-        if not results:
+        if not results and cursor is None:
             raise HTTPException(
                 status_code=404, detail="Nenhum centro encontrado nessa cidade."
             )
 
-        return results
+        return paginate(request, response, results, limit, lambda c: (c.id,))
 
+    except HTTPException:
+        raise
+    except GeocodingError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Serviço de geocodificação indisponível: {str(e)}",
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erro ao buscar centros: {str(e)}")
 
 
-@sports_center_router.patch("/update/{sports_center_id}")
+@sports_center_router.get("/cities/autocomplete")
+async def autocomplete_cities(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=50),
+    gazetteer: Gazetteer | None = Depends(get_gazetteer),
+):
+    # Sugestões de cidade pelo prefixo digitado (gazetteer offline, sem rede)
+    if gazetteer is None:
+        raise HTTPException(
+            status_code=503, detail="Base de cidades offline não configurada."
+        )
+    return [
+        {"name": c.name, "state": c.state, "label": c.label, "lat": c.lat, "lon": c.lon}
+        for c in gazetteer.autocomplete(q, limit)
+    ]
+
+
+@sports_center_router.get(
+    "/{sports_center_id}/fields", response_model=list[FieldResponse]
+)
+async def get_sports_center_fields(
+    sports_center_id: int,
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    session: AsyncSession = Depends(get_read_db),
+):
+    # Campos do centro em ordem de id
+    after = cursor_values(cursor, (int,))
+    fields = await get_fields_by_sports_center_service(
+        session, sports_center_id, limit, after and after[0]
+    )
+    return paginate(request, response, fields, limit, lambda f: (f.id,))
+
+
+@sports_center_router.get(
+    "/{sports_center_id}/reviews", response_model=list[ReviewResponse]
+)
+async def get_sports_center_reviews(
+    sports_center_id: int,
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    rating: list[int] | None = Query(None, description="filtra pelas notas (1 a 5)"),
+    session: AsyncSession = Depends(get_read_db),
+):
+    # Reviews do centro, mais novas primeiro
+    if rating and any(not 1 <= r <= 5 for r in rating):
+        raise HTTPException(status_code=422, detail="rating deve estar entre 1 e 5.")
+    after = cursor_values(cursor, (datetime, int))
+    reviews = await get_reviews_by_sports_center_service(
+        session, sports_center_id, limit, after, rating
+    )
+    return paginate(
+        request, response, reviews, limit, lambda r: (r.created_at, r.id)
+    )
+
+
+@sports_center_router.patch(
+    "/update/{sports_center_id}", response_model=SportsCenterResponse
+)
 async def update_sports_center(
     sports_center_id: int,
     sports_center_update: SportsCenterUpdate,
-    session: Session = Depends(get_db),
+    session: AsyncSession = Depends(get_db),
     # current_user: User = Depends(get_current_user),
 ):
     try:
-        updated = update_sports_center_service(
+        updated = await update_sports_center_service(
             session, sports_center_id, sports_center_update
         )
         return updated
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         raise HTTPException(
             status_code=400, detail=f"Erro ao atualizar centro esportivo: {str(e)}"
         )
@@ -134,17 +269,17 @@ async def update_sports_center(
 @sports_center_router.delete("/{sports_center_id}")
 async def delete_sports_center(
     sports_center_id: int,
-    session: Session = Depends(get_db),
+    session: AsyncSession = Depends(get_db),
     # current_user: User = Depends(get_current_user),
 ):
     try:
         # Chama o método que tenta deletar o centro esportivo
-        delete_sports_center_by_id(session, sports_center_id)
+        await delete_sports_center_by_id(session, sports_center_id)
         return {"message": "Centro esportivo deletado com sucesso."}
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         raise HTTPException(
             status_code=400, detail=f"Erro ao deletar centro esportivo: {str(e)}"
         )
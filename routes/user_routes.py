@@ -1,8 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Response
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.security import OAuth2PasswordRequestForm
 from core.database import get_db
-from models.models import User
 from schemas.user_schemas import (
     UserSignIn,
     UserSignUp,
@@ -18,7 +17,7 @@ from services.user_service import (
     deactivate_user_me,
     hard_delete_user_me,
 )
-from utils.security import create_access_token, get_current_user
+from utils.security import AuthPrincipal, create_access_token, get_current_user
 
 user_router = APIRouter(prefix="/users", tags=["users"])
 
@@ -26,16 +25,16 @@ user_router = APIRouter(prefix="/users", tags=["users"])
 @user_router.post(
     "/signup", response_model=UserResponse, status_code=status.HTTP_201_CREATED
 )
-def signup(user_in: UserSignUp, db: Session = Depends(get_db)):
-    user = create_user(db, user_in)
+async def signup(user_in: UserSignUp, db: AsyncSession = Depends(get_db)):
+    user = await create_user(db, user_in)
     return user
 
 
 @user_router.post(
     "/signin", response_model=UserResponseToken, status_code=status.HTTP_200_OK
 )
-def signin(user_in: UserSignIn, db: Session = Depends(get_db)):
-    user = authenticate(db, user_in.email, user_in.password)
+async def signin(user_in: UserSignIn, db: AsyncSession = Depends(get_db)):
+    user = await authenticate(db, user_in.email, user_in.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -48,12 +47,12 @@ def signin(user_in: UserSignIn, db: Session = Depends(get_db)):
 @user_router.post(
     "/token", response_model=UserResponseToken, status_code=status.HTTP_200_OK
 )
-def login_token(
+async def login_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     # OAuth2 usa "username" para o login; mapeamos para seu "email"
-    user = authenticate(db, form_data.username, form_data.password)
+    user = await authenticate(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -64,25 +63,25 @@ def login_token(
 
 
 @user_router.patch("/me", response_model=UserPublic, status_code=status.HTTP_200_OK)
-def update_me(
+async def update_me(
     payload: UserUpdateMe,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthPrincipal = Depends(get_current_user),
 ):
     """
     Atualiza os dados do usuário autenticado.
     Campos atualizáveis: name (obrigatório), email, phone, avatar.
     Trata e-mail duplicado via IntegrityError.
     """
-    updated = update_user_me(db, current_user, payload)
+    updated = await update_user_me(db, current_user, payload)
     return updated
 
 
 @user_router.delete("/me", status_code=status.HTTP_204_NO_CONTENT)
-def delete_me(
+async def delete_me(
     soft: bool = True,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthPrincipal = Depends(get_current_user),
 ):
     """
     Deleta a conta do usuário autenticado.
@@ -90,7 +89,7 @@ def delete_me(
     - soft=False: tenta hard delete (pode falhar por FKs).
     """
     if soft:
-        deactivate_user_me(db, current_user)
+        await deactivate_user_me(db, current_user)
     else:
-        hard_delete_user_me(db, current_user)
+        await hard_delete_user_me(db, current_user)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -1,5 +1,7 @@
-from pydantic import BaseModel, ConfigDict
-from datetime import datetime
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+from datetime import date, datetime, time
+
+from schemas.bulk_schemas import MAX_BULK_ITEMS
 
 
 class AvailabilityCreate(BaseModel):
@@ -9,7 +11,18 @@ class AvailabilityCreate(BaseModel):
     end_time: datetime
 
     model_config = ConfigDict(from_attributes=True)
-    
+
+
+class AvailabilityResponse(BaseModel):
+    id: int
+    field_id: int
+    day_of_week: int  # 0 = domingo
+    start_time: datetime
+    end_time: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class AvailabilityUpdate(BaseModel):
     field_id: int | None = None
     day_of_week: int | None = None
@@ -17,3 +30,42 @@ class AvailabilityUpdate(BaseModel):
     end_time: datetime | None = None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class AvailabilityBulkCreate(BaseModel):
+    items: list[AvailabilityCreate] = Field(
+        ..., min_length=1, max_length=MAX_BULK_ITEMS
+    )
+    atomic: bool = False
+
+
+class AvailabilityBulkUpdateItem(AvailabilityUpdate):
+    id: int
+
+
+class AvailabilityBulkUpdate(BaseModel):
+    items: list[AvailabilityBulkUpdateItem] = Field(
+        ..., min_length=1, max_length=MAX_BULK_ITEMS
+    )
+    atomic: bool = False
+
+
+class WeeklyWindow(BaseModel):
+    day_of_week: int = Field(..., ge=0, le=6, description="0 = domingo")
+    start: time
+    end: time  # fim <= início: atravessa a meia-noite
+
+
+class AvailabilityWeeklyCreate(BaseModel):
+    # Informe os campos ou um centro (todos os campos dele)
+    field_ids: list[int] | None = Field(None, min_length=1, max_length=1000)
+    sports_center_id: int | None = None
+    windows: list[WeeklyWindow] = Field(..., min_length=1, max_length=7 * 24)
+    # Data da primeira ocorrência gravada em start_time/end_time (padrão: hoje)
+    starts_on: date | None = None
+
+    @model_validator(mode="after")
+    def check_target(self):
+        if (self.field_ids is None) == (self.sports_center_id is None):
+            raise ValueError("Informe field_ids ou sports_center_id (apenas um)")
+        return self
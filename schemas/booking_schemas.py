@@ -1,12 +1,72 @@
-from datetime import datetime
-from pydantic import BaseModel, ConfigDict
+import uuid
+from datetime import date, datetime, time, timedelta
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+from utils.recurrence import MAX_RECURRENCE_DAYS, expand_weekly, first_overlap
 
 
 class BookingCreate(BaseModel):
-    user_id: int
+    user_id: uuid.UUID
     field_id: int
-    booking_date: datetime
     start_time: datetime
     end_time: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+    @model_validator(mode="after")
+    def check_interval(self):
+        # Colunas são sem fuso (horário local do centro): descarta o offset
+        self.start_time = self.start_time.replace(tzinfo=None)
+        self.end_time = self.end_time.replace(tzinfo=None)
+        if self.end_time <= self.start_time:
+            raise ValueError("end_time deve ser depois de start_time")
+        return self
+
+
+class BookingResponse(BaseModel):
+    id: int
+    user_id: uuid.UUID
+    field_id: int
+    day_of_week: int  # 0 = domingo
+    start_time: datetime
+    end_time: datetime
+    status: str | None = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class BookingRecurrenceCreate(BaseModel):
+    user_id: uuid.UUID
+    field_id: int
+    days_of_week: list[int] = Field(..., min_length=1, max_length=7)  # 0 = domingo
+    start: time
+    end: time  # fim <= início: atravessa a meia-noite
+    starts_on: date
+    ends_on: date
+    except_dates: list[date] = Field(default_factory=list)
+    # False: qualquer conflito cancela a série inteira (409)
+    skip_conflicts: bool = True
+
+    @model_validator(mode="after")
+    def check_rule(self):
+        if any(not 0 <= d <= 6 for d in self.days_of_week):
+            raise ValueError("days_of_week deve estar entre 0 (domingo) e 6")
+        if self.ends_on < self.starts_on:
+            raise ValueError("ends_on deve ser depois de starts_on")
+        if self.ends_on - self.starts_on > timedelta(days=MAX_RECURRENCE_DAYS):
+            raise ValueError(f"Intervalo máximo de {MAX_RECURRENCE_DAYS} dias")
+        if self.start == self.end:
+            raise ValueError("start e end não podem ser iguais")
+        # Janelas que atravessam a meia-noite terminam no dia seguinte; a série
+        # não pode se sobrepor a si mesma (o INSERT falharia como se fosse
+        # uma corrida com outra reserva)
+        occurrences = expand_weekly(
+            self.days_of_week, self.start, self.end, self.starts_on, self.ends_on
+        )
+        overlap = first_overlap(occurrences)
+        if overlap is not None:
+            raise ValueError(
+                "Ocorrências da série se sobrepõem em "
+                f"{occurrences[overlap][0].isoformat()}"
+            )
+        return self
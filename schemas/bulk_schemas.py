@@ -0,0 +1,10 @@
+from pydantic import BaseModel, Field
+
+# Itens por requisição nos endpoints /bulk/*
+MAX_BULK_ITEMS = 500
+
+
+class BulkDelete(BaseModel):
+    ids: list[int] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+    # True: se algum item falhar, nada é gravado (409)
+    atomic: bool = False
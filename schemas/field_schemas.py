@@ -1,5 +1,7 @@
 from typing import Optional
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
+
+from schemas.bulk_schemas import MAX_BULK_ITEMS
 
 
 class FieldCreate(BaseModel):
@@ -13,6 +15,18 @@ class FieldCreate(BaseModel):
     model_config = ConfigDict(from_attributes=True)  # v2 (substitui class Config)
 
 
+class FieldResponse(BaseModel):
+    id: int
+    sports_center_id: int
+    name: str
+    field_type: str
+    price_per_hour: float
+    photo_path: Optional[str] = None
+    description: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class FieldUpdate(BaseModel):
     name: Optional[str] = None
     field_type: Optional[str] = None
@@ -21,3 +35,24 @@ class FieldUpdate(BaseModel):
     description: Optional[str] = None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class FieldUpdateResponse(BaseModel):
+    message: str
+    field: FieldResponse
+
+
+class FieldBulkCreate(BaseModel):
+    items: list[FieldCreate] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+    atomic: bool = False
+
+
+class FieldBulkUpdateItem(FieldUpdate):
+    id: int
+
+
+class FieldBulkUpdate(BaseModel):
+    items: list[FieldBulkUpdateItem] = Field(
+        ..., min_length=1, max_length=MAX_BULK_ITEMS
+    )
+    atomic: bool = False
@@ -1,3 +1,5 @@
+import uuid
+from datetime import datetime
 from typing import Optional
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -38,10 +40,11 @@ class ReviewCreate(ReviewBase):
 
 
 class ReviewResponse(BaseModel):
-    id: str
-    user_id: str          # mantido como str p/ ficar consistente com ReviewBase
+    id: int
+    user_id: uuid.UUID
     sports_center_id: int
     rating: int
     comment: Optional[str] = None
+    created_at: Optional[datetime] = None
 
     model_config = ConfigDict(from_attributes=True)
@@ -1,5 +1,6 @@
+import uuid
 from typing import Optional
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, model_validator
 
 class SportsCenterCreate(BaseModel):
     user_id: str
@@ -14,16 +15,31 @@ class SportsCenterCreate(BaseModel):
 
 class SportsCenterResponse(BaseModel):
     id: int
-    user_id: str
+    user_id: uuid.UUID
     name: str
     cnpj: str
     latitude: float
     longitude: float
     photo_path: Optional[str] = None
     description: Optional[str] = None
+    # Agregado das reviews (ver services/rating_service.py)
+    rating_count: int = 0
+    rating_sum: int = 0
+    rating_average: Optional[float] = None
+    stars_1: int = 0
+    stars_2: int = 0
+    stars_3: int = 0
+    stars_4: int = 0
+    stars_5: int = 0
 
     model_config = ConfigDict(from_attributes=True)
 
+
+class NearbySportsCenterResponse(BaseModel):
+    sports_center: SportsCenterResponse
+    distance_km: float
+
+
 class SportsCenterUpdate(BaseModel):
     name: Optional[str] = None
     cnpj: Optional[str] = None
@@ -33,3 +49,13 @@ class SportsCenterUpdate(BaseModel):
     description: Optional[str] = None
 
     model_config = ConfigDict(from_attributes=True)
+
+    @model_validator(mode="after")
+    def check_coordinates(self):
+        # O geohash depende das duas: sem a outra, o UPDATE teria que lê-la antes
+        fields = self.model_fields_set
+        if ("latitude" in fields) != ("longitude" in fields):
+            raise ValueError("Informe latitude e longitude juntas")
+        if "latitude" in fields and (self.latitude is None or self.longitude is None):
+            raise ValueError("latitude e longitude não podem ser nulas")
+        return self
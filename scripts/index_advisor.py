@@ -0,0 +1,386 @@
+"""
+Advisor de índices: executa as consultas dos serviços contra um banco com
+dados sintéticos e passa cada SELECT/UPDATE/DELETE pelo EXPLAIN, apontando
+as que leem uma tabela inteira. Também lista FKs sem índice (o DELETE do
+lado referenciado varre a tabela filha).
+
+    python -m scripts.index_advisor                   # SQLite temporário
+    python -m scripts.index_advisor --url postgresql+asyncpg://u:s@host/scratch
+
+Com --url, popula o banco se estiver vazio e escreve nele: use um banco
+descartável migrado com `alembic upgrade head`. No PostgreSQL roda com
+enable_seqscan=off, então "Seq Scan" só aparece quando não há índice que
+sirva. Sai com código 1 se encontrar algum problema.
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import tempfile
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+
+for _var in ("POSTGRES_SERVER", "POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_DB"):
+    os.environ.setdefault(_var, "advisor")
+os.environ.setdefault("SECRET_KEY", "advisor")
+
+from sqlalchemy import event, func, insert, inspect, select, text  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402
+
+from core.database import Base  # noqa: E402
+from models import Availability, Booking, Field, Review, SportsCenter, User  # noqa: E402
+from schemas.availability_schemas import (  # noqa: E402
+    AvailabilityBulkCreate,
+    AvailabilityCreate,
+)
+from schemas.booking_schemas import BookingRecurrenceCreate  # noqa: E402
+from schemas.field_schemas import FieldBulkCreate, FieldCreate  # noqa: E402
+from schemas.sports_center_schemas import SportsCenterCreate  # noqa: E402
+from services.availability_service import (  # noqa: E402
+    create_availabilities_bulk_service,
+    create_availability_service,
+)
+from services.booking_service import (  # noqa: E402
+    create_recurring_bookings_service,
+    get_bookings_by_user_service,
+)
+from services.field_service import (  # noqa: E402
+    create_field_service,
+    create_fields_bulk_service,
+    get_fields_by_sports_center_service,
+)
+from services.occupancy_service import OccupancyIndex  # noqa: E402
+from services.rating_service import recompute_ratings  # noqa: E402
+from services.review_service import get_reviews_by_sports_center_service  # noqa: E402
+from services.slot_service import get_free_slots_service  # noqa: E402
+from services.sports_center_service import (  # noqa: E402
+    create_sports_center_service,
+    get_all_sports_centers_by_user_id_service,
+    get_nearby_sports_centers_service,
+    get_sports_center_by_city_service,
+)
+from utils.geo import geohash_encode  # noqa: E402
+
+# Segunda-feira de referência para disponibilidades e reservas sintéticas
+MONDAY = datetime(2030, 1, 7)
+_EXPLAINED = re.compile(r"^\s*(SELECT|UPDATE|DELETE|WITH)\b", re.IGNORECASE)
+
+
+# Dados sintéticos
+
+async def _seed(conn, centers: int) -> None:
+    users = max(1, centers // 10)
+    # Primeiro dígito "a": hex só com números viraria inteiro no SQLite
+    user_ids = [uuid.UUID(int=(0xA << 124) | i) for i in range(users)]
+    await conn.execute(
+        insert(User.__table__),
+        [
+            {
+                "id": user_id,
+                "name": f"Usuário {i}",
+                "email": f"user{i}@example.com",
+                "hashed_password": "x",
+                "cpf": f"{i:011d}",
+                "active": True,
+                "admin": False,
+                "avatar": "default_avatar.png",
+                "created_at": MONDAY,
+            }
+            for i, user_id in enumerate(user_ids)
+        ],
+    )
+    # Centros espalhados numa grade de ~0,5° em torno de São Paulo
+    await conn.execute(
+        insert(SportsCenter.__table__),
+        [
+            dict(
+                _center_row(i, user_ids[i % users]),
+                rating_count=0, rating_sum=0,
+                stars_1=0, stars_2=0, stars_3=0, stars_4=0, stars_5=0,
+            )
+            for i in range(centers)
+        ],
+    )
+    center_ids = (await conn.execute(select(SportsCenter.id))).scalars().all()
+    await conn.execute(
+        insert(Field.__table__),
+        [
+            {
+                "sports_center_id": center_id,
+                "name": f"Quadra {k}",
+                "type": ("futsal", "society", "areia", "tenis")[k],
+                "price_per_hour": 100 + 10 * k,
+            }
+            for center_id in center_ids
+            for k in range(4)
+        ],
+    )
+    field_ids = (await conn.execute(select(Field.id))).scalars().all()
+    await conn.execute(
+        insert(Availability.__table__),
+        [
+            {
+                "field_id": field_id,
+                "day_of_week": (dow + 1) % 7,
+                "start_time": MONDAY + timedelta(days=dow, hours=8),
+                "end_time": MONDAY + timedelta(days=dow, hours=22),
+            }
+            for field_id in field_ids
+            for dow in range(7)
+        ],
+    )
+    await conn.execute(
+        insert(Booking.__table__),
+        [
+            {
+                "user_id": user_ids[(field_id + k) % users],
+                "field_id": field_id,
+                "day_of_week": (k + 1) % 7,
+                "start_time": MONDAY + timedelta(days=k, hours=19),
+                "end_time": MONDAY + timedelta(days=k, hours=20),
+                "status": "confirmed",
+            }
+            for field_id in field_ids
+            for k in range(3)
+        ],
+    )
+    await conn.execute(
+        insert(Review.__table__),
+        [
+            {
+                "sports_center_id": center_id,
+                "user_id": user_ids[(center_id + k) % users],
+                "rating": 1 + (center_id + k) % 5,
+                "comment": f"review {k}",
+                # Explícito: o server_default now() das migrations é do PostgreSQL
+                "created_at": MONDAY - timedelta(days=center_id % 300, minutes=k),
+            }
+            for center_id in center_ids
+            for k in range(5)
+        ],
+    )
+
+
+def _center_row(i: int, user_id: uuid.UUID) -> dict:
+    lat = -23.8 + (i % 100) * 0.005
+    lon = -46.9 + (i // 100 % 100) * 0.005
+    return {
+        "user_id": user_id,
+        "name": f"Centro {i}",
+        "cnpj": f"{i:014d}",
+        "latitude": lat,
+        "longitude": lon,
+        "geohash": geohash_encode(lat, lon),
+    }
+
+
+@dataclass
+class _Sample:
+    """Ids reais usados como parâmetros das consultas."""
+
+    user_id: uuid.UUID
+    center_id: int
+    cnpj: str
+    latitude: float
+    longitude: float
+    field_id: int
+    field_name: str
+    availability: Availability
+
+
+async def _sample(session: AsyncSession) -> _Sample:
+    field = (await session.execute(select(Field).order_by(Field.id).limit(1))).scalar_one()
+    center = await session.get(SportsCenter, field.sports_center_id)
+    availability = (
+        await session.execute(
+            select(Availability).where(Availability.field_id == field.id).limit(1)
+        )
+    ).scalar_one()
+    return _Sample(
+        user_id=center.user_id,
+        center_id=center.id,
+        cnpj=center.cnpj,
+        latitude=float(center.latitude),
+        longitude=float(center.longitude),
+        field_id=field.id,
+        field_name=field.name,
+        availability=availability,
+    )
+
+
+# Consultas dos serviços (as de escrita falham na validação ou são idempotentes)
+
+def _scenarios(s: _Sample) -> list[tuple[str, object]]:
+    duplicate_field = FieldCreate(
+        sports_center_id=s.center_id, name=s.field_name, field_type="futsal",
+        price_per_hour=100,
+    )
+    duplicate_availability = AvailabilityCreate(
+        field_id=s.field_id,
+        day_of_week=s.availability.day_of_week,
+        start_time=s.availability.start_time,
+        end_time=s.availability.end_time,
+    )
+    week = (MONDAY, MONDAY + timedelta(days=7))
+    return [
+        ("centro: CNPJ repetido", lambda db: create_sports_center_service(
+            db, SportsCenterCreate(
+                user_id=str(s.user_id), name="x", cnpj=s.cnpj,
+                latitude=s.latitude, longitude=s.longitude,
+            ))),
+        ("centros do dono", lambda db: get_all_sports_centers_by_user_id_service(
+            db, s.user_id, limit=50)),
+        ("centros por cidade", lambda db: get_sports_center_by_city_service(
+            db, s.latitude - 0.05, s.latitude + 0.05,
+            s.longitude - 0.05, s.longitude + 0.05, limit=50)),
+        ("centros por raio", lambda db: get_nearby_sports_centers_service(
+            db, s.latitude, s.longitude, 5, 50)),
+        ("campos do centro", lambda db: get_fields_by_sports_center_service(
+            db, s.center_id, limit=50)),
+        ("campo: nome repetido", lambda db: create_field_service(db, duplicate_field)),
+        ("campos em lote: nome repetido", lambda db: create_fields_bulk_service(
+            db, FieldBulkCreate(items=[duplicate_field], atomic=True))),
+        ("disponibilidade repetida", lambda db: create_availability_service(
+            db, duplicate_availability)),
+        ("disponibilidades em lote", lambda db: create_availabilities_bulk_service(
+            db, AvailabilityBulkCreate(items=[duplicate_availability], atomic=True))),
+        ("horários livres", lambda db: get_free_slots_service(
+            db, [s.field_id], *week, timedelta(hours=1))),
+        ("ocupação (bitmap)", lambda db: OccupancyIndex().free_fields(
+            db, [s.field_id], MONDAY + timedelta(hours=19), MONDAY + timedelta(hours=20))),
+        ("reserva recorrente: conflito", lambda db: create_recurring_bookings_service(
+            db, BookingRecurrenceCreate(
+                user_id=s.user_id, field_id=s.field_id, days_of_week=[1],
+                start=time(19), end=time(20), starts_on=MONDAY.date(),
+                ends_on=MONDAY.date() + timedelta(days=28), skip_conflicts=False,
+            ))),
+        ("reservas do usuário", lambda db: get_bookings_by_user_service(
+            db, s.user_id, limit=50)),
+        ("reviews do centro", lambda db: get_reviews_by_sports_center_service(
+            db, s.center_id, limit=50)),
+        ("reviews do centro por nota", lambda db: get_reviews_by_sports_center_service(
+            db, s.center_id, limit=50, ratings=[1, 2])),
+        ("recálculo de ratings", lambda db: recompute_ratings(db, batch_size=500)),
+    ]
+
+
+class _Recorder:
+    """Guarda (cenário, statement, parâmetros) de cada query executada."""
+
+    def __init__(self):
+        self.scenario: str | None = None
+        self.statements: dict[str, tuple[str, object]] = {}
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        if self.scenario is None or not _EXPLAINED.match(statement):
+            return
+        if executemany:
+            parameters = parameters[0]
+        self.statements.setdefault(statement, (self.scenario, parameters))
+
+
+# EXPLAIN
+
+def _sqlite_scans(rows, tables) -> list[str]:
+    # Linhas de EXPLAIN QUERY PLAN: (id, parent, notused, detail)
+    scans = []
+    for *_, detail in rows:
+        match = re.match(r"SCAN (\w+)", detail)
+        if match and match.group(1) in tables and "USING" not in detail:
+            scans.append(match.group(1))
+    return scans
+
+
+def _postgres_scans(plan) -> list[str]:
+    scans = []
+    if plan.get("Node Type") == "Seq Scan":
+        scans.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        scans.extend(_postgres_scans(child))
+    return scans
+
+
+async def _explain(conn, statement: str, parameters) -> list[str]:
+    tables = set(Base.metadata.tables)
+    if conn.dialect.name == "sqlite":
+        result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        return _sqlite_scans(result.all(), tables)
+    result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return [t for t in _postgres_scans(plan[0]["Plan"]) if t in tables]
+
+
+def _unindexed_foreign_keys(sync_conn) -> list[str]:
+    """FKs cujas colunas não são prefixo de nenhum índice/PK/unique da tabela."""
+    inspector = inspect(sync_conn)
+    missing = []
+    for table in inspector.get_table_names():
+        prefixes = [tuple(i["column_names"]) for i in inspector.get_indexes(table)]
+        prefixes += [tuple(u["column_names"]) for u in inspector.get_unique_constraints(table)]
+        prefixes.append(tuple(inspector.get_pk_constraint(table)["constrained_columns"]))
+        for fk in inspector.get_foreign_keys(table):
+            columns = tuple(fk["constrained_columns"])
+            if not any(p[: len(columns)] == columns for p in prefixes):
+                missing.append(f"{table}({', '.join(columns)}) -> {fk['referred_table']}")
+    return missing
+
+
+async def run(url: str, centers: int) -> list[str]:
+    """Executa os cenários e devolve a lista de problemas encontrados."""
+    engine = create_async_engine(url)
+    recorder = _Recorder()
+    event.listen(engine.sync_engine, "before_cursor_execute", recorder)
+    problems = []
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            if not (await conn.execute(select(func.count()).select_from(Field))).scalar():
+                await _seed(conn, centers)
+            await conn.execute(text("ANALYZE"))
+
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            sample = await _sample(session)
+        for name, scenario in _scenarios(sample):
+            async with AsyncSession(engine, expire_on_commit=False) as session:
+                recorder.scenario = name
+                try:
+                    await scenario(session)
+                except ValueError:
+                    pass  # esperado nos casos de duplicata/conflito
+                finally:
+                    recorder.scenario = None
+
+        async with engine.connect() as conn:
+            if conn.dialect.name == "postgresql":
+                await conn.exec_driver_sql("SET enable_seqscan = off")
+            print(f"{len(recorder.statements)} consultas distintas analisadas")
+            for statement, (name, parameters) in recorder.statements.items():
+                for table in await _explain(conn, statement, parameters):
+                    sql = " ".join(statement.split())
+                    problems.append(f"[{name}] leitura sequencial de {table}: {sql[:160]}")
+            for fk in await conn.run_sync(_unindexed_foreign_keys):
+                problems.append(f"FK sem índice: {fk}")
+    finally:
+        await engine.dispose()
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", help="banco assíncrono (padrão: SQLite temporário)")
+    parser.add_argument("--centers", type=int, default=2000)
+    args = parser.parse_args()
+    url = args.url or "sqlite+aiosqlite:///" + os.path.join(tempfile.mkdtemp(), "advisor.db")
+    problems = asyncio.run(run(url, args.centers))
+    for problem in problems:
+        print(problem)
+    print("OK: nenhuma leitura sequencial" if not problems else f"{len(problems)} problema(s)")
+    raise SystemExit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""
+Recalcula o agregado de avaliações (rating_count, rating_sum, stars_N) de
+todos os centros esportivos a partir da tabela reviews.
+
+    python -m scripts.recompute_ratings --batch-size 1000
+"""
+import argparse
+import asyncio
+
+from core.database import AsyncSessionLocal, async_engine
+from services.rating_service import recompute_ratings
+
+
+async def run(batch_size: int) -> int:
+    try:
+        async with AsyncSessionLocal() as session:
+            return await recompute_ratings(session, batch_size)
+    finally:
+        await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    fixed = asyncio.run(run(args.batch_size))
+    print(f"{fixed} centro(s) corrigido(s)")
+
+
+if __name__ == "__main__":
+    main()
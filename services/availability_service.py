@@ -1,37 +1,315 @@
-from sqlalchemy.orm import Session
-from models import Availability
-from schemas.availability_schemas import AvailabilityCreate
-
-
-def create_availability_service(db: Session, availability_data: AvailabilityCreate):
-    # Verifica se a disponibilidade já existe para o campo e horário especificados
-    existing_availability = (
-        db.query(Availability)
-        .filter(
-            Availability.field_id == availability_data.field_id,
-            Availability.start_time == availability_data.start_time,
-            Availability.end_time == availability_data.end_time,
-        )
-        .first()
+from datetime import date
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.entity_cache import entity_cache, entity_tag
+from models import Availability, Field
+from models.models import AVAILABILITY_UNIQUE
+from schemas.availability_schemas import (
+    AvailabilityBulkCreate,
+    AvailabilityBulkUpdate,
+    AvailabilityCreate,
+    AvailabilityUpdate,
+    AvailabilityWeeklyCreate,
+)
+from schemas.bulk_schemas import BulkDelete
+from services.occupancy_service import occupancy_index
+from utils.bulk import BulkResult, insert_rows
+from utils.etag import bump_versions
+from utils.recurrence import first_on_or_after, window_datetimes
+from utils.returning import is_unique_violation, update_returning
+
+
+async def create_availability_service(
+    db: AsyncSession, availability_data: AvailabilityCreate
+):
+    # Sem SELECT prévio: o índice único (campo, início, fim) rejeita a duplicata
+    try:
+        new_id = (
+            await db.execute(
+                insert(Availability)
+                .values(**availability_data.model_dump())
+                .returning(Availability.id)
+            )
+        ).scalar_one()
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        if is_unique_violation(
+            e,
+            "availabilities",
+            ("field_id", "start_time", "end_time"),
+            AVAILABILITY_UNIQUE,
+        ):
+            raise ValueError("Disponibilidade já existe para esse campo e horário.")
+        raise
+    occupancy_index.availability_changed(availability_data.field_id)
+    return new_id
+
+
+async def create_availability_weekly_service(
+    db: AsyncSession, data: AvailabilityWeeklyCreate
+) -> dict:
+    """Cria o padrão semanal em vários campos: 2 SELECTs e um INSERT em lote."""
+    query = select(Field.id)
+    if data.sports_center_id is not None:
+        query = query.where(Field.sports_center_id == data.sports_center_id)
+    else:
+        query = query.where(Field.id.in_(set(data.field_ids)))
+    field_ids = sorted((await db.execute(query.order_by(Field.id))).scalars())
+    if not field_ids:
+        raise ValueError("Nenhum campo encontrado.")
+    if data.field_ids is not None and len(field_ids) < len(set(data.field_ids)):
+        missing = sorted(set(data.field_ids) - set(field_ids))
+        raise ValueError(f"Campos não encontrados: {missing}")
+
+    # Janelas já cadastradas (mesmo campo, dia e horário) não são duplicadas
+    result = await db.execute(
+        select(
+            Availability.field_id,
+            Availability.day_of_week,
+            Availability.start_time,
+            Availability.end_time,
+        ).where(Availability.field_id.in_(field_ids))
     )
-    if existing_availability:
-        raise ValueError("Disponibilidade já existe para esse campo e horário.")
+    seen = {(f, dow, s.time(), e.time()) for f, dow, s, e in result}
+
+    starts_on = data.starts_on or date.today()
+    rows, skipped = [], 0
+    for field_id in field_ids:
+        for window in data.windows:
+            key = (field_id, window.day_of_week, window.start, window.end)
+            if key in seen:
+                skipped += 1
+                continue
+            seen.add(key)
+            first_day = first_on_or_after(starts_on, window.day_of_week)
+            start_time, end_time = window_datetimes(first_day, window.start, window.end)
+            rows.append(
+                {
+                    "field_id": field_id,
+                    "day_of_week": window.day_of_week,
+                    "start_time": start_time,
+                    "end_time": end_time,
+                }
+            )
+
+    if rows:
+        await db.execute(insert(Availability), rows)
+        await db.commit()
+        for field_id in field_ids:
+            occupancy_index.availability_changed(field_id)
+    return {"fields": len(field_ids), "created": len(rows), "skipped": skipped}
 
-    new_availability = Availability(**availability_data.dict())
-    db.add(new_availability)
-    db.commit()
-    db.refresh(new_availability)
-    return new_availability.id
 
+async def get_availability_by_id(
+    db: AsyncSession, availability_id: int
+) -> Availability:
+    """Busca uma disponibilidade pelo ID (com cache)."""
+    return await entity_cache.get(
+        Availability,
+        availability_id,
+        lambda: db.get(Availability, availability_id),
+        owner=(Field, "field_id"),
+    )
 
-def get_availability_by_id(db: Session, availability_id: int) -> Availability:
-    return db.query(Availability).filter(Availability.id == availability_id).first()
 
+async def update_availability_service(
+    db: AsyncSession, availability_id: int, availability_data: AvailabilityUpdate
+) -> Availability:
+    """UPDATE ... RETURNING; o campo antigo volta junto para invalidar a ocupação."""
+    availability, old = await update_returning(
+        db,
+        Availability,
+        availability_id,
+        availability_data.model_dump(exclude_unset=True),
+        old=("field_id",),
+    )
+    if availability is None:
+        raise ValueError("Disponibilidade não encontrada.")
+    await db.commit()
+    await entity_cache.invalidate(entity_tag(Availability, availability_id))
+    if old is not None:
+        occupancy_index.availability_changed(old[0])
+    occupancy_index.availability_changed(availability.field_id)
+    return availability
 
-def delete_availability_by_id(db: Session, availability_id: int) -> None:
-    """Deleta um campo pelo ID."""
-    availability = get_availability_by_id(db, availability_id)
-    if not availability:
+
+async def delete_availability_by_id(db: AsyncSession, availability_id: int) -> None:
+    """Deleta uma disponibilidade pelo ID."""
+    field_id = (
+        await db.execute(
+            delete(Availability)
+            .where(Availability.id == availability_id)
+            .returning(Availability.field_id)
+        )
+    ).scalar_one_or_none()
+    if field_id is None:
         raise ValueError("Disponibilidade não encontrada.")
-    db.delete(availability)
-    db.commit()
+    await db.commit()
+    await entity_cache.invalidate(entity_tag(Availability, availability_id))
+    occupancy_index.availability_changed(field_id)
+
+
+# Operações em lote (ver utils/bulk.py)
+async def _existing_fields(db: AsyncSession, field_ids) -> set[int]:
+    result = await db.execute(select(Field.id).where(Field.id.in_(set(field_ids))))
+    return set(result.scalars())
+
+
+async def create_availabilities_bulk_service(
+    db: AsyncSession, data: AvailabilityBulkCreate
+) -> dict:
+    items = data.items
+    result = BulkResult(len(items))
+    fields = await _existing_fields(db, {item.field_id for item in items})
+    # Mesma regra do create unitário: campo + início + fim não se repetem
+    taken = set(
+        (
+            await db.execute(
+                select(
+                    Availability.field_id, Availability.start_time, Availability.end_time
+                ).where(
+                    Availability.field_id.in_(fields),
+                    Availability.start_time.in_({item.start_time for item in items}),
+                )
+            )
+        ).tuples()
+    )
+
+    accepted, rows = [], []
+    for index, item in enumerate(items):
+        key = (item.field_id, item.start_time, item.end_time)
+        if item.field_id not in fields:
+            result.reject(index, "not_found", "Campo não encontrado.")
+        elif key in taken:
+            result.reject(
+                index, "duplicate", "Disponibilidade já existe para esse campo e horário."
+            )
+        else:
+            taken.add(key)
+            accepted.append(index)
+            rows.append(item.model_dump())
+
+    if rows and not (data.atomic and result.rejected):
+        inserted = await insert_rows(
+            db,
+            Availability,
+            result,
+            accepted,
+            rows,
+            data.atomic,
+            ("field_id", "start_time", "end_time"),
+            "Disponibilidade já existe para esse campo e horário.",
+        )
+        for field_id in {row["field_id"] for row in inserted}:
+            occupancy_index.availability_changed(field_id)
+    return result.summary("created")
+
+
+async def update_availabilities_bulk_service(
+    db: AsyncSession, data: AvailabilityBulkUpdate
+) -> dict:
+    items = data.items
+    result = BulkResult(len(items))
+    slot = (Availability.field_id, Availability.start_time, Availability.end_time)
+    current = {
+        row[0]: tuple(row[1:])
+        for row in await db.execute(
+            select(Availability.id, *slot).where(
+                Availability.id.in_({item.id for item in items})
+            )
+        )
+    }
+    fields = await _existing_fields(
+        db, {item.field_id for item in items if item.field_id is not None}
+    )
+
+    # (campo, início, fim) de destino de cada item; o índice único não aceita
+    # repetir um que já existe no banco nem dois iguais no mesmo lote
+    targets = {}
+    for item in items:
+        if item.id in current:
+            field_id, start_time, end_time = current[item.id]
+            targets[item.id] = (
+                item.field_id if item.field_id is not None else field_id,
+                item.start_time if item.start_time is not None else start_time,
+                item.end_time if item.end_time is not None else end_time,
+            )
+    owners = {}
+    if targets:
+        owners = {
+            tuple(row[1:]): row[0]
+            for row in await db.execute(
+                select(Availability.id, *slot).where(
+                    Availability.field_id.in_({t[0] for t in targets.values()}),
+                    Availability.start_time.in_({t[1] for t in targets.values()}),
+                )
+            )
+        }
+
+    accepted, rows, seen, touched = [], [], set(), set()
+    for index, item in enumerate(items):
+        if item.id not in current:
+            result.reject(index, "not_found", "Disponibilidade não encontrada.")
+        elif item.field_id is not None and item.field_id not in fields:
+            result.reject(index, "not_found", "Campo não encontrado.")
+        elif item.id in seen:
+            result.reject(index, "duplicate", "Disponibilidade repetida no lote.")
+        elif owners.get(targets[item.id], item.id) != item.id:
+            result.reject(
+                index, "duplicate", "Disponibilidade já existe para esse campo e horário."
+            )
+        else:
+            owners[targets[item.id]] = item.id
+            seen.add(item.id)
+            accepted.append(index)
+            rows.append(item.model_dump(exclude_unset=True) | {"id": item.id})
+            touched.add(current[item.id][0])
+            if item.field_id is not None:
+                touched.add(item.field_id)
+
+    if rows and not (data.atomic and result.rejected):
+        await db.execute(update(Availability), rows)
+        await db.execute(bump_versions(Availability, [row["id"] for row in rows]))
+        await db.commit()
+        await entity_cache.invalidate(
+            *(entity_tag(Availability, row["id"]) for row in rows)
+        )
+        for index, row in zip(accepted, rows):
+            result.ok(index, "updated", row["id"])
+        for field_id in touched:
+            occupancy_index.availability_changed(field_id)
+    return result.summary("updated")
+
+
+async def delete_availabilities_bulk_service(
+    db: AsyncSession, data: BulkDelete
+) -> dict:
+    result = BulkResult(len(data.ids))
+    current = await db.execute(
+        select(Availability.id, Availability.field_id).where(
+            Availability.id.in_(set(data.ids))
+        )
+    )
+    current = dict(current.tuples().all())
+    accepted, seen = [], set()
+    for index, availability_id in enumerate(data.ids):
+        if availability_id not in current:
+            result.reject(index, "not_found", "Disponibilidade não encontrada.")
+        elif availability_id in seen:
+            result.reject(index, "duplicate", "Disponibilidade repetida no lote.")
+        else:
+            seen.add(availability_id)
+            accepted.append(index)
+
+    if seen and not (data.atomic and result.rejected):
+        await db.execute(delete(Availability).where(Availability.id.in_(seen)))
+        await db.commit()
+        await entity_cache.invalidate(*(entity_tag(Availability, a) for a in seen))
+        for index in accepted:
+            result.ok(index, "deleted", data.ids[index])
+        for field_id in {current[a] for a in seen}:
+            occupancy_index.availability_changed(field_id)
+    return result.summary("deleted")
@@ -1,36 +1,195 @@
-from sqlalchemy.orm import Session
+from bisect import bisect_right
+
+from sqlalchemy import delete, insert, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from models import Booking
-from schemas.booking_schemas import BookingCreate
-
-
-def create_booking_service(db: Session, booking_data: BookingCreate):
-    # Verifica se já existe uma reserva para o mesmo campo e horário
-    existing_booking = (
-        db.query(Booking)
-        .filter(
-            Booking.field_id == booking_data.field_id,
-            Booking.booking_date == booking_data.booking_date,
-            Booking.start_time == booking_data.start_time,
-            Booking.end_time == booking_data.end_time,
+from models.models import BOOKING_OVERLAP_CONSTRAINT
+from schemas.booking_schemas import BookingCreate, BookingRecurrenceCreate
+from services.occupancy_service import occupancy_index
+from services.slot_service import INACTIVE_BOOKING_STATUSES
+from utils.pagination import DEFAULT_PAGE_SIZE, keyset
+from utils.recurrence import day_of_week, expand_weekly
+from utils.returning import update_returning
+
+
+def is_booking_overlap(error: IntegrityError) -> bool:
+    """IntegrityError veio da exclusion constraint / trigger de sobreposição?"""
+    return BOOKING_OVERLAP_CONSTRAINT in str(error.orig)
+
+
+async def create_booking_service(db: AsyncSession, booking_data: BookingCreate):
+    # Sem SELECT prévio: o próprio banco rejeita reservas que se sobrepõem
+    # (ver BOOKING_OVERLAP_DDL), então é um round trip e não há corrida
+    try:
+        new_id = (
+            await db.execute(
+                insert(Booking)
+                .values(
+                    user_id=booking_data.user_id,
+                    field_id=booking_data.field_id,
+                    day_of_week=day_of_week(booking_data.start_time.date()),
+                    start_time=booking_data.start_time,
+                    end_time=booking_data.end_time,
+                    status="pending",
+                )
+                .returning(Booking.id)
+            )
+        ).scalar_one()
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        if is_booking_overlap(e):
+            raise ValueError("Já existe uma reserva para esse campo e horário.")
+        raise
+    occupancy_index.booking_added(
+        booking_data.field_id, booking_data.start_time, booking_data.end_time
+    )
+    return new_id
+
+def find_conflicts(occurrences, busy) -> list[int]:
+    """Índices de `occurrences` que cruzam algum intervalo de `busy`.
+
+    Ambos ordenados por início; `busy` sem sobreposição entre si (reservas
+    ativas), logo os fins também estão em ordem e cabe uma busca binária.
+    """
+    busy_ends = [end for _, end in busy]
+    conflicts = []
+    for i, (start, end) in enumerate(occurrences):
+        j = bisect_right(busy_ends, start)  # primeira reserva que termina depois
+        if j < len(busy) and busy[j][0] < end:
+            conflicts.append(i)
+    return conflicts
+
+
+async def create_recurring_bookings_service(
+    db: AsyncSession, data: BookingRecurrenceCreate
+) -> dict:
+    """Expande a regra e grava a série: um SELECT de conflitos e um INSERT em lote."""
+    occurrences = expand_weekly(
+        data.days_of_week,
+        data.start,
+        data.end,
+        data.starts_on,
+        data.ends_on,
+        data.except_dates,
+    )
+    summary = {"requested": len(occurrences), "created": 0, "ids": [], "conflicts": []}
+    if not occurrences:
+        return summary
+
+    result = await db.execute(
+        select(Booking.start_time, Booking.end_time)
+        .where(
+            Booking.field_id == data.field_id,
+            Booking.start_time < occurrences[-1][1],
+            Booking.end_time > occurrences[0][0],
+            or_(
+                Booking.status.is_(None),
+                Booking.status.not_in(INACTIVE_BOOKING_STATUSES),
+            ),
         )
-        .first()
+        .order_by(Booking.start_time)
     )
-    if existing_booking:
-        raise ValueError("Já existe uma reserva para esse campo e horário.")
+    conflicts = find_conflicts(occurrences, result.all())
+    summary["conflicts"] = [
+        {"start": occurrences[i][0], "end": occurrences[i][1]} for i in conflicts
+    ]
+    if conflicts and not data.skip_conflicts:
+        raise ValueError(
+            f"{len(conflicts)} ocorrência(s) da série conflitam com reservas existentes."
+        )
+
+    skip = set(conflicts)
+    rows = [
+        {
+            "user_id": data.user_id,
+            "field_id": data.field_id,
+            "day_of_week": day_of_week(start.date()),
+            "start_time": start,
+            "end_time": end,
+            "status": "pending",
+        }
+        for i, (start, end) in enumerate(occurrences)
+        if i not in skip
+    ]
+    if not rows:
+        return summary
+    try:
+        # A constraint de sobreposição ainda protege contra escritas concorrentes
+        result = await db.execute(
+            insert(Booking).returning(Booking.id, sort_by_parameter_order=True), rows
+        )
+        ids = list(result.scalars())
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        if is_booking_overlap(e):
+            raise ValueError(
+                "Outra reserva ocupou um horário da série; tente novamente."
+            )
+        raise
+    for row in rows:
+        occupancy_index.booking_added(row["field_id"], row["start_time"], row["end_time"])
+    summary["created"] = len(ids)
+    summary["ids"] = ids
+    return summary
 
-    new_booking = Booking(**booking_data.dict())
-    db.add(new_booking)
-    db.commit()
-    db.refresh(new_booking)
-    return new_booking.id
 
-def get_booking_by_id(db: Session, booking_id: int) -> Booking:
-    return db.query(Booking).filter(Booking.id == booking_id).first()
+async def get_booking_by_id(db: AsyncSession, booking_id: int) -> Booking:
+    return await db.get(Booking, booking_id)
+
+
+async def get_bookings_by_user_service(
+    db: AsyncSession,
+    user_id,
+    limit: int = DEFAULT_PAGE_SIZE,
+    after: tuple | None = None,
+) -> list[Booking]:
+    """Reservas de um usuário, mais recentes primeiro (até limit + 1)."""
+    query = select(Booking).where(Booking.user_id == user_id)
+    result = await db.execute(
+        keyset(query, (Booking.start_time, Booking.id), after, descending=True, limit=limit)
+    )
+    return result.scalars().all()
   
-def delete_booking_by_id(db: Session, booking_id: int) -> None:
+async def update_booking_service(
+    db: AsyncSession, booking_id: int, booking_data: BookingCreate
+) -> Booking:
+    """
+    UPDATE ... RETURNING da reserva; o intervalo antigo volta junto para
+    invalidar a ocupação. Sobreposição sobe como IntegrityError (ver
+    is_booking_overlap); reserva inexistente, ValueError.
+    """
+    values = booking_data.model_dump(exclude_unset=True)
+    if "start_time" in values:
+        values["day_of_week"] = day_of_week(values["start_time"].date())
+    booking, old = await update_returning(
+        db, Booking, booking_id, values, old=("field_id", "start_time", "end_time")
+    )
+    if booking is None:
+        raise ValueError("Reserva não encontrada.")
+    await db.commit()
+    if old is not None:
+        occupancy_index.booking_removed(*old)
+    # Reserva cancelada não ocupa slot (mesma regra da constraint)
+    if booking.status != "cancelled":
+        occupancy_index.booking_added(
+            booking.field_id, booking.start_time, booking.end_time
+        )
+    return booking
+
+
+async def delete_booking_by_id(db: AsyncSession, booking_id: int) -> None:
     """Deleta uma reserva pelo ID."""
-    booking = get_booking_by_id(db, booking_id)
-    if not booking:
+    deleted = (
+        await db.execute(
+            delete(Booking)
+            .where(Booking.id == booking_id)
+            .returning(Booking.field_id, Booking.start_time, Booking.end_time)
+        )
+    ).one_or_none()
+    if deleted is None:
         raise ValueError("Reserva não encontrada.")
-    db.delete(booking)
-    db.commit()
+    await db.commit()
+    occupancy_index.booking_removed(*deleted)
@@ -1,39 +1,229 @@
-from sqlalchemy.orm import Session
-from models import Field
-from schemas.field_schemas import FieldCreate
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.entity_cache import entity_cache, entity_tag, owner_tag
+from models import Availability, Field, SportsCenter
+from models.models import FIELD_NAME_UNIQUE
+from schemas.bulk_schemas import BulkDelete
+from schemas.field_schemas import (
+    FieldBulkCreate,
+    FieldBulkUpdate,
+    FieldCreate,
+    FieldUpdate,
+)
+from services.occupancy_service import occupancy_index
+from utils.bulk import BulkResult, insert_rows
+from utils.etag import bump_versions
+from utils.pagination import DEFAULT_PAGE_SIZE, keyset
+from utils.returning import is_unique_violation, update_returning
 
 
-# CRUD para campos
-def create_field_service(db: Session, field_data: FieldCreate) -> int:
+# CRUD para campos: cada escrita é um statement com RETURNING
+async def create_field_service(db: AsyncSession, field_data: FieldCreate) -> int:
     """Cria um novo campo no banco."""
-    # Verifica se o campo já existe no centro esportivo
-    existing_field = (
-        db.query(Field)
-        .filter(
-            Field.sports_center_id == field_data.sports_center_id,
-            Field.name == field_data.name,
-        )
-        .first()
+    # Sem SELECT prévio: o índice único (centro, nome) rejeita a duplicata
+    try:
+        new_id = (
+            await db.execute(
+                insert(Field).values(**field_data.model_dump()).returning(Field.id)
+            )
+        ).scalar_one()
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        if is_unique_violation(
+            e, "fields", ("sports_center_id", "name"), FIELD_NAME_UNIQUE
+        ):
+            raise ValueError("Campo com esse nome já existe nesse centro esportivo.")
+        raise
+    return new_id
+
+
+async def get_field_by_id(db: AsyncSession, field_id: int) -> Field:
+    """Busca um campo pelo ID (com cache)."""
+    return await entity_cache.get(
+        Field,
+        field_id,
+        lambda: db.get(Field, field_id),
+        owner=(SportsCenter, "sports_center_id"),
     )
-    if existing_field:
-        raise ValueError("Campo com esse nome já existe nesse centro esportivo.")
 
-    new_field = Field(**field_data.dict())
-    db.add(new_field)
-    db.commit()
-    db.refresh(new_field)
-    return new_field.id
 
+async def get_fields_by_sports_center_service(
+    db: AsyncSession,
+    sports_center_id: int,
+    limit: int = DEFAULT_PAGE_SIZE,
+    after_id: int | None = None,
+) -> list[Field]:
+    """Campos de um centro em ordem de id (até limit + 1)."""
+    query = select(Field).where(Field.sports_center_id == sports_center_id)
+    after = None if after_id is None else (after_id,)
+    result = await db.execute(keyset(query, (Field.id,), after, limit=limit))
+    return result.scalars().all()
 
-def get_field_by_id(db: Session, field_id: int) -> Field:
-    """Busca um campo pelo ID."""
-    return db.query(Field).filter(Field.id == field_id).first()
+
+async def update_field_service(
+    db: AsyncSession, field_id: int, field_data: FieldUpdate
+) -> Field:
+    """Atualiza um campo (UPDATE ... RETURNING). Lança ValueError se não existir."""
+    field, _ = await update_returning(
+        db, Field, field_id, field_data.model_dump(exclude_unset=True)
+    )
+    if field is None:
+        raise ValueError("Campo não encontrado.")
+    await db.commit()
+    await entity_cache.invalidate(entity_tag(Field, field_id))
+    return field
 
 
-def delete_field_by_id(db: Session, field_id: int) -> None:
+async def delete_field_by_id(db: AsyncSession, field_id: int) -> None:
     """Deleta um campo pelo ID."""
-    field = get_field_by_id(db, field_id)
-    if not field:
+    result = await db.execute(
+        delete(Field).where(Field.id == field_id).returning(Field.id)
+    )
+    if result.scalar_one_or_none() is None:
         raise ValueError("Campo não encontrado.")
-    db.delete(field)
-    db.commit()
+    await db.commit()
+    await entity_cache.invalidate(
+        entity_tag(Field, field_id), owner_tag(Field, field_id, Availability)
+    )
+    occupancy_index.availability_changed(field_id)
+
+
+# Operações em lote: validação em uma passada, checagens com uma query cada
+# e uma única transação (ver utils/bulk.py)
+async def create_fields_bulk_service(db: AsyncSession, data: FieldBulkCreate) -> dict:
+    items = data.items
+    result = BulkResult(len(items))
+    center_ids = {item.sports_center_id for item in items}
+    centers = await db.execute(
+        select(SportsCenter.id).where(SportsCenter.id.in_(center_ids))
+    )
+    centers = set(centers.scalars())
+    # Nomes já usados nesses centros (o par centro + nome é único)
+    taken = set(
+        (
+            await db.execute(
+                select(Field.sports_center_id, Field.name).where(
+                    Field.sports_center_id.in_(center_ids),
+                    Field.name.in_({item.name for item in items}),
+                )
+            )
+        ).tuples()
+    )
+
+    accepted, rows = [], []
+    for index, item in enumerate(items):
+        key = (item.sports_center_id, item.name)
+        if item.sports_center_id not in centers:
+            result.reject(index, "not_found", "Centro esportivo não encontrado.")
+        elif key in taken:
+            result.reject(
+                index, "duplicate", "Campo com esse nome já existe nesse centro esportivo."
+            )
+        else:
+            taken.add(key)
+            accepted.append(index)
+            rows.append(item.model_dump())
+
+    if rows and not (data.atomic and result.rejected):
+        await insert_rows(
+            db,
+            Field,
+            result,
+            accepted,
+            rows,
+            data.atomic,
+            ("sports_center_id", "name"),
+            "Campo com esse nome já existe nesse centro esportivo.",
+        )
+    return result.summary("created")
+
+
+async def update_fields_bulk_service(db: AsyncSession, data: FieldBulkUpdate) -> dict:
+    items = data.items
+    result = BulkResult(len(items))
+    current = {
+        row.id: row
+        for row in await db.execute(
+            select(Field.id, Field.sports_center_id, Field.name).where(
+                Field.id.in_({item.id for item in items})
+            )
+        )
+    }
+    renames = {item.name for item in items if item.name is not None}
+    owners = {}
+    if renames:
+        owners = {
+            (row.sports_center_id, row.name): row.id
+            for row in await db.execute(
+                select(Field.id, Field.sports_center_id, Field.name).where(
+                    Field.sports_center_id.in_(
+                        {row.sports_center_id for row in current.values()}
+                    ),
+                    Field.name.in_(renames),
+                )
+            )
+        }
+
+    accepted, rows, seen = [], [], set()
+    for index, item in enumerate(items):
+        field = current.get(item.id)
+        if field is None:
+            result.reject(index, "not_found", "Campo não encontrado.")
+            continue
+        if item.id in seen:
+            result.reject(index, "duplicate", "Campo repetido no lote.")
+            continue
+        if item.name is not None:
+            key = (field.sports_center_id, item.name)
+            if owners.get(key, item.id) != item.id:
+                result.reject(
+                    index,
+                    "duplicate",
+                    "Campo com esse nome já existe nesse centro esportivo.",
+                )
+                continue
+            owners[key] = item.id
+        seen.add(item.id)
+        accepted.append(index)
+        rows.append(item.model_dump(exclude_unset=True) | {"id": item.id})
+
+    if rows and not (data.atomic and result.rejected):
+        # UPDATE em lote por chave primária (executemany)
+        await db.execute(update(Field), rows)
+        await db.execute(bump_versions(Field, [row["id"] for row in rows]))
+        await db.commit()
+        await entity_cache.invalidate(*(entity_tag(Field, row["id"]) for row in rows))
+        for index, row in zip(accepted, rows):
+            result.ok(index, "updated", row["id"])
+    return result.summary("updated")
+
+
+async def delete_fields_bulk_service(db: AsyncSession, data: BulkDelete) -> dict:
+    result = BulkResult(len(data.ids))
+    existing = set(
+        (await db.execute(select(Field.id).where(Field.id.in_(set(data.ids))))).scalars()
+    )
+    accepted, seen = [], set()
+    for index, field_id in enumerate(data.ids):
+        if field_id not in existing:
+            result.reject(index, "not_found", "Campo não encontrado.")
+        elif field_id in seen:
+            result.reject(index, "duplicate", "Campo repetido no lote.")
+        else:
+            seen.add(field_id)
+            accepted.append(index)
+
+    if seen and not (data.atomic and result.rejected):
+        await db.execute(delete(Field).where(Field.id.in_(seen)))
+        await db.commit()
+        await entity_cache.invalidate(
+            *(entity_tag(Field, field_id) for field_id in seen),
+            *(owner_tag(Field, field_id, Availability) for field_id in seen),
+        )
+        for field_id in seen:
+            occupancy_index.availability_changed(field_id)
+        for index in accepted:
+            result.ok(index, "deleted", data.ids[index])
+    return result.summary("deleted")
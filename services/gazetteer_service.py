@@ -0,0 +1,104 @@
+"""
+Gazetteer offline: índice em memória de cidades (nome, UF, bbox, centróide)
+carregado de um CSV local, para resolver cidades sem serviço externo.
+
+Formato do CSV (com cabeçalho):
+    name,state,lat_min,lat_max,lon_min,lon_max,lat,lon
+    Uberlândia,MG,-19.05,-18.80,-48.45,-48.10,-18.9186,-48.2772
+
+As chaves são normalizadas (sem acento, minúsculas), e ficam ordenadas para
+busca exata e por prefixo via bisect.
+"""
+import csv
+import re
+import unicodedata
+from bisect import bisect_left
+from typing import NamedTuple, Optional
+
+# "Santa Luzia, MG" / "Santa Luzia - MG" / "Santa Luzia/MG"
+_NAME_WITH_STATE = re.compile(r"^(?P<name>.+?)\s*[,/-]\s*(?P<state>[A-Za-z]{2})$")
+
+
+def normalize_city(city: str) -> str:
+    """Chave de busca: sem acentos, minúsculas e espaços colapsados."""
+    decomposed = unicodedata.normalize("NFKD", city)
+    without_accents = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(without_accents.casefold().split())
+
+
+class City(NamedTuple):
+    name: str
+    state: str
+    lat_min: float
+    lat_max: float
+    lon_min: float
+    lon_max: float
+    lat: float
+    lon: float
+
+    @property
+    def label(self) -> str:
+        return f"{self.name}, {self.state}"
+
+
+class Gazetteer:
+    def __init__(self, cities: list[City]):
+        # Ordem do arquivo é o desempate entre homônimos (ex.: maior população
+        # primeiro); sorted() é estável, então ela se mantém dentro da chave.
+        ordered = sorted(cities, key=lambda c: normalize_city(c.name))
+        self._keys = [normalize_city(c.name) for c in ordered]
+        self._cities = ordered
+
+    def __len__(self) -> int:
+        return len(self._cities)
+
+    def _scan(self, prefix: str, exact: bool):
+        i = bisect_left(self._keys, prefix)
+        while i < len(self._keys) and self._keys[i].startswith(prefix):
+            if not exact or self._keys[i] == prefix:
+                yield self._cities[i]
+            elif exact:
+                break
+            i += 1
+
+    def lookup(self, query: str, state: Optional[str] = None) -> Optional[City]:
+        """Cidade pelo nome; aceita UF no próprio texto ("Cidade, UF")."""
+        name = query
+        if state is None:
+            match = _NAME_WITH_STATE.match(query.strip())
+            if match and any(self._scan(normalize_city(match["name"]), exact=True)):
+                name, state = match["name"], match["state"]
+
+        for city in self._scan(normalize_city(name), exact=True):
+            if state is None or city.state.casefold() == state.casefold():
+                return city
+        return None
+
+    def autocomplete(self, prefix: str, limit: int = 10) -> list[City]:
+        key = normalize_city(prefix)
+        if not key:
+            return []
+        results = []
+        for city in self._scan(key, exact=False):
+            results.append(city)
+            if len(results) >= limit:
+                break
+        return results
+
+
+def load_gazetteer(path: str) -> Gazetteer:
+    with open(path, newline="", encoding="utf-8") as f:
+        cities = [
+            City(
+                name=row["name"].strip(),
+                state=row["state"].strip(),
+                lat_min=float(row["lat_min"]),
+                lat_max=float(row["lat_max"]),
+                lon_min=float(row["lon_min"]),
+                lon_max=float(row["lon_max"]),
+                lat=float(row["lat"]),
+                lon=float(row["lon"]),
+            )
+            for row in csv.DictReader(f)
+        ]
+    return Gazetteer(cities)
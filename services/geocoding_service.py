@@ -0,0 +1,217 @@
+"""
+Geocodificação de cidades (nome -> bounding box) para a busca por cidade.
+
+Fluxo de uma consulta:
+0. gazetteer offline (GAZETTEER_PATH), se configurado
+1. cache em memória (TTLCache)
+2. cache persistente em SQLite local (sobrevive a restart)
+3. provider remoto, com uma única requisição em voo por cidade
+   (requests concorrentes para a mesma cidade aguardam o mesmo resultado)
+
+Com GEOCODER_OFFLINE_ONLY, cidade fora do gazetteer é tratada como
+inexistente e nenhum serviço externo é chamado.
+
+O provider é plugável: qualquer objeto com `geocode_city(city)` assíncrono.
+"""
+import asyncio
+import sqlite3
+import time
+from contextlib import closing
+from typing import NamedTuple, Optional, Protocol
+
+import httpx
+
+from core.cache import TTLCache
+from core.config import settings
+from services.gazetteer_service import Gazetteer, load_gazetteer, normalize_city
+
+_MISS = object()
+
+
+class BoundingBox(NamedTuple):
+    lat_min: float
+    lat_max: float
+    lon_min: float
+    lon_max: float
+
+
+class GeocodingProvider(Protocol):
+    async def geocode_city(self, city: str) -> Optional[BoundingBox]: ...
+
+    async def aclose(self) -> None: ...
+
+
+class GeocodingError(Exception):
+    """Provider indisponível ou resposta inválida."""
+
+
+class NominatimProvider:
+    """Provider HTTP compatível com a API /search do Nominatim."""
+
+    def __init__(self, url: str, timeout: float = 5.0, max_connections: int = 10):
+        self.url = url
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self._client: httpx.AsyncClient | None = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # Um cliente (e pool de conexões keep-alive) por processo
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.max_connections),
+                headers={"User-Agent": "BolaMarcadaApp/1.0"},
+            )
+        return self._client
+
+    async def geocode_city(self, city: str) -> Optional[BoundingBox]:
+        params = {"city": city, "format": "json", "limit": 1}
+        try:
+            response = await self.client.get(self.url, params=params)
+            response.raise_for_status()
+            data = response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            raise GeocodingError(str(e)) from e
+
+        if not data:
+            return None
+        try:
+            bbox = data[0]["boundingbox"]
+            return BoundingBox(*(float(v) for v in bbox))
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            raise GeocodingError(f"Resposta inválida do geocoder: {data!r}") from e
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class GeocodeStore:
+    """Cache persistente cidade -> bounding box numa tabela SQLite local."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._table_ready = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path)
+        if not self._table_ready:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS geocode_cache ("
+                " city_key TEXT PRIMARY KEY,"
+                " lat_min REAL, lat_max REAL, lon_min REAL, lon_max REAL,"
+                " expires_at REAL NOT NULL)"
+            )
+            self._table_ready = True
+        return conn
+
+    def get(self, city_key: str):
+        """BoundingBox, None (cidade inexistente em cache) ou _MISS."""
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT lat_min, lat_max, lon_min, lon_max, expires_at"
+                " FROM geocode_cache WHERE city_key = ?",
+                (city_key,),
+            ).fetchone()
+        if row is None or row[4] <= time.time():
+            return _MISS
+        if row[0] is None:
+            return None
+        return BoundingBox(*row[:4])
+
+    def set(self, city_key: str, bbox: Optional[BoundingBox], ttl: float) -> None:
+        values = tuple(bbox) if bbox else (None, None, None, None)
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO geocode_cache VALUES (?, ?, ?, ?, ?, ?)",
+                (city_key, *values, time.time() + ttl),
+            )
+
+
+class Geocoder:
+    def __init__(
+        self,
+        provider: GeocodingProvider,
+        store: GeocodeStore | None = None,
+        ttl: float = 30 * 24 * 3600,
+        negative_ttl: float = 24 * 3600,
+        memory_size: int = 1024,
+        gazetteer: Gazetteer | None = None,
+        offline_only: bool = False,
+    ):
+        self.provider = provider
+        self.gazetteer = gazetteer
+        self.offline_only = offline_only
+        self.store = store
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.memory = TTLCache(maxsize=memory_size, ttl=ttl)
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    async def geocode_city(self, city: str) -> Optional[BoundingBox]:
+        if self.gazetteer is not None:
+            found = self.gazetteer.lookup(city)
+            if found is not None:
+                return BoundingBox(
+                    found.lat_min, found.lat_max, found.lon_min, found.lon_max
+                )
+        if self.offline_only:
+            return None
+
+        key = normalize_city(city)
+        cached = self.memory.get(key, _MISS)
+        if cached is not _MISS:
+            return cached
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._resolve(key, city))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # shield: se um request for cancelado, os outros continuam esperando
+        return await asyncio.shield(task)
+
+    async def _resolve(self, key: str, city: str) -> Optional[BoundingBox]:
+        if self.store is not None:
+            stored = await asyncio.to_thread(self.store.get, key)
+            if stored is not _MISS:
+                self.memory.set(key, stored, ttl=self._ttl_for(stored))
+                return stored
+
+        bbox = await self.provider.geocode_city(city)
+        ttl = self._ttl_for(bbox)
+        self.memory.set(key, bbox, ttl=ttl)
+        if self.store is not None:
+            await asyncio.to_thread(self.store.set, key, bbox, ttl)
+        return bbox
+
+    def _ttl_for(self, bbox: Optional[BoundingBox]) -> float:
+        # Cidade não encontrada fica menos tempo em cache
+        return self.ttl if bbox else self.negative_ttl
+
+    async def aclose(self) -> None:
+        await self.provider.aclose()
+
+
+gazetteer = load_gazetteer(settings.GAZETTEER_PATH) if settings.GAZETTEER_PATH else None
+
+geocoder = Geocoder(
+    NominatimProvider(
+        settings.GEOCODER_URL, timeout=settings.GEOCODER_TIMEOUT_SECONDS
+    ),
+    GeocodeStore(settings.GEOCODE_CACHE_PATH),
+    ttl=settings.GEOCODE_CACHE_TTL_SECONDS,
+    negative_ttl=settings.GEOCODE_NEGATIVE_TTL_SECONDS,
+    gazetteer=gazetteer,
+    offline_only=settings.GEOCODER_OFFLINE_ONLY,
+)
+
+
+def get_geocoder() -> Geocoder:
+    return geocoder
+
+
+def get_gazetteer() -> Gazetteer | None:
+    return gazetteer
@@ -0,0 +1,226 @@
+"""
+Ocupação por bitmap: a semana (domingo 00:00 a sábado 24:00) é dividida em
+slots de 15 min, 672 bits = 84 bytes por campo.
+
+- disponível: bits das janelas semanais de Availability (iguais toda semana)
+- reservado: bits das Bookings ativas do campo naquela semana
+
+Os dois ficam em cache (TTLCache), carregados sob demanda em uma query por
+lote de campos. Escritas atualizam o cache deste processo: uma reserva nova
+faz OR nos bits; remoções e mudanças de disponibilidade invalidam a entrada.
+O TTL limita quanto tempo outro worker enxerga dados antigos.
+
+A conversão é conservadora: uma janela só libera os slots inteiramente
+dentro dela, e uma reserva ocupa todo slot que toca. A busca nunca devolve
+campo com conflito, mas pode deixar de fora quem só tem meio slot livre.
+"""
+from datetime import datetime, timedelta
+
+import numpy as np
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.cache import TTLCache
+from core.config import settings
+from models import Availability, Booking, Field
+from services.slot_service import INACTIVE_BOOKING_STATUSES
+from services.sports_center_service import get_nearby_sports_centers_service
+
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+SLOTS_PER_WEEK = 7 * SLOTS_PER_DAY
+_SLOT = timedelta(minutes=SLOT_MINUTES)
+_WEEK = timedelta(days=7)
+
+
+def week_start(dt: datetime) -> datetime:
+    """Domingo 00:00 da semana de `dt` (day_of_week 0 = domingo)."""
+    day = dt.replace(hour=0, minute=0, second=0, microsecond=0)
+    return day - timedelta(days=dt.isoweekday() % 7)
+
+
+def _floor_slot(delta: timedelta) -> int:
+    return delta // _SLOT
+
+
+def _ceil_slot(delta: timedelta) -> int:
+    return -(-delta // _SLOT)
+
+
+def availability_bits(windows) -> np.ndarray:
+    """[(day_of_week, início, fim)] -> bool[672]; janela após sábado volta ao domingo."""
+    bits = np.zeros(SLOTS_PER_WEEK, dtype=bool)
+    for dow, start, end in windows:
+        s = dow * SLOTS_PER_DAY + _ceil_slot(
+            timedelta(hours=start.hour, minutes=start.minute, seconds=start.second)
+        )
+        e = dow * SLOTS_PER_DAY + _floor_slot(
+            timedelta(hours=end.hour, minutes=end.minute, seconds=end.second)
+        )
+        if e <= s:  # atravessa a meia-noite
+            e += SLOTS_PER_DAY
+        idx = np.arange(s, e) % SLOTS_PER_WEEK
+        bits[idx] = True
+    return bits
+
+
+def booking_bits(intervals, week: datetime) -> np.ndarray:
+    """[(início, fim)] -> bool[672] dos slots tocados na semana `week`."""
+    bits = np.zeros(SLOTS_PER_WEEK, dtype=bool)
+    for start, end in intervals:
+        s = max(0, _floor_slot(start - week))
+        e = min(SLOTS_PER_WEEK, _ceil_slot(end - week))
+        if s < e:
+            bits[s:e] = True
+    return bits
+
+
+def interval_masks(start: datetime, end: datetime) -> list[tuple[datetime, np.ndarray]]:
+    """[start, end) em máscaras empacotadas por semana (pode cruzar semanas)."""
+    masks = []
+    week = week_start(start)
+    while week < end:
+        masks.append((week, np.packbits(booking_bits([(start, end)], week))))
+        week += _WEEK
+    return masks
+
+
+class OccupancyIndex:
+    def __init__(self, maxsize: int = 100_000, ttl: float = 60.0):
+        # field_id -> bits disponíveis; (field_id, semana) -> bits reservados
+        self.available = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.booked = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def _available_masks(self, db: AsyncSession, field_ids: list[int]):
+        masks = {f: self.available.get(f) for f in field_ids}
+        missing = [f for f, m in masks.items() if m is None]
+        if missing:
+            windows = {f: [] for f in missing}
+            result = await db.execute(
+                select(
+                    Availability.field_id,
+                    Availability.day_of_week,
+                    Availability.start_time,
+                    Availability.end_time,
+                ).where(Availability.field_id.in_(missing))
+            )
+            for field_id, dow, start, end in result:
+                windows[field_id].append((dow, start.time(), end.time()))
+            for field_id, field_windows in windows.items():
+                masks[field_id] = np.packbits(availability_bits(field_windows))
+                self.available.set(field_id, masks[field_id])
+        return np.stack([masks[f] for f in field_ids])
+
+    async def _booked_masks(self, db: AsyncSession, field_ids: list[int], week: datetime):
+        masks = {f: self.booked.get((f, week)) for f in field_ids}
+        missing = [f for f, m in masks.items() if m is None]
+        if missing:
+            intervals = {f: [] for f in missing}
+            result = await db.execute(
+                select(Booking.field_id, Booking.start_time, Booking.end_time).where(
+                    Booking.field_id.in_(missing),
+                    Booking.start_time < week + _WEEK,
+                    Booking.end_time > week,
+                    or_(
+                        Booking.status.is_(None),
+                        Booking.status.not_in(INACTIVE_BOOKING_STATUSES),
+                    ),
+                )
+            )
+            for field_id, start, end in result:
+                intervals[field_id].append((start, end))
+            for field_id, field_intervals in intervals.items():
+                masks[field_id] = np.packbits(booking_bits(field_intervals, week))
+                self.booked.set((field_id, week), masks[field_id])
+        return np.stack([masks[f] for f in field_ids])
+
+    async def free_fields(
+        self, db: AsyncSession, field_ids: list[int], start: datetime, end: datetime
+    ) -> list[int]:
+        """Campos (de `field_ids`) disponíveis e sem reserva em todo [start, end)."""
+        if not field_ids:
+            return []
+        available = await self._available_masks(db, field_ids)
+        free = np.ones(len(field_ids), dtype=bool)
+        for week, query in interval_masks(start, end):
+            booked = await self._booked_masks(db, field_ids, week)
+            # Slot livre = disponível AND NOT reservado; todos os da query livres
+            open_slots = available & ~booked
+            free &= ((open_slots & query) == query).all(axis=1)
+        return [f for f, ok in zip(field_ids, free.tolist()) if ok]
+
+    # Manutenção incremental (chamada pelos serviços após o commit)
+
+    def booking_added(self, field_id: int, start: datetime, end: datetime) -> None:
+        for week, mask in interval_masks(start, end):
+            current = self.booked.get((field_id, week))
+            if current is not None:
+                self.booked.set((field_id, week), current | mask)
+
+    def booking_removed(self, field_id: int, start: datetime, end: datetime) -> None:
+        # Slots podem ser compartilhados com reservas vizinhas: recarrega
+        for week, _ in interval_masks(start, end):
+            self.booked.invalidate((field_id, week))
+
+    def availability_changed(self, field_id: int) -> None:
+        self.available.invalidate(field_id)
+
+    def clear(self) -> None:
+        self.available.clear()
+        self.booked.clear()
+
+    def stats(self) -> dict:
+        return {"available": self.available.stats(), "booked": self.booked.stats()}
+
+
+occupancy_index = OccupancyIndex(
+    maxsize=settings.OCCUPANCY_CACHE_SIZE, ttl=settings.OCCUPANCY_CACHE_TTL_SECONDS
+)
+
+
+# Centros considerados por busca (os mais próximos primeiro)
+MAX_SEARCH_CENTERS = 500
+
+
+async def search_free_fields_service(
+    db: AsyncSession,
+    lat: float,
+    lon: float,
+    radius_km: float,
+    start: datetime,
+    end: datetime,
+    field_type: str | None = None,
+    limit: int = 50,
+) -> list[dict]:
+    """Campos livres em [start, end) nos centros do raio, do mais perto ao mais longe."""
+    nearby = await get_nearby_sports_centers_service(
+        db, lat, lon, radius_km, MAX_SEARCH_CENTERS
+    )
+    if not nearby:
+        return []
+    centers = {center.id: (center, distance) for center, distance in nearby}
+
+    query = select(Field.id, Field.name, Field.field_type, Field.sports_center_id).where(
+        Field.sports_center_id.in_(list(centers))
+    )
+    if field_type:
+        query = query.where(Field.field_type == field_type)
+    fields = {row.id: row for row in (await db.execute(query))}
+
+    free_ids = await occupancy_index.free_fields(db, list(fields), start, end)
+    results = []
+    for field_id in free_ids:
+        field = fields[field_id]
+        center, distance = centers[field.sports_center_id]
+        results.append(
+            {
+                "field_id": field_id,
+                "field_name": field.name,
+                "field_type": field.field_type,
+                "sports_center_id": center.id,
+                "sports_center_name": center.name,
+                "distance_km": round(distance, 3),
+            }
+        )
+    results.sort(key=lambda r: (r["distance_km"], r["field_id"]))
+    return results[:limit]
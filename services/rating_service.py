@@ -0,0 +1,89 @@
+"""
+Agregado de avaliações por centro esportivo: quantidade, soma e histograma
+por estrela, em colunas de sports_centers. Ler a média de um centro não
+custa query extra; cada review criada/removida ajusta as colunas com um
+UPDATE de incremento na mesma transação (atômico no banco, sem corrida).
+
+`recompute_ratings` recalcula tudo a partir de reviews, em lotes; use
+`python -m scripts.recompute_ratings` para reparar divergências.
+"""
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import SportsCenter
+from core.entity_cache import entity_cache, entity_tag
+from models.models import Review
+
+STARS = range(1, 6)
+AGGREGATE_COLUMNS = ("rating_count", "rating_sum", *(f"stars_{s}" for s in STARS))
+
+
+def rating_delta(sports_center_id: int, rating: int, sign: int):
+    """UPDATE que soma (sign=1) ou subtrai (sign=-1) uma review do agregado."""
+    star = getattr(SportsCenter, f"stars_{rating}")
+    return (
+        update(SportsCenter)
+        .where(SportsCenter.id == sports_center_id)
+        .values(
+            {
+                SportsCenter.rating_count: SportsCenter.rating_count + sign,
+                SportsCenter.rating_sum: SportsCenter.rating_sum + sign * rating,
+                star: star + sign,
+                SportsCenter.version: SportsCenter.version + 1,
+            }
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def recompute_ratings(db: AsyncSession, batch_size: int = 1000) -> int:
+    """Recalcula os agregados de todos os centros; devolve quantos estavam errados."""
+    columns = [getattr(SportsCenter, c) for c in AGGREGATE_COLUMNS]
+    last_id, fixed = 0, 0
+    while True:
+        current = (
+            await db.execute(
+                select(SportsCenter.id, *columns)
+                .where(SportsCenter.id > last_id)
+                .order_by(SportsCenter.id)
+                .limit(batch_size)
+            )
+        ).all()
+        if not current:
+            return fixed
+        last_id = current[-1].id
+
+        counts = await db.execute(
+            select(Review.sports_center_id, Review.rating, func.count())
+            .where(Review.sports_center_id.in_([row.id for row in current]))
+            .group_by(Review.sports_center_id, Review.rating)
+        )
+        expected = {row.id: dict.fromkeys(AGGREGATE_COLUMNS, 0) for row in current}
+        for center_id, rating, n in counts:
+            aggregate = expected[center_id]
+            aggregate["rating_count"] += n
+            aggregate["rating_sum"] += rating * n
+            aggregate[f"stars_{rating}"] += n
+
+        rows = [
+            {"b_id": row.id, **{f"b_{c}": v for c, v in expected[row.id].items()}}
+            for row in current
+            if tuple(row[1:]) != tuple(expected[row.id].values())
+        ]
+        if rows:
+            # executemany por chave primária; a versão (ETag) sobe no mesmo UPDATE
+            table = SportsCenter.__table__
+            await db.execute(
+                update(table)
+                .where(table.c.id == bindparam("b_id"))
+                .values(
+                    {c: bindparam(f"b_{c}") for c in AGGREGATE_COLUMNS}
+                    | {"version": table.c.version + 1}
+                ),
+                rows,
+            )
+        await db.commit()
+        await entity_cache.invalidate(
+            *(entity_tag(SportsCenter, row["b_id"]) for row in rows)
+        )
+        fixed += len(rows)
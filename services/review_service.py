@@ -1,29 +1,67 @@
-from sqlalchemy.orm import Session
-from models.models import Review
+import uuid
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.entity_cache import entity_cache, entity_tag
+from models.models import Review, SportsCenter
 from schemas.review_schemas import ReviewCreate
+from services.rating_service import rating_delta
+from utils.pagination import DEFAULT_PAGE_SIZE, keyset
 
 
-def create_review_service(db: Session, data: ReviewCreate) -> int:
+async def create_review_service(db: AsyncSession, data: ReviewCreate) -> int:
     """Cria uma nova review no banco."""
 
-    # Cria a nova review
-    new_review = Review(**data.dict())
-    db.add(new_review)
-    db.commit()
-    db.refresh(new_review)
-    return new_review.id
+    # Soma a nota ao agregado do centro e insere a review, no mesmo commit;
+    # o UPDATE sem linha afetada indica centro inexistente
+    result = await db.execute(rating_delta(data.sports_center_id, data.rating, 1))
+    if result.rowcount == 0:
+        await db.rollback()
+        raise ValueError("Centro esportivo não encontrado.")
+    values = data.model_dump()
+    values["user_id"] = uuid.UUID(str(values["user_id"]))
+    new_id = (
+        await db.execute(insert(Review).values(**values).returning(Review.id))
+    ).scalar_one()
+    await db.commit()
+    await entity_cache.invalidate(entity_tag(SportsCenter, data.sports_center_id))
+    return new_id
 
 
-def get_review_by_id(db: Session, review_id: int) -> Review | None:
+async def get_review_by_id(db: AsyncSession, review_id: int) -> Review | None:
     """Retorna uma review pelo ID, ou None se não existir."""
-    return db.query(Review).filter_by(id=review_id).first()
+    return await db.get(Review, review_id)
+
+
+async def get_reviews_by_sports_center_service(
+    db: AsyncSession,
+    sports_center_id: int,
+    limit: int = DEFAULT_PAGE_SIZE,
+    after: tuple | None = None,
+    ratings: list[int] | None = None,
+) -> list[Review]:
+    """Reviews de um centro, mais novas primeiro (até limit + 1); `ratings` filtra."""
+    query = select(Review).where(Review.sports_center_id == sports_center_id)
+    if ratings:
+        query = query.where(Review.rating.in_(set(ratings)))
+    result = await db.execute(
+        keyset(query, (Review.created_at, Review.id), after, descending=True, limit=limit)
+    )
+    return result.scalars().all()
 
 
-def delete_review_by_id(db: Session, review_id: int) -> None:
+async def delete_review_by_id(db: AsyncSession, review_id: int) -> None:
     """Deleta uma review pelo ID. Lança ValueError se não existir."""
-    review = get_review_by_id(db, review_id)
-    if not review:
+    deleted = (
+        await db.execute(
+            delete(Review)
+            .where(Review.id == review_id)
+            .returning(Review.sports_center_id, Review.rating)
+        )
+    ).one_or_none()
+    if deleted is None:
         raise ValueError("Review não encontrada")
 
-    db.delete(review)
-    db.commit()
+    await db.execute(rating_delta(deleted.sports_center_id, deleted.rating, -1))
+    await db.commit()
+    await entity_cache.invalidate(entity_tag(SportsCenter, deleted.sports_center_id))
@@ -0,0 +1,181 @@
+"""
+Horários livres por campo: janelas semanais de Availability expandidas no
+intervalo pedido, menos as Bookings ativas.
+
+O cálculo é todo em arrays NumPy (segundos desde a época). Cada campo é
+deslocado por `_FIELD_OFFSET` na mesma linha do tempo, então um único
+sort + cumsum resolve centenas de campos de uma vez:
+
+    cobertura_disp = cumsum(+1 no início / -1 no fim das janelas)
+    cobertura_res  = cumsum(+1 no início / -1 no fim das reservas)
+    livre          = cobertura_disp > 0 e cobertura_res == 0
+"""
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+import numpy as np
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import Availability, Booking
+
+DAY = 86400
+# Maior que qualquer timestamp em segundos: campos não se misturam
+_FIELD_OFFSET = np.int64(1 << 40)
+_EPOCH = datetime(1970, 1, 1)
+_SECOND = timedelta(seconds=1)
+
+# Reservas que não ocupam o campo
+INACTIVE_BOOKING_STATUSES = ("cancelled",)
+
+MAX_RANGE_DAYS = 366
+
+
+def _seconds(dt: datetime) -> int:
+    return (dt - _EPOCH) // _SECOND
+
+
+def _time_seconds(t: time) -> int:
+    return t.hour * 3600 + t.minute * 60 + t.second
+
+
+def _expand_windows(
+    windows: list[tuple[int, time, time]], first_day: int, n_days: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Janelas semanais -> intervalos concretos a partir de `first_day` (s)."""
+    day_starts = first_day + DAY * np.arange(n_days, dtype=np.int64)
+    # day_of_week: 0 = domingo; 01/01/1970 foi quinta-feira (4)
+    dows = (day_starts // DAY + 4) % 7
+    starts, ends = [], []
+    for dow, start, end in windows:
+        days = day_starts[dows == dow]
+        s, e = _time_seconds(start), _time_seconds(end)
+        if e <= s:  # atravessa a meia-noite
+            e += DAY
+        starts.append(days + s)
+        ends.append(days + e)
+    if not starts:
+        return np.empty(0, np.int64), np.empty(0, np.int64)
+    return np.concatenate(starts), np.concatenate(ends)
+
+
+def compute_free_slots(
+    windows: dict[int, list[tuple[int, time, time]]],
+    busy: dict[int, list[tuple[datetime, datetime]]],
+    range_start: datetime,
+    range_end: datetime,
+    min_duration: timedelta,
+) -> dict[int, list[tuple[datetime, datetime]]]:
+    """
+    Intervalos livres (máximos, com pelo menos `min_duration`) de cada campo
+    em [range_start, range_end).
+
+    - windows: field_id -> [(day_of_week, início, fim)] (0 = domingo)
+    - busy: field_id -> [(início, fim)] das reservas
+    """
+    field_ids = sorted(windows)
+    rs, re_ = _seconds(range_start), _seconds(range_end)
+    # Começa um dia antes: janela que atravessa a meia-noite pode invadir o range
+    first_day = (rs // DAY - 1) * DAY
+    n_days = (re_ - first_day) // DAY + 1
+
+    a_starts, a_ends, b_starts, b_ends = [], [], [], []
+    for k, field_id in enumerate(field_ids):
+        offset = _FIELD_OFFSET * k
+        s, e = _expand_windows(windows[field_id], first_day, n_days)
+        s, e = np.maximum(s, rs), np.minimum(e, re_)
+        keep = s < e
+        a_starts.append(s[keep] + offset)
+        a_ends.append(e[keep] + offset)
+        intervals = busy.get(field_id)
+        if intervals:
+            # np.array(..., "datetime64") é ~6x mais lento que a conta inline
+            b = np.fromiter(
+                ((t - _EPOCH) // _SECOND for pair in intervals for t in pair),
+                np.int64,
+                count=2 * len(intervals),
+            )
+            b_starts.append(b[0::2] + offset)
+            b_ends.append(b[1::2] + offset)
+
+    result: dict[int, list[tuple[datetime, datetime]]] = {f: [] for f in field_ids}
+    if not a_starts:
+        return result
+
+    a_s, a_e = np.concatenate(a_starts), np.concatenate(a_ends)
+    b_s = np.concatenate(b_starts) if b_starts else np.empty(0, np.int64)
+    b_e = np.concatenate(b_ends) if b_ends else np.empty(0, np.int64)
+    if not len(a_s):
+        return result
+
+    times = np.concatenate((a_s, a_e, b_s, b_e))
+    n_a, n_b = len(a_s), len(b_s)
+    d_avail = np.zeros(len(times), np.int32)
+    d_avail[:n_a], d_avail[n_a : 2 * n_a] = 1, -1
+    d_busy = np.zeros(len(times), np.int32)
+    d_busy[2 * n_a : 2 * n_a + n_b], d_busy[2 * n_a + n_b :] = 1, -1
+
+    # Soma os deltas de cada instante e acumula a cobertura
+    order = np.argsort(times, kind="stable")
+    times = times[order]
+    bounds = np.flatnonzero(np.r_[True, times[1:] != times[:-1]])
+    instants = times[bounds]
+    avail = np.cumsum(np.add.reduceat(d_avail[order], bounds))
+    booked = np.cumsum(np.add.reduceat(d_busy[order], bounds))
+
+    # Segmento i = [instants[i], instants[i+1]); runs de segmentos livres
+    free = (avail > 0) & (booked <= 0)
+    edges = np.diff(np.r_[0, free.astype(np.int8), 0])
+    run_starts = instants[np.flatnonzero(edges == 1)]
+    run_ends = instants[np.minimum(np.flatnonzero(edges == -1), len(instants) - 1)]
+
+    long_enough = (run_ends - run_starts) >= min_duration // _SECOND
+    run_starts, run_ends = run_starts[long_enough], run_ends[long_enough]
+    fields = run_starts // _FIELD_OFFSET
+    local_starts = (run_starts - fields * _FIELD_OFFSET).astype("datetime64[s]")
+    local_ends = (run_ends - fields * _FIELD_OFFSET).astype("datetime64[s]")
+    # Fatia os resultados por campo (já ordenados por campo e início)
+    cuts = np.searchsorted(fields, np.arange(len(field_ids) + 1))
+    starts_list, ends_list = local_starts.tolist(), local_ends.tolist()
+    for k, field_id in enumerate(field_ids):
+        lo, hi = cuts[k], cuts[k + 1]
+        result[field_id] = list(zip(starts_list[lo:hi], ends_list[lo:hi]))
+    return result
+
+
+async def get_free_slots_service(
+    db: AsyncSession,
+    field_ids: list[int],
+    range_start: datetime,
+    range_end: datetime,
+    min_duration: timedelta,
+) -> dict[int, list[tuple[datetime, datetime]]]:
+    """Carrega disponibilidades e reservas dos campos (2 queries) e calcula."""
+    windows: dict[int, list] = {f: [] for f in field_ids}
+    result = await db.execute(
+        select(
+            Availability.field_id,
+            Availability.day_of_week,
+            Availability.start_time,
+            Availability.end_time,
+        ).where(Availability.field_id.in_(field_ids))
+    )
+    for field_id, dow, start, end in result:
+        windows[field_id].append((dow, start.time(), end.time()))
+
+    busy: dict[int, list] = defaultdict(list)
+    result = await db.execute(
+        select(Booking.field_id, Booking.start_time, Booking.end_time).where(
+            Booking.field_id.in_(field_ids),
+            Booking.start_time < range_end,
+            Booking.end_time > range_start,
+            or_(
+                Booking.status.is_(None),
+                Booking.status.not_in(INACTIVE_BOOKING_STATUSES),
+            ),
+        )
+    )
+    for field_id, start, end in result:
+        busy[field_id].append((start, end))
+
+    return compute_free_slots(windows, busy, range_start, range_end, min_duration)
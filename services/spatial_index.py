@@ -0,0 +1,332 @@
+"""
+Índice espacial em memória (KD-tree sobre arrays NumPy) das coordenadas dos
+centros esportivos. Opcional: ligado por SPATIAL_INDEX_ENABLED; desligado,
+as buscas seguem pelo SQL.
+
+A árvore é estática; escritas entram num buffer (`_delta`) e em tombstones
+(`_removed`), e a árvore é reconstruída (fora do event loop) quando o buffer
+cresce demais. Escritas que chegam enquanto uma árvore nova está sendo
+construída são anotadas e reaplicadas depois da troca. Com vários workers,
+cada processo só vê as próprias escritas até o próximo `load()` (ver
+SPATIAL_INDEX_REFRESH_SECONDS).
+"""
+import asyncio
+import logging
+import math
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from models import SportsCenter
+from utils.geo import EARTH_RADIUS_KM, bounding_box
+
+logger = logging.getLogger(__name__)
+
+LEAF_SIZE = 64
+
+
+class _KDTree:
+    """KD-tree 2D (lat, lon); cada nó guarda a faixa [start, end) e sua caixa."""
+
+    def __init__(self, ids, lats, lons):
+        n = len(ids)
+        self.ids = ids
+        self.points = np.column_stack((lats, lons)) if n else np.empty((0, 2))
+        self.start: list[int] = []
+        self.end: list[int] = []
+        self.left: list[int] = []
+        self.right: list[int] = []
+        self.boxes: list[tuple[float, float, float, float]] = []
+        if n:
+            self._build(0, n)
+
+    def _build(self, start: int, end: int) -> int:
+        node = len(self.start)
+        pts = self.points[start:end]
+        mins, maxs = pts.min(axis=0), pts.max(axis=0)
+        self.start.append(start)
+        self.end.append(end)
+        self.boxes.append((mins[0], maxs[0], mins[1], maxs[1]))
+        self.left.append(-1)
+        self.right.append(-1)
+        if end - start <= LEAF_SIZE:
+            return node
+
+        # Divide na mediana da dimensão mais espalhada
+        dim = int(np.argmax(maxs - mins))
+        mid = (end - start) // 2
+        order = np.argpartition(pts[:, dim], mid)
+        self.points[start:end] = pts[order]
+        self.ids[start:end] = self.ids[start:end][order]
+
+        self.left[node] = self._build(start, start + mid)
+        self.right[node] = self._build(start + mid, end)
+        return node
+
+    def query_box(self, lat_min, lat_max, lon_min, lon_max):
+        """Posições (em ids/points) dos pontos dentro da caixa."""
+        if not self.start:
+            return np.empty(0, dtype=np.int64)
+        found = []
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            b_lat_min, b_lat_max, b_lon_min, b_lon_max = self.boxes[node]
+            if (
+                b_lat_min > lat_max
+                or b_lat_max < lat_min
+                or b_lon_min > lon_max
+                or b_lon_max < lon_min
+            ):
+                continue
+            start, end = self.start[node], self.end[node]
+            if (
+                lat_min <= b_lat_min
+                and b_lat_max <= lat_max
+                and lon_min <= b_lon_min
+                and b_lon_max <= lon_max
+            ):
+                found.append(np.arange(start, end))
+            elif self.left[node] == -1:
+                inside = _in_box(self.points[start:end], lat_min, lat_max, lon_min, lon_max)
+                found.append(start + np.flatnonzero(inside))
+            else:
+                stack.append(self.left[node])
+                stack.append(self.right[node])
+        return np.concatenate(found) if found else np.empty(0, dtype=np.int64)
+
+
+def _in_box(points, lat_min, lat_max, lon_min, lon_max):
+    return (
+        (points[:, 0] >= lat_min)
+        & (points[:, 0] <= lat_max)
+        & (points[:, 1] >= lon_min)
+        & (points[:, 1] <= lon_max)
+    )
+
+
+def _haversine_km(lat, lon, lats, lons):
+    phi1 = math.radians(lat)
+    phi2 = np.radians(lats)
+    dphi = phi2 - phi1
+    dlmb = np.radians(lons - lon)
+    a = np.sin(dphi / 2) ** 2 + math.cos(phi1) * np.cos(phi2) * np.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class SpatialIndex:
+    def __init__(self, min_rebuild: int = 1024, rebuild_ratio: float = 0.05):
+        self.min_rebuild = min_rebuild
+        self.rebuild_ratio = rebuild_ratio
+        self._generation = 0
+        self.clear()
+
+    def clear(self) -> None:
+        self.ready = False
+        self._tree = None
+        self._coords: dict[int, tuple[float, float]] = {}
+        self._delta: dict[int, tuple[float, float]] = {}
+        self._removed: set[int] = set()
+        self._delta_arrays = None
+        # Escritas recebidas durante cada construção em andamento; as
+        # construções já iniciadas são descartadas ao terminar
+        self._journals: list[list[tuple[int, tuple[float, float] | None]]] = []
+        self._built_generation = self._generation
+        self._rebuild_task: asyncio.Task | None = None
+
+    def __len__(self) -> int:
+        return len(self._coords)
+
+    # Carga / manutenção
+
+    @staticmethod
+    def _make_tree(points: dict[int, tuple[float, float]]) -> _KDTree:
+        ids = np.fromiter(points.keys(), dtype=np.int64, count=len(points))
+        coords = np.array(list(points.values()), dtype=np.float64).reshape(-1, 2)
+        return _KDTree(ids, coords[:, 0].copy(), coords[:, 1].copy())
+
+    def build(self, points: dict[int, tuple[float, float]], tree=None) -> None:
+        self._coords = dict(points)
+        self._tree = tree if tree is not None else self._make_tree(self._coords)
+        self._delta = {}
+        self._removed = set()
+        self._delta_arrays = None
+        self.ready = True
+
+    def _begin(self) -> tuple[int, list]:
+        self._generation += 1
+        journal: list = []
+        self._journals.append(journal)
+        return self._generation, journal
+
+    def _end(self, journal: list) -> None:
+        # Por identidade: listas vazias são iguais entre si
+        self._journals = [j for j in self._journals if j is not journal]
+
+    def _swap(self, generation: int, journal: list, points, tree) -> bool:
+        """Troca a árvore e reaplica as escritas feitas durante a construção."""
+        self._end(journal)
+        if generation <= self._built_generation:
+            # Uma construção iniciada depois (ou um clear) já passou na frente
+            return False
+        self._built_generation = generation
+        self.build(points, tree)
+        for sports_center_id, point in journal:
+            if point is None:
+                self._remove(sports_center_id)
+            else:
+                self._upsert(sports_center_id, *point)
+        return True
+
+    async def load(self, session: AsyncSession) -> None:
+        """(Re)constrói a árvore com todos os centros do banco."""
+        # O registro começa antes do SELECT: escritas commitadas durante a
+        # consulta podem ou não estar no resultado, e reaplicá-las é idempotente
+        generation, journal = self._begin()
+        try:
+            result = await session.execute(
+                select(SportsCenter.id, SportsCenter.latitude, SportsCenter.longitude)
+            )
+            points = {id_: (float(lat), float(lon)) for id_, lat, lon in result}
+            # Constrói a árvore fora do event loop e troca de uma vez no loop
+            tree = await asyncio.to_thread(self._make_tree, points)
+        except BaseException:
+            self._end(journal)
+            raise
+        if self._swap(generation, journal, points, tree):
+            logger.info("índice espacial carregado com %d centros", len(points))
+
+    async def _rebuild(self) -> None:
+        generation, journal = self._begin()
+        points = dict(self._coords)
+        try:
+            tree = await asyncio.to_thread(self._make_tree, points)
+        except BaseException:
+            self._end(journal)
+            raise
+        self._swap(generation, journal, points, tree)
+
+    def upsert(self, sports_center_id: int, lat: float, lon: float) -> None:
+        point = (float(lat), float(lon))
+        for journal in self._journals:
+            journal.append((sports_center_id, point))
+        if self.ready:
+            self._upsert(sports_center_id, *point)
+            self._maybe_rebuild()
+
+    def remove(self, sports_center_id: int) -> None:
+        for journal in self._journals:
+            journal.append((sports_center_id, None))
+        if self.ready:
+            self._remove(sports_center_id)
+            self._maybe_rebuild()
+
+    def _upsert(self, sports_center_id: int, lat: float, lon: float) -> None:
+        point = (lat, lon)
+        if self._coords.get(sports_center_id) == point:
+            return
+        # A posição antiga (se estava na árvore) passa a ser ignorada
+        self._removed.add(sports_center_id)
+        self._coords[sports_center_id] = point
+        self._delta[sports_center_id] = point
+        self._delta_arrays = None
+
+    def _remove(self, sports_center_id: int) -> None:
+        if sports_center_id not in self._coords:
+            return
+        del self._coords[sports_center_id]
+        self._delta.pop(sports_center_id, None)
+        self._removed.add(sports_center_id)
+        self._delta_arrays = None
+
+    def _maybe_rebuild(self) -> None:
+        # Toda escrita marca o id em _removed: é a contagem de ids pendentes
+        pending = len(self._removed)
+        if pending < max(self.min_rebuild, int(len(self._coords) * self.rebuild_ratio)):
+            return
+        if self._rebuild_task is not None and not self._rebuild_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Fora do event loop (scripts, testes): não há o que bloquear
+            self.build(self._coords)
+            return
+        # Reconstrói numa thread; as consultas seguem na árvore antiga + buffer
+        self._rebuild_task = loop.create_task(self._rebuild())
+
+    # Consultas
+
+    def _delta_points(self):
+        # Arrays do buffer, refeitos só depois de uma escrita
+        if self._delta_arrays is None:
+            ids = np.fromiter(self._delta.keys(), dtype=np.int64, count=len(self._delta))
+            coords = np.array(list(self._delta.values()), dtype=np.float64).reshape(-1, 2)
+            removed = np.fromiter(self._removed, dtype=np.int64, count=len(self._removed))
+            self._delta_arrays = (ids, coords, removed)
+        return self._delta_arrays
+
+    def _query(self, lat_min, lat_max, lon_min, lon_max):
+        tree = self._tree
+        pos = tree.query_box(lat_min, lat_max, lon_min, lon_max)
+        ids, points = tree.ids[pos], tree.points[pos]
+        if not self._removed:
+            return ids, points
+
+        delta_ids, delta_points, removed = self._delta_points()
+        keep = ~np.isin(ids, removed)
+        ids, points = ids[keep], points[keep]
+        if len(delta_ids):
+            mask = _in_box(delta_points, lat_min, lat_max, lon_min, lon_max)
+            ids = np.concatenate((ids, delta_ids[mask]))
+            points = np.concatenate((points, delta_points[mask]))
+        return ids, points
+
+    def query_box(self, lat_min, lat_max, lon_min, lon_max) -> list[int]:
+        """ids dos centros dentro da caixa."""
+        ids, _ = self._query(lat_min, lat_max, lon_min, lon_max)
+        return ids.tolist()
+
+    def nearby(self, lat: float, lon: float, radius_km: float, limit: int):
+        """[(id, distância_km)] dentro do raio, do mais perto ao mais longe."""
+        ids, points = self._query(*bounding_box(lat, lon, radius_km))
+        if not len(ids):
+            return []
+        distances = _haversine_km(lat, lon, points[:, 0], points[:, 1])
+        inside = np.flatnonzero(distances <= radius_km)
+        if len(inside) > limit:
+            inside = inside[np.argpartition(distances[inside], limit - 1)[:limit]]
+        inside = inside[np.argsort(distances[inside], kind="stable")]
+        return [(int(ids[i]), float(distances[i])) for i in inside]
+
+
+spatial_index = SpatialIndex()
+
+
+async def _refresh_periodically(sessionmaker, interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with sessionmaker() as session:
+                await spatial_index.load(session)
+        except Exception:
+            logger.exception("falha ao recarregar o índice espacial")
+
+
+async def start_spatial_index(sessionmaker) -> asyncio.Task | None:
+    """
+    Carrega o índice no startup (se habilitado) e, com
+    SPATIAL_INDEX_REFRESH_SECONDS > 0, devolve a task que o recarrega.
+    """
+    if not settings.SPATIAL_INDEX_ENABLED:
+        return None
+
+    async with sessionmaker() as session:
+        await spatial_index.load(session)
+    if settings.SPATIAL_INDEX_REFRESH_SECONDS > 0:
+        return asyncio.create_task(
+            _refresh_periodically(sessionmaker, settings.SPATIAL_INDEX_REFRESH_SECONDS)
+        )
+    return None
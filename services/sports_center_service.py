@@ -1,71 +1,196 @@
-from sqlalchemy.orm import Session
-from models import SportsCenter
+import uuid
+from bisect import bisect_right
+
+from sqlalchemy import delete, insert, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.entity_cache import entity_cache, entity_tag, owner_tag
+from models import Field, SportsCenter, User
 from schemas.sports_center_schemas import SportsCenterCreate
-
-
-# CRUD
-def create_sports_center_service(db: Session, data: SportsCenterCreate) -> int:
+from services.spatial_index import spatial_index
+from utils.geo import (
+    bounding_box,
+    covering_cells,
+    geohash_encode,
+    haversine_km,
+    prefix_range,
+)
+from utils.pagination import DEFAULT_PAGE_SIZE, keyset
+from utils.returning import is_unique_violation, update_returning
+
+# ids por SELECT ... IN (...) ao resolver consultas pelo índice espacial
+_ID_BATCH = 5000
+
+
+# CRUD: cada escrita é um statement com RETURNING
+async def create_sports_center_service(
+    db: AsyncSession, data: SportsCenterCreate
+) -> int:
     """Cria um novo centro esportivo no banco."""
-
-    # Verifica se já existe um centro esportivo com o mesmo CNPJ
-    sports_center = db.query(SportsCenter).filter_by(cnpj=data.cnpj).first()
-
-    # Se existir, lança um erro
-    if sports_center:
-        raise ValueError("CNPJ já cadastrado")
-
-    # Cria o novo centro esportivo
-    new_sports_center = SportsCenter(**data.dict())
-    db.add(new_sports_center)
-    db.commit()
-    db.refresh(new_sports_center)
-    return new_sports_center.id
-
-
-def get_sports_center_by_id_service(
-    db: Session, sports_center_id: int
+    values = data.model_dump()
+    values["user_id"] = uuid.UUID(str(data.user_id))
+    values["geohash"] = geohash_encode(data.latitude, data.longitude)
+
+    # Sem SELECT prévio: o unique de cnpj rejeita a duplicata
+    try:
+        new_id = (
+            await db.execute(
+                insert(SportsCenter).values(**values).returning(SportsCenter.id)
+            )
+        ).scalar_one()
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        if is_unique_violation(e, "sports_centers", ("cnpj",)):
+            raise ValueError("CNPJ já cadastrado")
+        raise
+    spatial_index.upsert(new_id, data.latitude, data.longitude)
+    return new_id
+
+
+async def get_sports_center_by_id_service(
+    db: AsyncSession, sports_center_id: int
 ) -> SportsCenter | None:
-    """Retorna um centro esportivo pelo ID, ou None se não existir."""
-    return db.query(SportsCenter).filter_by(id=sports_center_id).first()
+    """Retorna um centro esportivo pelo ID, ou None se não existir (com cache)."""
+    return await entity_cache.get(
+        SportsCenter,
+        sports_center_id,
+        lambda: db.get(SportsCenter, sports_center_id),
+        owner=(User, "user_id"),
+    )
 
 
-def get_all_sports_centers_by_user_id_service(
-    db: Session, owner_id: int
+async def get_all_sports_centers_by_user_id_service(
+    db: AsyncSession,
+    owner_id,
+    limit: int = DEFAULT_PAGE_SIZE,
+    after_id: int | None = None,
 ) -> list[SportsCenter]:
-    """Retorna todos os centros esportivos de um dono."""
-    return db.query(SportsCenter).filter_by(user_id=owner_id).all()
-
-
-def get_sports_center_by_city_service(
-    session: Session, lat_min: float, lat_max: float, lon_min: float, lon_max: float
+    """
+    Centros esportivos de um dono em ordem de id, a partir de `after_id`.
+    Traz até limit + 1: o excedente indica que há outra página.
+    """
+    query = select(SportsCenter).filter_by(user_id=owner_id)
+    after = None if after_id is None else (after_id,)
+    result = await db.execute(keyset(query, (SportsCenter.id,), after, limit=limit))
+    return result.scalars().all()
+
+
+async def _get_sports_centers_by_ids(
+    session: AsyncSession, ids: list[int]
+) -> list[SportsCenter]:
+    """Carrega centros por id em lotes (limite de parâmetros do driver)."""
+    centers = []
+    for i in range(0, len(ids), _ID_BATCH):
+        result = await session.execute(
+            select(SportsCenter).where(SportsCenter.id.in_(ids[i : i + _ID_BATCH]))
+        )
+        centers.extend(result.scalars().all())
+    return centers
+
+
+async def get_sports_center_by_city_service(
+    session: AsyncSession,
+    lat_min: float,
+    lat_max: float,
+    lon_min: float,
+    lon_max: float,
+    limit: int = DEFAULT_PAGE_SIZE,
+    after_id: int | None = None,
 ):
-    """Retorna todos os centros esportivos em uma cidade."""
-    return (
-        session.query(SportsCenter)
-        .filter(SportsCenter.latitude.between(lat_min, lat_max))
-        .filter(SportsCenter.longitude.between(lon_min, lon_max))
-        .all()
+    """Centros esportivos em uma cidade em ordem de id (até limit + 1)."""
+    if spatial_index.ready:
+        ids = sorted(spatial_index.query_box(lat_min, lat_max, lon_min, lon_max))
+        if after_id is not None:
+            ids = ids[bisect_right(ids, after_id) :]
+        centers = await _get_sports_centers_by_ids(session, ids[: limit + 1])
+        return sorted(centers, key=lambda c: c.id)
+
+    query = (
+        select(SportsCenter)
+        .where(SportsCenter.latitude.between(lat_min, lat_max))
+        .where(SportsCenter.longitude.between(lon_min, lon_max))
+    )
+    after = None if after_id is None else (after_id,)
+    result = await session.execute(
+        keyset(query, (SportsCenter.id,), after, limit=limit)
+    )
+    return result.scalars().all()
+
+
+async def get_nearby_sports_centers_service(
+    session: AsyncSession,
+    lat: float,
+    lon: float,
+    radius_km: float,
+    limit: int,
+) -> list[tuple[SportsCenter, float]]:
+    """
+    Centros num raio de `radius_km` de (lat, lon), do mais próximo ao mais
+    distante, como pares (centro, distância em km).
+
+    As células de geohash que cobrem o círculo viram faixas no índice de
+    sports_centers.geohash; a distância exata é calculada só nos candidatos.
+    Com o índice em memória pronto, os ids vêm dele e o banco só carrega as
+    linhas.
+    """
+    if spatial_index.ready:
+        found = spatial_index.nearby(lat, lon, radius_km, limit)
+        centers = await _get_sports_centers_by_ids(session, [id_ for id_, _ in found])
+        by_id = {c.id: c for c in centers}
+        return [(by_id[id_], d) for id_, d in found if id_ in by_id]
+
+    lat_min, lat_max, lon_min, lon_max = bounding_box(lat, lon, radius_km)
+    cells = covering_cells(lat, lon, radius_km)
+    result = await session.execute(
+        select(SportsCenter)
+        .where(or_(*(SportsCenter.geohash.between(*prefix_range(c)) for c in cells)))
+        .where(SportsCenter.latitude.between(lat_min, lat_max))
+        .where(SportsCenter.longitude.between(lon_min, lon_max))
     )
 
-
-def update_sports_center_service(session, sports_center_id, update_data):
-    sports_center = get_sports_center_by_id_service(session, sports_center_id)
+    nearby = []
+    for center in result.scalars():
+        distance = haversine_km(lat, lon, float(center.latitude), float(center.longitude))
+        if distance <= radius_km:
+            nearby.append((center, distance))
+    nearby.sort(key=lambda item: item[1])
+    return nearby[:limit]
+
+
+async def update_sports_center_service(session, sports_center_id, update_data):
+    """UPDATE ... RETURNING do centro. Lança ValueError se não existir."""
+    values = update_data.model_dump(exclude_unset=True)
+    # O schema exige as duas coordenadas juntas: o geohash vai no mesmo UPDATE
+    if "latitude" in values:
+        values["geohash"] = geohash_encode(values["latitude"], values["longitude"])
+    sports_center, _ = await update_returning(
+        session, SportsCenter, sports_center_id, values
+    )
     if not sports_center:
         raise ValueError("Centro esportivo não encontrado.")
 
-    for key, value in update_data.dict(exclude_unset=True).items():
-        setattr(sports_center, key, value)
-
-    session.commit()
-    session.refresh(sports_center)
+    await session.commit()
+    await entity_cache.invalidate(entity_tag(SportsCenter, sports_center_id))
+    spatial_index.upsert(
+        sports_center.id, sports_center.latitude, sports_center.longitude
+    )
     return sports_center
 
 
-def delete_sports_center_by_id(db: Session, sports_center_id: int) -> None:
+async def delete_sports_center_by_id(db: AsyncSession, sports_center_id: int) -> None:
     """Deleta um centro esportivo pelo ID. Lança ValueError se não existir."""
-    sports_center = get_sports_center_by_id_service(db, sports_center_id)
-    if not sports_center:
+    result = await db.execute(
+        delete(SportsCenter)
+        .where(SportsCenter.id == sports_center_id)
+        .returning(SportsCenter.id)
+    )
+    if result.scalar_one_or_none() is None:
         raise ValueError("Centro esportivo não encontrado")
 
-    db.delete(sports_center)
-    db.commit()
+    await db.commit()
+    await entity_cache.invalidate(
+        entity_tag(SportsCenter, sports_center_id),
+        owner_tag(SportsCenter, sports_center_id, Field),
+    )
+    spatial_index.remove(sports_center_id)
@@ -1,18 +1,24 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
 
 from models.models import User
 from schemas.user_schemas import UserSignUp, UserUpdateMe
-from utils.security import get_password_hash, verify_password
+from utils.security import (
+    AuthPrincipal,
+    auth_user_cache,
+    get_password_hash_async,
+    verify_password_async,
+)
 
 
-def create_user(db: Session, user_in: UserSignUp) -> User:
+async def create_user(db: AsyncSession, user_in: UserSignUp) -> User:
     """
     Cria usuário confiando na UNIQUE constraint do banco (email/cpf).
     Evita SELECTs prévios e trata duplicidade via IntegrityError.
     """
-    hashed_password = get_password_hash(user_in.password)
+    hashed_password = await get_password_hash_async(user_in.password)
 
     user = User(
         name=user_in.name,
@@ -26,9 +32,9 @@ def create_user(db: Session, user_in: UserSignUp) -> User:
 
     db.add(user)
     try:
-        db.commit()
+        await db.commit()
     except IntegrityError as e:
-        db.rollback()
+        await db.rollback()
         constraint = getattr(getattr(e, "orig", None), "diag", None)
         c_name = getattr(constraint, "constraint_name", None)
 
@@ -50,18 +56,27 @@ def create_user(db: Session, user_in: UserSignUp) -> User:
             detail="Unique constraint violated",
         ) from e
 
-    db.refresh(user)
+    await db.refresh(user)
     return user
 
 
-def authenticate(db: Session, email: str, password: str) -> User | None:
-    user = db.query(User).filter(User.email == email).first()
-    if user and verify_password(password, user.hashed_password):
+async def authenticate(db: AsyncSession, email: str, password: str) -> User | None:
+    result = await db.execute(select(User).where(User.email == email))
+    user = result.scalars().first()
+    if user and await verify_password_async(password, user.hashed_password):
         return user
     return None
 
 
-def update_user_me(db: Session, user: User, payload: UserUpdateMe) -> User:
+async def update_user_me(
+    db: AsyncSession, principal: AuthPrincipal, payload: UserUpdateMe
+) -> User:
+    user = await db.get(User, principal.id)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+        )
+
     user.name = payload.name
     if payload.email is not None:
         user.email = payload.email
@@ -71,9 +86,9 @@ def update_user_me(db: Session, user: User, payload: UserUpdateMe) -> User:
         user.avatar = payload.avatar
 
     try:
-        db.commit()
+        await db.commit()
     except IntegrityError as e:
-        db.rollback()
+        await db.rollback()
         constraint = getattr(getattr(e, "orig", None), "diag", None)
         c_name = getattr(constraint, "constraint_name", None)
         msg = str(getattr(e, "orig", e)).lower()
@@ -89,24 +104,31 @@ def update_user_me(db: Session, user: User, payload: UserUpdateMe) -> User:
             detail="Unique constraint violated",
         ) from e
 
-    db.refresh(user)
+    auth_user_cache.invalidate(user.id)
+    await db.refresh(user)
     return user
 
 
-def deactivate_user_me(db: Session, user: User) -> None:
-    if not user.is_active:
+async def deactivate_user_me(db: AsyncSession, principal: AuthPrincipal) -> None:
+    if not principal.is_active:
         return
-    user.is_active = False
-    db.commit()
+    await db.execute(
+        update(User).where(User.id == principal.id).values(is_active=False)
+    )
+    await db.commit()
+    auth_user_cache.invalidate(principal.id)
 
 
-def hard_delete_user_me(db: Session, user: User) -> None:
-    db.delete(user)
+async def hard_delete_user_me(db: AsyncSession, principal: AuthPrincipal) -> None:
+    # O DELETE roda na hora (sem flush adiado): a violação de FK sobe aqui
     try:
-        db.commit()
+        await db.execute(delete(User).where(User.id == principal.id))
+        await db.commit()
     except IntegrityError as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot hard delete user due to related records (FK). Try soft delete instead.",
         ) from e
+
+    auth_user_cache.invalidate(principal.id)
@@ -1,5 +1,8 @@
+import asyncio
 import uuid
-from unittest.mock import MagicMock, patch
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
 from schemas.user_schemas import UserSignUp, UserSignIn
 from utils.security import get_password_hash, decode_access_token
 from models.models import User
@@ -11,7 +14,7 @@ API_PREFIX = "/api/v1"
 
 
 # Teste 1: create_user hash password
-@patch("services.user_service.get_password_hash")
+@patch("services.user_service.get_password_hash_async")
 def test_create_user_hash_password(mock_get_password_hash):
 
     mock_get_password_hash.return_value = "hashed_senha"
@@ -25,18 +28,19 @@ def test_create_user_hash_password(mock_get_password_hash):
     )
 
     mock_db = MagicMock()
-    mock_db.query.return_value.filter.return_value.first.return_value = None
+    mock_db.commit = AsyncMock()
+    mock_db.refresh = AsyncMock()
 
     from services.user_service import create_user
 
-    user = create_user(mock_db, user_in)
+    user = asyncio.run(create_user(mock_db, user_in))
 
     assert user.email == user_in.email
     assert user.hashed_password == "hashed_senha"
 
 
 # Teste 2: authenticate invalid password
-@patch("services.user_service.verify_password")
+@patch("services.user_service.verify_password_async")
 def test_authenticate_invalid_password(mock_verify):
     mock_verify.return_value = False
 
@@ -54,16 +58,19 @@ def test_authenticate_invalid_password(mock_verify):
     )
 
     mock_db = MagicMock()
-    mock_db.query.return_value.filter.return_value.first.return_value = mock_user
+    mock_db.execute = AsyncMock(return_value=MagicMock())
+    mock_db.execute.return_value.scalars.return_value.first.return_value = mock_user
 
     from services.user_service import authenticate
 
-    user = authenticate(mock_db, email="teste@example.com", password="SenhaErrada123!")
+    user = asyncio.run(
+        authenticate(mock_db, email="teste@example.com", password="SenhaErrada123!")
+    )
     assert user is None
 
 
 # Teste 3: authenticate valid password
-@patch("services.user_service.verify_password")
+@patch("services.user_service.verify_password_async")
 def test_authenticate_valid_password(mock_verify):
     mock_verify.return_value = True  # senha válida
 
@@ -83,12 +90,15 @@ def test_authenticate_valid_password(mock_verify):
 
     # Simula usuário existente no banco
     mock_db = MagicMock()
-    mock_db.query.return_value.filter.return_value.first.return_value = mock_user
+    mock_db.execute = AsyncMock(return_value=MagicMock())
+    mock_db.execute.return_value.scalars.return_value.first.return_value = mock_user
 
     from services.user_service import authenticate
 
     # Senha fornecida correta
-    user = authenticate(mock_db, email="teste@example.com", password="Senha123!")
+    user = asyncio.run(
+        authenticate(mock_db, email="teste@example.com", password="Senha123!")
+    )
 
     # Agora deve autenticar com sucesso e retornar o usuário
     assert user is not None
@@ -186,3 +196,213 @@ def test_delete_me_route_soft_default_204():
 
         mock_soft.assert_called_once()
         mock_hard.assert_not_called()
+
+
+# Teste 7: pool de hashing (processos) gera e verifica hash bcrypt
+def test_hashing_pool_hash_and_verify():
+    from utils.hashing import HashingPool
+
+    pool = HashingPool(workers=1, queue_depth=1, timeout=30)
+
+    async def _run():
+        hashed = await pool.hash("Senha123!")
+        ok = await pool.verify("Senha123!", hashed)
+        wrong = await pool.verify("Errada123!", hashed)
+        return hashed, ok, wrong
+
+    try:
+        hashed, ok, wrong = asyncio.run(_run())
+    finally:
+        pool.shutdown()
+
+    assert hashed.startswith("$2b$")
+    assert ok is True
+    assert wrong is False
+
+
+# Teste 8: pool de hashing saturado levanta HashingUnavailable
+def test_hashing_pool_full_raises_unavailable():
+    from utils.hashing import HashingPool, HashingUnavailable
+
+    pool = HashingPool(workers=0, queue_depth=0)
+    pool.pending = pool.max_pending
+
+    with pytest.raises(HashingUnavailable):
+        asyncio.run(pool.hash("Senha123!"))
+
+
+# Teste 8b: job que estourou o timeout continua ocupando o slot até terminar
+def test_hashing_pool_timeout_keeps_slot_until_done():
+    import threading
+
+    from utils.hashing import HashingPool, HashingUnavailable
+
+    pool = HashingPool(workers=0, queue_depth=0, timeout=0.05)
+    release = threading.Event()
+
+    async def _run():
+        with pytest.raises(HashingUnavailable):
+            await pool.run(release.wait, 5)
+        assert pool.pending == 1  # o worker segue ocupado
+        with pytest.raises(HashingUnavailable):
+            await pool.run(release.wait, 5)  # fila cheia: falha sem enfileirar
+
+        release.set()
+        for _ in range(100):
+            if pool.pending == 0:
+                break
+            await asyncio.sleep(0.01)
+
+    try:
+        asyncio.run(_run())
+    finally:
+        release.set()
+        pool.shutdown()
+
+    assert pool.pending == 0
+
+
+# Teste 8c: rota com pool de hashing saturado responde 503 com Retry-After
+def test_token_route_hashing_unavailable_returns_503(client, db_session):
+    from utils.security import hashing_pool
+
+    user = User(
+        id=uuid.uuid4(),
+        name="Busy User",
+        email="busy@example.com",
+        cpf="12345678902",
+        phone=None,
+        hashed_password=get_password_hash("SenhaBusy123!"),
+        is_active=True,
+        is_admin=False,
+        avatar=None,
+    )
+    db_session.add(user)
+    db_session.commit()
+
+    with patch.object(hashing_pool, "pending", hashing_pool.max_pending):
+        resp = client.post(
+            "/api/v1/users/token",
+            data={"username": user.email, "password": "SenhaBusy123!"},
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+        )
+
+    assert resp.status_code == 503, resp.text
+    assert resp.headers["Retry-After"] == "1"
+
+
+# Teste 9: get_current_user usa o cache e não consulta o banco no segundo request
+def test_get_current_user_cache_hit_skips_db():
+    from utils.security import auth_user_cache, create_access_token, get_current_user
+
+    user_id = uuid.uuid4()
+    token = create_access_token(subject=str(user_id))
+    mock_db = MagicMock()
+    mock_db.get = AsyncMock(
+        return_value=SimpleNamespace(id=user_id, is_active=True, is_admin=False)
+    )
+    auth_user_cache.clear()
+
+    first = asyncio.run(get_current_user(mock_db, token, None))
+    second = asyncio.run(get_current_user(mock_db, token, None))
+
+    assert first == second
+    assert first.id == user_id
+    mock_db.get.assert_awaited_once()
+
+
+# Teste 10: desativar a conta invalida o cache do usuário
+def test_deactivate_invalidates_auth_cache():
+    from services.user_service import deactivate_user_me
+    from utils.security import AuthPrincipal, auth_user_cache
+
+    principal = AuthPrincipal(id=uuid.uuid4(), is_active=True, is_admin=False)
+    auth_user_cache.set(principal.id, principal)
+    mock_db = MagicMock()
+    mock_db.execute = AsyncMock()
+    mock_db.commit = AsyncMock()
+
+    asyncio.run(deactivate_user_me(mock_db, principal))
+
+    assert auth_user_cache.get(principal.id) is None
+    mock_db.commit.assert_awaited_once()
+
+
+# Teste 10b: hard delete com registros relacionados (FK) responde 400, não 500
+def test_hard_delete_with_related_rows_returns_400(client, db_session, async_engine):
+    from sqlalchemy import event, text
+
+    from models.models import SportsCenter
+    from utils.security import AuthPrincipal, get_current_user
+
+    user = User(
+        name="Dono",
+        email="dono@example.com",
+        hashed_password="x",
+        cpf="98765432100",
+        phone="999999999",
+    )
+    db_session.add(user)
+    db_session.commit()
+    center = SportsCenter(
+        user_id=user.id, name="Centro", cnpj="1", latitude=-18.9, longitude=-48.2
+    )
+    db_session.add(center)
+    db_session.commit()
+    # No SQLite, users.id (GUID) guarda o UUID com hífens e a FK compara texto
+    db_session.execute(
+        text("UPDATE sports_centers SET user_id = :user_id WHERE id = :id"),
+        {"user_id": str(user.id), "id": center.id},
+    )
+    db_session.commit()
+
+    def enforce_fks(dbapi_connection, _):
+        # SQLite só checa FKs com o pragma ligado (o PostgreSQL sempre checa)
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+    from main import app
+
+    principal = AuthPrincipal(id=user.id, is_active=True, is_admin=False)
+    app.dependency_overrides[get_current_user] = lambda: principal
+    event.listen(async_engine.sync_engine, "connect", enforce_fks)
+    try:
+        resp = client.delete(f"{API_PREFIX}/users/me", params={"soft": False})
+    finally:
+        event.remove(async_engine.sync_engine, "connect", enforce_fks)
+        app.dependency_overrides.pop(get_current_user, None)
+
+    assert resp.status_code == 400
+    assert "soft delete" in resp.json()["detail"]
+    db_session.expire_all()
+    assert db_session.get(User, user.id) is not None
+
+
+# Teste 11: token repetido é decodificado uma vez só (cache de JWT)
+def test_decode_access_token_uses_cache():
+    from jose import jwt
+    from utils.security import create_access_token, decode_access_token, jwt_cache
+
+    token = create_access_token(subject="abc")
+    jwt_cache.clear()
+
+    with patch("utils.security.jwt.decode", wraps=jwt.decode) as spy:
+        assert decode_access_token(token) == "abc"
+        assert decode_access_token(token) == "abc"
+
+    assert spy.call_count == 1
+
+
+# Teste 12: token expirado não é servido do cache
+def test_jwt_cache_honours_exp():
+    import time
+    from datetime import timedelta
+    from utils.security import create_access_token, decode_access_token, jwt_cache
+
+    jwt_cache.clear()
+    token = create_access_token(subject="abc", expires_delta=timedelta(seconds=1))
+    assert decode_access_token(token) == "abc"
+
+    time.sleep(2.1)  # exp tem resolução de segundos
+    assert decode_access_token(token) is None
@@ -1,26 +1,39 @@
+import asyncio
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool
 
 from core.database import Base, get_db
-from main import app 
+from core.entity_cache import entity_cache
+from main import app
+
 
+@pytest.fixture(scope="session")
+def db_path(tmp_path_factory):
+    """Arquivo SQLite compartilhado entre o engine síncrono e o assíncrono"""
+    return tmp_path_factory.mktemp("db") / "test.db"
 
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+@pytest.fixture(scope="session")
+def engine(db_path):
+    return create_engine(
+        f"sqlite:///{db_path}", connect_args={"check_same_thread": False}
+    )
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
-)
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+@pytest.fixture(scope="session")
+def async_engine(db_path):
+    # NullPool: o TestClient abre um event loop por request, então não
+    # reaproveitamos conexões aiosqlite entre loops diferentes
+    return create_async_engine(f"sqlite+aiosqlite:///{db_path}", poolclass=NullPool)
 
 
 @pytest.fixture(scope="session", autouse=True)
-def create_test_db():
+def create_test_db(engine):
     """Cria todas as tabelas no início da sessão de testes"""
     Base.metadata.create_all(bind=engine)
     yield
@@ -28,28 +41,31 @@ def create_test_db():
 
 
 @pytest.fixture(scope="function")
-def db_session():
-    """Cria uma nova sessão para cada teste"""
-    connection = engine.connect()
-    transaction = connection.begin()
-    session = TestingSessionLocal(bind=connection)
+def db_session(engine):
+    """Cria uma nova sessão (síncrona) para cada teste e limpa as tabelas no final"""
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    session = TestingSessionLocal()
 
     yield session
 
     session.close()
-    transaction.rollback()
-    connection.close()
+    with engine.begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            connection.execute(table.delete())
+    # Os ids voltam a ser usados: nada do cache de entidades passa adiante
+    asyncio.run(entity_cache.clear())
 
 
 @pytest.fixture(scope="function")
-def client(db_session):
-    def override_get_db():
-        try:
-            yield db_session
-        finally:
-            db_session.close()
+def client(db_session, async_engine):
+    TestingAsyncSessionLocal = async_sessionmaker(
+        bind=async_engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+    async def override_get_db():
+        async with TestingAsyncSessionLocal() as session:
+            yield session
 
     app.dependency_overrides[get_db] = override_get_db
-    import routes
-    routes.user_router.get_db = override_get_db 
-    return TestClient(app)
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_db, None)
@@ -0,0 +1,108 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from models.models import Booking
+from schemas.booking_schemas import BookingCreate
+from services.booking_service import create_booking_service
+
+API_PREFIX = "/api/v1"
+BOOKING_ROUTE = f"{API_PREFIX}/bookings"
+
+SLOT = datetime(2026, 10, 19, 19, 0)
+HOUR = timedelta(hours=1)
+
+
+def _payload(start, end, field_id=1):
+    return {
+        "user_id": str(uuid.uuid4()),
+        "field_id": field_id,
+        "start_time": start.isoformat(),
+        "end_time": end.isoformat(),
+    }
+
+
+def test_reserva_sobreposta_parcial_conflita(client, db_session):
+    """[NEG] Intervalos sobrepostos (não idênticos) no mesmo campo -> 409."""
+    resp = client.post(f"{BOOKING_ROUTE}/create", json=_payload(SLOT, SLOT + HOUR))
+    assert resp.status_code == 201
+
+    half = timedelta(minutes=30)
+    resp = client.post(
+        f"{BOOKING_ROUTE}/create", json=_payload(SLOT + half, SLOT + HOUR + half)
+    )
+    assert resp.status_code == 409
+
+    resp = client.post(
+        f"{BOOKING_ROUTE}/create", json=_payload(SLOT - HOUR, SLOT + 2 * HOUR)
+    )
+    assert resp.status_code == 409
+
+
+def test_reservas_adjacentes_e_outro_campo(client, db_session):
+    """[POS] Reserva colada na anterior ou em outro campo é aceita."""
+    assert client.post(
+        f"{BOOKING_ROUTE}/create", json=_payload(SLOT, SLOT + HOUR)
+    ).status_code == 201
+    assert client.post(
+        f"{BOOKING_ROUTE}/create", json=_payload(SLOT + HOUR, SLOT + 2 * HOUR)
+    ).status_code == 201
+    assert client.post(
+        f"{BOOKING_ROUTE}/create", json=_payload(SLOT, SLOT + HOUR, field_id=2)
+    ).status_code == 201
+
+
+def test_reserva_cancelada_nao_bloqueia(client, db_session):
+    """[POS] Uma reserva cancelada libera o horário."""
+    db_session.add(Booking(uuid.uuid4(), 1, 1, SLOT, SLOT + HOUR, "cancelled"))
+    db_session.commit()
+
+    resp = client.post(f"{BOOKING_ROUTE}/create", json=_payload(SLOT, SLOT + HOUR))
+    assert resp.status_code == 201
+
+
+def test_atualizar_para_horario_ocupado(client, db_session):
+    """[NEG] PATCH que cria sobreposição -> 409."""
+    client.post(f"{BOOKING_ROUTE}/create", json=_payload(SLOT, SLOT + HOUR))
+    second = client.post(
+        f"{BOOKING_ROUTE}/create", json=_payload(SLOT + 2 * HOUR, SLOT + 3 * HOUR)
+    ).json()["id"]
+
+    resp = client.patch(
+        f"{BOOKING_ROUTE}/{second}", json=_payload(SLOT + HOUR / 2, SLOT + 2 * HOUR)
+    )
+    assert resp.status_code == 409
+
+
+def test_intervalo_invalido(client):
+    """[NEG] end_time antes de start_time -> 422."""
+    resp = client.post(f"{BOOKING_ROUTE}/create", json=_payload(SLOT + HOUR, SLOT))
+    assert resp.status_code == 422
+
+
+def test_estresse_concorrente_mesmo_horario(db_session, async_engine):
+    """[POS] 40 clientes disputando o mesmo horário: exatamente 1 vence."""
+    sessionmaker = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def attempt(i):
+        # Intervalos diferentes, todos cruzando 19:00-19:30
+        start = SLOT - timedelta(minutes=i % 4 * 15)
+        data = BookingCreate(
+            user_id=uuid.uuid4(), field_id=1, start_time=start, end_time=start + HOUR
+        )
+        async with sessionmaker() as session:
+            try:
+                return await create_booking_service(session, data)
+            except ValueError:
+                return None
+
+    async def hammer():
+        return await asyncio.gather(*(attempt(i) for i in range(40)))
+
+    results = asyncio.run(hammer())
+
+    winners = [r for r in results if r is not None]
+    assert len(winners) == 1
+    assert db_session.query(Booking).count() == 1
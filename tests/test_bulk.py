@@ -0,0 +1,256 @@
+import time as clock
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from models.models import Availability, Field, SportsCenter
+
+API_PREFIX = "/api/v1"
+FIELD_ROUTE = f"{API_PREFIX}/field"
+AVAILABILITY_ROUTE = f"{API_PREFIX}/availability"
+
+DAY = datetime(2026, 10, 19)
+
+
+def _center(db_session, cnpj="66666666000166"):
+    center = SportsCenter(
+        user_id=uuid.uuid4(), name="Centro", cnpj=cnpj, latitude=-18.9, longitude=-48.2
+    )
+    db_session.add(center)
+    db_session.commit()
+    return center
+
+
+def _field(center_id, name):
+    return {
+        "sports_center_id": center_id,
+        "name": name,
+        "field_type": "futebol",
+        "price_per_hour": 100,
+    }
+
+
+def test_criar_campos_em_lote_com_resultado_por_item(client, db_session):
+    """[POS] Duplicatas (no banco e no lote) e centro inexistente são rejeitados."""
+    center = _center(db_session)
+    db_session.add(Field(center.id, "Campo A", "futebol", 100))
+    db_session.commit()
+
+    resp = client.post(
+        f"{FIELD_ROUTE}/bulk/create",
+        json={
+            "items": [
+                _field(center.id, "Campo A"),
+                _field(center.id, "Campo B"),
+                _field(center.id, "Campo B"),
+                _field(999999, "Campo C"),
+                _field(center.id, "Campo D"),
+            ]
+        },
+    )
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert (data["created"], data["rejected"]) == (2, 3)
+    assert [r["status"] for r in data["results"]] == [
+        "duplicate", "created", "duplicate", "not_found", "created",
+    ]
+    created = {r["id"] for r in data["results"] if r["status"] == "created"}
+    names = {f.name for f in db_session.query(Field).filter(Field.id.in_(created))}
+    assert names == {"Campo B", "Campo D"}
+
+
+def test_lote_atomico_nao_grava_nada(client, db_session):
+    """[NEG] atomic=true com um item inválido -> 409 e nenhuma linha nova."""
+    center = _center(db_session)
+
+    resp = client.post(
+        f"{FIELD_ROUTE}/bulk/create",
+        json={
+            "items": [_field(center.id, "Campo A"), _field(999999, "Campo B")],
+            "atomic": True,
+        },
+    )
+
+    assert resp.status_code == 409
+    assert [r["status"] for r in resp.json()["detail"]["results"]] == [
+        "skipped", "not_found",
+    ]
+    assert db_session.query(Field).count() == 0
+
+
+def test_atualizar_e_deletar_campos_em_lote(client, db_session):
+    """[POS] Update/delete em lote; nome repetido no centro e id inexistente falham."""
+    center = _center(db_session)
+    fields = [Field(center.id, f"Campo {i}", "futebol", 100) for i in range(3)]
+    db_session.add_all(fields)
+    db_session.commit()
+    ids = [f.id for f in fields]
+
+    resp = client.post(
+        f"{FIELD_ROUTE}/bulk/update",
+        json={
+            "items": [
+                {"id": ids[0], "price_per_hour": 150},
+                {"id": ids[1], "name": "Campo 2"},
+                {"id": ids[2], "field_type": "society", "name": "Campo Novo"},
+                {"id": 999999, "price_per_hour": 1},
+            ]
+        },
+    )
+    assert [r["status"] for r in resp.json()["results"]] == [
+        "updated", "duplicate", "updated", "not_found",
+    ]
+    db_session.expire_all()
+    assert float(db_session.get(Field, ids[0]).price_per_hour) == 150
+    assert db_session.get(Field, ids[1]).name == "Campo 1"
+    assert db_session.get(Field, ids[2]).field_type == "society"
+
+    resp = client.post(f"{FIELD_ROUTE}/bulk/delete", json={"ids": [ids[0], ids[0], 999999]})
+    assert resp.json()["deleted"] == 1
+    assert [r["status"] for r in resp.json()["results"]] == [
+        "deleted", "duplicate", "not_found",
+    ]
+    assert db_session.query(Field).count() == 2
+
+
+def _availability(field_id, day, hour):
+    start = DAY + timedelta(days=day, hours=hour)
+    return {
+        "field_id": field_id,
+        "day_of_week": (start.isoweekday() % 7),
+        "start_time": start.isoformat(),
+        "end_time": (start + timedelta(hours=1)).isoformat(),
+    }
+
+
+@pytest.fixture
+def concurrent_insert(async_engine, engine):
+    """Grava uma linha por outra conexão logo antes do INSERT do lote."""
+    pending = []
+
+    def before(conn, cursor, statement, parameters, context, executemany):
+        if pending and statement.startswith(pending[0][0]):
+            _, sql, params = pending.pop()
+            with engine.begin() as other:
+                other.exec_driver_sql(sql, params)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", before)
+    yield pending
+    event.remove(async_engine.sync_engine, "before_cursor_execute", before)
+
+
+@pytest.mark.parametrize("atomic", [False, True])
+def test_corrida_no_insert_vira_rejeicao_do_item(
+    client, db_session, concurrent_insert, atomic
+):
+    """[NEG] Duplicata gravada por outra requisição depois das checagens do lote."""
+    center = _center(db_session)
+    concurrent_insert.append(
+        (
+            "INSERT INTO fields",
+            "INSERT INTO fields (sports_center_id, name, type, price_per_hour, version)"
+            " VALUES (?, 'Campo B', 'futebol', 100, 1)",
+            (center.id,),
+        )
+    )
+
+    resp = client.post(
+        f"{FIELD_ROUTE}/bulk/create",
+        json={
+            "items": [_field(center.id, "Campo A"), _field(center.id, "Campo B")],
+            "atomic": atomic,
+        },
+    )
+
+    names = sorted(f.name for f in db_session.query(Field))
+    if atomic:
+        assert resp.status_code == 409
+        results = resp.json()["detail"]["results"]
+        assert [r["status"] for r in results] == ["skipped", "duplicate"]
+        assert names == ["Campo B"]
+    else:
+        assert resp.status_code == 200
+        assert [r["status"] for r in resp.json()["results"]] == ["created", "duplicate"]
+        assert names == ["Campo A", "Campo B"]
+
+
+def test_disponibilidades_em_lote(client, db_session):
+    """[POS] Onboarding: 10 campos x 7 dias x 4 horários numa requisição."""
+    center = _center(db_session)
+    fields = [Field(center.id, f"Campo {i}", "futebol", 100) for i in range(10)]
+    db_session.add_all(fields)
+    db_session.commit()
+    items = [
+        _availability(f.id, day, hour)
+        for f in fields
+        for day in range(7)
+        for hour in (18, 19, 20, 21)
+    ]
+    items.append(items[0])
+
+    t0 = clock.perf_counter()
+    resp = client.post(f"{AVAILABILITY_ROUTE}/bulk/create", json={"items": items})
+    elapsed = clock.perf_counter() - t0
+
+    data = resp.json()
+    assert (data["created"], data["rejected"]) == (280, 1)
+    assert data["results"][-1]["status"] == "duplicate"
+    assert db_session.query(Availability).count() == 280
+    assert elapsed < 1.0
+
+    ids = [r["id"] for r in data["results"][:3]]
+    resp = client.post(
+        f"{AVAILABILITY_ROUTE}/bulk/update",
+        json={"items": [{"id": ids[0], "day_of_week": 6}, {"id": 999999}]},
+    )
+    assert [r["status"] for r in resp.json()["results"]] == ["updated", "not_found"]
+    db_session.expire_all()
+    assert db_session.get(Availability, ids[0]).day_of_week == 6
+
+    resp = client.post(f"{AVAILABILITY_ROUTE}/bulk/delete", json={"ids": ids})
+    assert resp.json()["deleted"] == 3
+    assert db_session.query(Availability).count() == 277
+
+
+def test_atualizar_disponibilidades_para_horario_ocupado(client, db_session):
+    """[NEG] Mover para um horário já cadastrado (no banco ou no lote) -> duplicate."""
+    center = _center(db_session)
+    field = Field(center.id, "Campo", "futebol", 100)
+    db_session.add(field)
+    db_session.commit()
+    resp = client.post(
+        f"{AVAILABILITY_ROUTE}/bulk/create",
+        json={"items": [_availability(field.id, 0, hour) for hour in (18, 19, 20, 21)]},
+    )
+    ids = [r["id"] for r in resp.json()["results"]]
+    at_22 = _availability(field.id, 0, 22)
+    at_18 = _availability(field.id, 0, 18)
+
+    resp = client.post(
+        f"{AVAILABILITY_ROUTE}/bulk/update",
+        json={
+            "items": [
+                {"id": ids[1], "start_time": at_18["start_time"], "end_time": at_18["end_time"]},
+                {"id": ids[2], "start_time": at_22["start_time"], "end_time": at_22["end_time"]},
+                {"id": ids[3], "start_time": at_22["start_time"], "end_time": at_22["end_time"]},
+            ]
+        },
+    )
+
+    assert resp.status_code == 200
+    assert [r["status"] for r in resp.json()["results"]] == [
+        "duplicate", "updated", "duplicate",
+    ]
+    db_session.expire_all()
+    starts = sorted(a.start_time.hour for a in db_session.query(Availability))
+    assert starts == [18, 19, 21, 22]
+
+
+def test_lote_vazio_ou_grande_demais(client):
+    """[NEG] Lista vazia ou acima de 500 itens -> 422."""
+    assert client.post(f"{FIELD_ROUTE}/bulk/create", json={"items": []}).status_code == 422
+    resp = client.post(f"{FIELD_ROUTE}/bulk/delete", json={"ids": list(range(501))})
+    assert resp.status_code == 422
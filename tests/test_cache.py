@@ -0,0 +1,37 @@
+import time
+
+from core.cache import TTLCache
+
+
+def test_ttl_cache_hit_and_miss_counters():
+    """[POS] get conta hits e misses."""
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("a", 1)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_ttl_cache_expires_items():
+    """[NEG] Item expirado não é retornado."""
+    cache = TTLCache(maxsize=10, ttl=0.01)
+    cache.set("a", 1)
+    time.sleep(0.02)
+
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    """[POS] Acima do maxsize, sai o item usado há mais tempo."""
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
@@ -0,0 +1,103 @@
+import gzip
+import uuid
+
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from core.compression import CompressionMiddleware, choose_encoding
+
+BIG = [{"id": i, "name": f"Centro {i}"} for i in range(200)]
+
+
+def _app() -> TestClient:
+    app = FastAPI(default_response_class=ORJSONResponse)
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+    @app.get("/big")
+    async def big():
+        return BIG
+
+    @app.get("/small")
+    async def small():
+        return {"ok": True}
+
+    @app.get("/png")
+    async def png():
+        return Response(b"\x89PNG" + bytes(4096), media_type="image/png")
+
+    @app.get("/stream")
+    async def stream(chunks: int = 50):
+        async def body():
+            for i in range(chunks):
+                yield f"linha {i}\n".encode()
+
+        return StreamingResponse(body(), media_type="text/plain")
+
+    return TestClient(app)
+
+
+def test_comprime_json_grande_e_stream():
+    """[POS] JSON acima do limite e stream longo vão em gzip."""
+    client = _app()
+    resp = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["content-encoding"] == "gzip"
+    assert "accept-encoding" in resp.headers["vary"].lower()
+    assert int(resp.headers["content-length"]) < len(resp.content)
+    assert resp.json() == BIG
+
+    with client.stream(
+        "GET", "/stream", params={"chunks": 500}, headers={"Accept-Encoding": "gzip"}
+    ) as resp:
+        raw = b"".join(resp.iter_raw())
+    assert resp.headers["content-encoding"] == "gzip"
+    assert "content-length" not in resp.headers
+    assert gzip.decompress(raw) == b"".join(f"linha {i}\n".encode() for i in range(500))
+
+
+def test_nao_comprime_fora_das_regras():
+    """[NEG] Corpo pequeno, stream curto, tipo fora da lista e cliente sem gzip."""
+    client = _app()
+    for path in ("/small", "/png", "/stream?chunks=5"):
+        resp = client.get(path, headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in resp.headers, path
+    assert client.get("/stream?chunks=5").text.startswith("linha 0")
+
+    for accept in ("identity", "gzip;q=0", "br"):
+        resp = client.get("/big", headers={"Accept-Encoding": accept})
+        assert "content-encoding" not in resp.headers, accept
+        assert resp.json() == BIG
+
+
+def test_escolha_da_codificacao():
+    """[POS] Preferência do servidor entre as aceitas; q=0 e "*" respeitados."""
+    offered = ("zstd", "br", "gzip")
+    assert choose_encoding("gzip, deflate, br", offered) == "br"
+    assert choose_encoding("br;q=0, gzip;q=0.5", offered) == "gzip"
+    assert choose_encoding("*", offered) == "zstd"
+    assert choose_encoding("*;q=0, gzip", offered) == "gzip"
+    assert choose_encoding("", offered) is None
+
+
+def test_etag_fraca_na_resposta_comprimida(client, db_session):
+    """[POS] ETag vira W/ com gzip e o If-None-Match com ela ainda dá 304."""
+    resp = client.post(
+        "/api/v1/sports_center/create",
+        json={
+            "user_id": str(uuid.uuid4()),
+            "name": "Centro",
+            "cnpj": "12345678000190",
+            "latitude": -18.9186,
+            "longitude": -48.2772,
+            "description": "Quadras society e futsal. " * 60,
+        },
+    )
+    path = f"/api/v1/sports_center/{resp.json()['id']}"
+
+    resp = client.get(path, headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["content-encoding"] == "gzip"
+    etag = resp.headers["etag"]
+    assert etag.startswith('W/"')
+
+    resp = client.get(path, headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert resp.status_code == 304
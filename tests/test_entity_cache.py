@@ -0,0 +1,274 @@
+import asyncio
+import fnmatch
+import socketserver
+import threading
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from core.entity_cache import (
+    EntityCache,
+    MemoryBackend,
+    RedisBackend,
+    entity_tag,
+    entity_cache,
+    owner_tag,
+)
+from models.models import Availability, Field, SportsCenter
+
+API_PREFIX = "/api/v1"
+CENTER_ROUTE = f"{API_PREFIX}/sports_center"
+FIELD_ROUTE = f"{API_PREFIX}/field"
+AVAILABILITY_ROUTE = f"{API_PREFIX}/availability"
+
+MONDAY = datetime(2026, 10, 19)
+
+
+class _RespHandler(socketserver.StreamRequestHandler):
+    """Servidor falso do protocolo Redis: só os comandos que o backend usa."""
+
+    def _read(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        args = []
+        for _ in range(int(line[1:])):
+            size = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(size + 2)[:-2])
+        return args
+
+    def _bulk(self, value):
+        return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+
+    def _array(self, items):
+        return b"*%d\r\n" % len(items) + b"".join(self._bulk(i) for i in items)
+
+    def handle(self):
+        data = self.server.data
+        while (args := self._read()) is not None:
+            command, args = args[0].upper(), args[1:]
+            self.server.commands.append(command)
+            if command == b"EVAL":
+                # Só o script de invalidação do backend: apaga membros e tags
+                tags = args[2 : 2 + int(args[1])]
+                keys = {k for tag in tags for k in data.pop(tag, ())}
+                reply = b":%d\r\n" % sum(data.pop(k, None) is not None for k in keys)
+            elif command == b"GET":
+                value = data.get(args[0])
+                reply = self._bulk(value if isinstance(value, bytes) else None)
+            elif command == b"SET":
+                data[args[0]] = args[1]
+                reply = b"+OK\r\n"
+            elif command == b"SADD":
+                data.setdefault(args[0], set()).update(args[1:])
+                reply = b":1\r\n"
+            elif command == b"SMEMBERS":
+                reply = self._array(sorted(data.get(args[0], ())))
+            elif command == b"EXPIRE":
+                reply = b":1\r\n"
+            elif command == b"DEL":
+                reply = b":%d\r\n" % sum(data.pop(k, None) is not None for k in args)
+            elif command == b"SCAN":
+                pattern = args[2].decode()
+                keys = [k for k in data if fnmatch.fnmatchcase(k.decode(), pattern)]
+                reply = b"*2\r\n" + self._bulk(b"0") + self._array(keys)
+            else:
+                reply = b"-ERR unknown command\r\n"
+            self.wfile.write(reply)
+
+
+@pytest.fixture
+def resp_server():
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _RespHandler)
+    server.daemon_threads = True
+    server.data = {}
+    server.commands = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def statements(async_engine):
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+
+def _center_and_field(client):
+    center_id = client.post(
+        f"{CENTER_ROUTE}/create",
+        json={
+            "user_id": str(uuid.uuid4()),
+            "name": "Centro",
+            "cnpj": "12345678000190",
+            "latitude": -18.9186,
+            "longitude": -48.2772,
+        },
+    ).json()["id"]
+    field_id = client.post(
+        f"{FIELD_ROUTE}/create",
+        json={
+            "sports_center_id": center_id,
+            "name": "Quadra",
+            "field_type": "futsal",
+            "price_per_hour": 100,
+        },
+    ).json()["id"]
+    return center_id, field_id
+
+
+def test_leitura_repetida_nao_vai_ao_banco(client, db_session, statements):
+    """[POS] Segunda leitura vem do cache; o PATCH invalida e a próxima recarrega."""
+    center_id, field_id = _center_and_field(client)
+    availability_id = client.post(
+        f"{AVAILABILITY_ROUTE}/create",
+        json={
+            "field_id": field_id,
+            "day_of_week": 1,
+            "start_time": (MONDAY + timedelta(hours=8)).isoformat(),
+            "end_time": (MONDAY + timedelta(hours=22)).isoformat(),
+        },
+    ).json()["id"]
+    hits = entity_cache.hits
+
+    for path in (
+        f"{CENTER_ROUTE}/{center_id}",
+        f"{FIELD_ROUTE}/{field_id}",
+        f"{AVAILABILITY_ROUTE}/{availability_id}",
+    ):
+        first = client.get(path)
+        statements.clear()
+        second = client.get(path)
+        assert statements == [], path
+        assert second.json() == first.json()
+        assert second.headers["etag"] == first.headers["etag"]
+    assert entity_cache.hits == hits + 3
+    assert entity_cache.stats()["hit_ratio"] > 0
+
+    client.patch(f"{FIELD_ROUTE}/{field_id}", json={"price_per_hour": 150})
+    statements.clear()
+    resp = client.get(f"{FIELD_ROUTE}/{field_id}")
+    assert resp.json()["price_per_hour"] == 150
+    assert len(statements) == 1
+
+
+def test_invalidacao_por_tag_de_dono():
+    """[POS] A tag do dono derruba as entradas filhas; a da entidade, só ela."""
+    cache = EntityCache(MemoryBackend(), ttl=60)
+    field = Field(sports_center_id=1, name="Quadra", field_type="futsal", price_per_hour=100)
+    field.id, field.version = 7, 1
+    availability = Availability(
+        field_id=7, day_of_week=1, start_time=MONDAY, end_time=MONDAY + timedelta(hours=1)
+    )
+    availability.id, availability.version = 3, 1
+
+    async def scenario():
+        loads = []
+
+        async def load(obj):
+            loads.append(obj)
+            return obj
+
+        field_owner = (SportsCenter, "sports_center_id")
+        availability_owner = (Field, "field_id")
+        await cache.get(Field, 7, lambda: load(field), owner=field_owner)
+        await cache.get(Availability, 3, lambda: load(availability), owner=availability_owner)
+        cached = await cache.get(Availability, 3, lambda: load(availability))
+        assert cached.start_time == MONDAY and cached is not availability
+
+        await cache.invalidate(owner_tag(Field, 7, Availability))
+        await cache.get(Availability, 3, lambda: load(availability), owner=availability_owner)
+        await cache.get(Field, 7, lambda: load(field))
+        return loads
+
+    assert len(asyncio.run(scenario())) == 3
+
+
+def test_memoria_limitada_e_invalidacao_durante_carga():
+    """[NEG] Acima de max_bytes o LRU descarta; carga que cruzou um UPDATE não é guardada."""
+    backend = MemoryBackend(maxsize=100, max_bytes=600)
+    cache = EntityCache(backend, ttl=60)
+
+    def field(i):
+        obj = Field(
+            sports_center_id=1, name=f"Quadra {i}", field_type="futsal", price_per_hour=100
+        )
+        obj.id, obj.version = i, 1
+        return obj
+
+    async def scenario():
+        for i in range(10):
+            await cache.get(Field, i, lambda i=i: _value(field(i)))
+        assert backend.bytes <= 600
+        assert backend.evictions > 0
+
+        async def racing_load():
+            # UPDATE + invalidação enquanto a leitura ainda estava no banco
+            await cache.invalidate(entity_tag(Field, 50))
+            return field(50)
+
+        await cache.get(Field, 50, racing_load)
+        return await backend.get(entity_tag(Field, 50))
+
+    assert asyncio.run(scenario()) is None
+
+
+async def _value(obj):
+    return obj
+
+
+def test_backend_redis_com_servidor_local(resp_server):
+    """[POS] Backend RESP: cache, invalidação por tag e clear só do prefixo."""
+    host, port = resp_server.server_address
+    cache = EntityCache(RedisBackend(f"redis://{host}:{port}/0"), ttl=60)
+    center = SportsCenter(
+        user_id=uuid.uuid4(), name="Centro", cnpj="1", latitude=-18.9, longitude=-48.2
+    )
+    center.id, center.version = 5, 2
+    for column in ("rating_count", "rating_sum", "stars_1", "stars_2", "stars_3", "stars_4"):
+        setattr(center, column, 0)
+    center.rating_count, center.rating_sum, center.stars_5 = 1, 5, 1
+    resp_server.data[b"outro:app"] = b"fica"
+
+    async def scenario():
+        await cache.get(SportsCenter, 5, lambda: _value(center))
+        cached = await cache.get(SportsCenter, 5, lambda: _value(None))
+        assert cached.user_id == center.user_id
+        assert cached.rating_average == 5.0 and cached.version == 2
+
+        await cache.invalidate(entity_tag(SportsCenter, 5))
+        assert await cache.get(SportsCenter, 5, lambda: _value(None)) is None
+        await cache.get(SportsCenter, 5, lambda: _value(center))
+        await cache.clear()
+
+    asyncio.run(scenario())
+    assert cache.hits == 1 and cache.errors == 0
+    assert list(resp_server.data) == [b"outro:app"]
+    # Invalidação atômica no servidor, sem SMEMBERS + DEL separados
+    assert b"EVAL" in resp_server.commands
+    assert b"SMEMBERS" not in resp_server.commands
+
+
+def test_backend_fora_do_ar_cai_no_banco():
+    """[NEG] Sem servidor, a leitura vai ao loader e o erro só é contado."""
+    cache = EntityCache(RedisBackend("redis://127.0.0.1:1/0", timeout=0.2), ttl=60)
+    obj = Field(sports_center_id=1, name="Quadra", field_type="futsal", price_per_hour=100)
+    obj.id, obj.version = 1, 1
+
+    async def scenario():
+        found = await cache.get(Field, 1, lambda: _value(obj))
+        await cache.invalidate(entity_tag(Field, 1))
+        return found
+
+    assert asyncio.run(scenario()) is obj
+    assert cache.errors == 2
@@ -0,0 +1,142 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from utils.etag import etag_matches
+
+API_PREFIX = "/api/v1"
+CENTER_ROUTE = f"{API_PREFIX}/sports_center"
+FIELD_ROUTE = f"{API_PREFIX}/field"
+AVAILABILITY_ROUTE = f"{API_PREFIX}/availability"
+REVIEW_ROUTE = f"{API_PREFIX}/review"
+
+MONDAY = datetime(2026, 10, 19)
+
+
+@pytest.fixture
+def statements(async_engine):
+    """Statements SQL executados pelo engine assíncrono durante o teste."""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+
+def _center(client):
+    resp = client.post(
+        f"{CENTER_ROUTE}/create",
+        json={
+            "user_id": str(uuid.uuid4()),
+            "name": "Centro",
+            "cnpj": "12345678000190",
+            "latitude": -18.9186,
+            "longitude": -48.2772,
+        },
+    )
+    return resp.json()["id"]
+
+
+def _field(client, center_id):
+    resp = client.post(
+        f"{FIELD_ROUTE}/create",
+        json={
+            "sports_center_id": center_id,
+            "name": "Quadra",
+            "field_type": "futsal",
+            "price_per_hour": 100,
+        },
+    )
+    return resp.json()["id"]
+
+
+def test_304_sem_carregar_a_linha(client, db_session, statements):
+    """[POS] If-None-Match com a ETag atual -> 304 vazio, lendo só a versão."""
+    field_id = _field(client, _center(client))
+    resp = client.get(f"{FIELD_ROUTE}/{field_id}")
+    etag = resp.headers["etag"]
+    assert resp.headers["cache-control"] == "private, no-cache"
+
+    statements.clear()
+    resp = client.get(f"{FIELD_ROUTE}/{field_id}", headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.content == b""
+    assert resp.headers["etag"] == etag
+    assert resp.headers["cache-control"] == "private, no-cache"
+    assert len(statements) == 1
+    assert statements[0].startswith("SELECT fields.version")
+
+
+def test_update_troca_a_etag(client, db_session):
+    """[POS] PATCH, PATCH em lote e review nova mudam a ETag da entidade."""
+    center_id = _center(client)
+    field_id = _field(client, center_id)
+    resp = client.post(
+        f"{AVAILABILITY_ROUTE}/create",
+        json={
+            "field_id": field_id,
+            "day_of_week": 1,
+            "start_time": (MONDAY + timedelta(hours=8)).isoformat(),
+            "end_time": (MONDAY + timedelta(hours=22)).isoformat(),
+        },
+    )
+    availability_id = resp.json()["id"]
+
+    def etag(path):
+        return client.get(path).headers["etag"]
+
+    field_path = f"{FIELD_ROUTE}/{field_id}"
+    before = etag(field_path)
+    client.patch(field_path, json={"price_per_hour": 150})
+    after = etag(field_path)
+    assert after != before
+    resp = client.get(field_path, headers={"If-None-Match": before})
+    assert resp.status_code == 200
+    assert resp.json()["price_per_hour"] == 150
+
+    resp = client.post(
+        f"{FIELD_ROUTE}/bulk/update", json={"items": [{"id": field_id, "name": "Q2"}]}
+    )
+    assert resp.status_code == 200
+    assert etag(field_path) != after
+
+    availability_path = f"{AVAILABILITY_ROUTE}/{availability_id}"
+    before = etag(availability_path)
+    client.patch(availability_path, json={"day_of_week": 1})
+    assert etag(availability_path) != before
+
+    center_path = f"{CENTER_ROUTE}/{center_id}"
+    before = etag(center_path)
+    client.post(
+        f"{REVIEW_ROUTE}/create",
+        json={"user_id": str(uuid.uuid4()), "sports_center_id": center_id, "rating": 5},
+    )
+    resp = client.get(center_path, headers={"If-None-Match": before})
+    assert resp.status_code == 200
+    assert resp.json()["rating_count"] == 1
+
+
+def test_etag_de_inexistente_ou_diferente(client, db_session):
+    """[NEG] If-None-Match de outra versão -> 200; id inexistente -> 404."""
+    center_id = _center(client)
+    resp = client.get(
+        f"{CENTER_ROUTE}/{center_id}", headers={"If-None-Match": '"00000000-1"'}
+    )
+    assert resp.status_code == 200
+    assert resp.headers["etag"] != '"00000000-1"'
+
+    resp = client.get(f"{AVAILABILITY_ROUTE}/999", headers={"If-None-Match": "*"})
+    assert resp.status_code == 404
+
+
+def test_comparacao_de_etags():
+    """[POS] Lista, W/ e "*" no If-None-Match; [NEG] ETag parecida não bate."""
+    assert etag_matches('"a-1", W/"b-2"', '"b-2"')
+    assert etag_matches("*", '"a-1"')
+    assert not etag_matches('"a-1"', '"a-10"')
+    assert not etag_matches('"a-1"', '"b-1"')
@@ -0,0 +1,119 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from services.gazetteer_service import load_gazetteer
+from services.geocoding_service import BoundingBox, Geocoder, get_gazetteer
+
+API_PREFIX = "/api/v1"
+AUTOCOMPLETE_ROUTE = f"{API_PREFIX}/sports_center/cities/autocomplete"
+
+CSV = """name,state,lat_min,lat_max,lon_min,lon_max,lat,lon
+Uberlândia,MG,-19.05,-18.80,-48.45,-48.10,-18.9186,-48.2772
+Uberaba,MG,-19.85,-19.65,-48.05,-47.85,-19.7483,-47.9319
+Santa Luzia,MG,-19.85,-19.70,-43.95,-43.80,-19.7697,-43.8514
+Santa Luzia,PB,-6.95,-6.80,-36.98,-36.85,-6.8717,-36.9186
+São Paulo,SP,-24.01,-23.35,-46.83,-46.36,-23.5505,-46.6333
+São Carlos,SP,-22.10,-21.90,-47.95,-47.80,-22.0087,-47.8909
+"""
+
+
+@pytest.fixture
+def gazetteer(tmp_path):
+    path = tmp_path / "cities.csv"
+    path.write_text(CSV, encoding="utf-8")
+    return load_gazetteer(str(path))
+
+
+class _CountingProvider:
+    def __init__(self):
+        self.calls = 0
+
+    async def geocode_city(self, city):
+        self.calls += 1
+        return BoundingBox(0.0, 1.0, 0.0, 1.0)
+
+    async def aclose(self):
+        pass
+
+
+def test_lookup_ignora_acento_e_caixa(gazetteer):
+    """[POS] Busca exata é insensível a acento, caixa e espaços extras."""
+    city = gazetteer.lookup("  UBERLANDIA ")
+    assert city is not None and city.name == "Uberlândia"
+    assert gazetteer.lookup("sao   paulo").state == "SP"
+    assert gazetteer.lookup("Uber") is None
+
+
+def test_lookup_homonimos_com_uf(gazetteer):
+    """[POS] UF no texto desambigua; sem UF vale a ordem do arquivo."""
+    assert gazetteer.lookup("Santa Luzia").state == "MG"
+    assert gazetteer.lookup("Santa Luzia, PB").state == "PB"
+    assert gazetteer.lookup("santa luzia - pb").state == "PB"
+    assert gazetteer.lookup("Santa Luzia", state="PB").state == "PB"
+    assert gazetteer.lookup("Santa Luzia, RJ") is None
+
+
+def test_autocomplete_por_prefixo(gazetteer):
+    """[POS] Prefixo normalizado retorna cidades em ordem e respeita limit."""
+    assert [c.name for c in gazetteer.autocomplete("ube")] == ["Uberaba", "Uberlândia"]
+    assert [c.name for c in gazetteer.autocomplete("SÃO")] == ["São Carlos", "São Paulo"]
+    assert len(gazetteer.autocomplete("s", limit=2)) == 2
+    assert gazetteer.autocomplete("   ") == []
+
+
+def test_geocoder_usa_gazetteer_antes_do_remoto(gazetteer):
+    """[POS] Cidade do gazetteer não chama o provider remoto."""
+    provider = _CountingProvider()
+    geocoder = Geocoder(provider, gazetteer=gazetteer)
+
+    bbox = asyncio.run(geocoder.geocode_city("uberlândia"))
+    assert bbox == BoundingBox(-19.05, -18.80, -48.45, -48.10)
+    assert provider.calls == 0
+
+    asyncio.run(geocoder.geocode_city("Cidade Fora Da Base"))
+    assert provider.calls == 1
+
+
+def test_geocoder_offline_only_nao_chama_remoto(gazetteer):
+    """[NEG] Em modo offline, cidade desconhecida é None sem rede."""
+    provider = _CountingProvider()
+    geocoder = Geocoder(provider, gazetteer=gazetteer, offline_only=True)
+
+    assert asyncio.run(geocoder.geocode_city("Cidade Fora Da Base")) is None
+    assert provider.calls == 0
+
+
+def test_rota_autocomplete(gazetteer):
+    """[POS] Endpoint de autocomplete devolve nome, UF e centróide."""
+    app.dependency_overrides[get_gazetteer] = lambda: gazetteer
+    try:
+        with TestClient(app) as client:
+            resp = client.get(AUTOCOMPLETE_ROUTE, params={"q": "uberl"})
+    finally:
+        app.dependency_overrides.pop(get_gazetteer, None)
+
+    assert resp.status_code == 200
+    assert resp.json() == [
+        {
+            "name": "Uberlândia",
+            "state": "MG",
+            "label": "Uberlândia, MG",
+            "lat": -18.9186,
+            "lon": -48.2772,
+        }
+    ]
+
+
+def test_rota_autocomplete_sem_base():
+    """[NEG] Sem GAZETTEER_PATH configurado responde 503."""
+    app.dependency_overrides[get_gazetteer] = lambda: None
+    try:
+        with TestClient(app) as client:
+            resp = client.get(AUTOCOMPLETE_ROUTE, params={"q": "ube"})
+    finally:
+        app.dependency_overrides.pop(get_gazetteer, None)
+
+    assert resp.status_code == 503
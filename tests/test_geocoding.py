@@ -0,0 +1,142 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+
+from main import app
+from services.geocoding_service import (
+    BoundingBox,
+    GeocodeStore,
+    Geocoder,
+    NominatimProvider,
+    get_geocoder,
+    normalize_city,
+)
+
+API_PREFIX = "/api/v1"
+CITY_ROUTE = f"{API_PREFIX}/sports_center/city"
+
+CITIES = {"uberlandia": ["-19.05", "-18.80", "-48.45", "-48.10"]}
+UBERLANDIA = BoundingBox(-19.05, -18.80, -48.45, -48.10)
+
+
+class _StubNominatim(BaseHTTPRequestHandler):
+    """Imita o /search do Nominatim; conta as chamadas recebidas."""
+
+    calls = 0
+
+    def do_GET(self):
+        type(self).calls += 1
+        time.sleep(0.05)  # janela para requests concorrentes se sobreporem
+        city = parse_qs(urlparse(self.path).query)["city"][0]
+        bbox = CITIES.get(normalize_city(city))
+        body = json.dumps([{"boundingbox": bbox}] if bbox else []).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_url():
+    _StubNominatim.calls = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubNominatim)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/search"
+    server.shutdown()
+
+
+def _geocode(geocoder: Geocoder, *cities):
+    async def _run():
+        try:
+            return await asyncio.gather(*(geocoder.geocode_city(c) for c in cities))
+        finally:
+            await geocoder.aclose()
+
+    return asyncio.run(_run())
+
+
+def test_geocoder_caches_and_persists(stub_url, tmp_path):
+    """[POS] Cidade (com/sem acento) vai ao provider uma vez, mesmo após restart."""
+    store_path = str(tmp_path / "geo.sqlite3")
+
+    first = Geocoder(NominatimProvider(stub_url), GeocodeStore(store_path))
+    assert _geocode(first, "Uberlândia") == [UBERLANDIA]
+    assert _geocode(first, "uberlandia") == [UBERLANDIA]
+    assert _StubNominatim.calls == 1
+
+    restarted = Geocoder(NominatimProvider(stub_url), GeocodeStore(store_path))
+    assert _geocode(restarted, "UBERLÂNDIA")[0].lat_min == -19.05
+    assert _StubNominatim.calls == 1
+
+
+def test_geocoder_single_flight(stub_url):
+    """[POS] Lookups concorrentes da mesma cidade compartilham uma requisição."""
+    geocoder = Geocoder(NominatimProvider(stub_url))
+
+    results = _geocode(geocoder, *["Uberlândia"] * 20)
+
+    assert len(set(results)) == 1
+    assert _StubNominatim.calls == 1
+
+
+def test_geocoder_unknown_city(stub_url):
+    """[NEG] Cidade inexistente retorna None (e também fica em cache)."""
+    geocoder = Geocoder(NominatimProvider(stub_url))
+
+    assert _geocode(geocoder, "Atlantida", "Atlantida") == [None, None]
+    assert _StubNominatim.calls == 1
+
+
+class _FakeGeocoder:
+    async def geocode_city(self, city):
+        return UBERLANDIA if normalize_city(city) in CITIES else None
+
+
+@pytest.fixture
+def client():
+    app.dependency_overrides[get_geocoder] = lambda: _FakeGeocoder()
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_geocoder, None)
+
+
+def test_city_route_success(client):
+    """[POS] Rota usa o bbox do geocoder para buscar os centros."""
+    with patch(
+        "routes.sports_center_routes.get_sports_center_by_city_service"
+    ) as mock_service:
+        mock_service.return_value = [
+            {
+                "id": 1,
+                "user_id": "7c1e4b7a-3f2d-4b8e-9a6c-2d5f8e1b0c93",
+                "name": "Centro",
+                "cnpj": "12345678000190",
+                "latitude": -18.9186,
+                "longitude": -48.2772,
+            }
+        ]
+        resp = client.get(f"{CITY_ROUTE}/Uberlândia")
+
+    assert resp.status_code == 200
+    assert [(c["id"], c["name"]) for c in resp.json()] == [(1, "Centro")]
+    args = mock_service.call_args.args
+    assert args[1:] == tuple(UBERLANDIA)
+
+
+def test_city_route_unknown_city_404(client):
+    """[NEG] Cidade não encontrada retorna 404 (e não 500)."""
+    resp = client.get(f"{CITY_ROUTE}/Atlantida")
+
+    assert resp.status_code == 404
+    assert resp.json()["detail"] == "Cidade não encontrada."
@@ -0,0 +1,28 @@
+import asyncio
+import sqlite3
+
+from scripts.index_advisor import run
+
+
+def test_consultas_dos_servicos_usam_indices(tmp_path):
+    """[POS] Com os índices dos models, nenhuma consulta varre tabela inteira."""
+    url = f"sqlite+aiosqlite:///{tmp_path / 'advisor.db'}"
+    assert asyncio.run(run(url, centers=200)) == []
+
+
+def test_aponta_indice_ausente(tmp_path):
+    """[NEG] Sem o índice de availabilities, consultas e a FK são apontadas."""
+    path = tmp_path / "advisor.db"
+    url = f"sqlite+aiosqlite:///{path}"
+    asyncio.run(run(url, centers=200))
+
+    conn = sqlite3.connect(path)
+    conn.execute("DROP INDEX uq_availabilities_field_id_start_time_end_time")
+    conn.close()
+
+    problems = asyncio.run(run(url, centers=200))
+    assert "FK sem índice: availabilities(field_id) -> fields" in problems
+    assert any(
+        "[horários livres] leitura sequencial de availabilities" in p
+        for p in problems
+    )
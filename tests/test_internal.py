@@ -0,0 +1,83 @@
+import asyncio
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from core.pool_metrics import InstrumentedAsyncQueuePool, PoolMetrics
+from main import app
+from utils.security import get_current_user
+
+API_PREFIX = "/api/v1"
+BASE = f"{API_PREFIX}/internal"
+client = TestClient(app)
+
+
+def _user(is_admin: bool):
+    return SimpleNamespace(id=uuid.uuid4(), is_active=True, is_admin=is_admin)
+
+
+@pytest.fixture
+def as_user():
+    def _login(is_admin: bool):
+        app.dependency_overrides[get_current_user] = lambda: _user(is_admin)
+
+    yield _login
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+def test_pool_metrics_histogram_buckets():
+    """[POS] Esperas caem no bucket certo e timeouts são contados à parte."""
+    metrics = PoolMetrics(buckets_ms=(1, 10))
+    metrics.record_wait(0.5)
+    metrics.record_wait(7)
+    metrics.record_wait(50)
+    metrics.record_timeout()
+
+    snap = metrics.snapshot()
+    assert snap["checkouts"] == 3
+    assert snap["checkout_timeouts"] == 1
+    assert snap["wait_max_ms"] == 50
+    assert snap["wait_histogram_ms"] == {"le_1ms": 1, "le_10ms": 1, "inf": 1}
+
+
+def test_instrumented_pool_records_checkouts(tmp_path):
+    """[POS] Cada checkout é medido e as métricas sobrevivem ao dispose()."""
+
+    async def _run():
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+            poolclass=InstrumentedAsyncQueuePool,
+        )
+        for _ in range(2):
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+        await engine.dispose()
+        return engine.pool.metrics.snapshot()
+
+    snap = asyncio.run(_run())
+    assert snap["checkouts"] == 2
+    assert snap["checkout_timeouts"] == 0
+
+
+def test_pool_endpoint_admin(as_user):
+    """[POS] Admin consegue ler o estado do pool."""
+    as_user(is_admin=True)
+    resp = client.get(f"{BASE}/db/pool")
+
+    assert resp.status_code == 200
+    data = resp.json()["primary"]
+    assert data["pool_class"] == "InstrumentedAsyncQueuePool"
+    assert "checked_out" in data
+    assert "wait_histogram_ms" in data
+
+
+def test_pool_endpoint_forbidden_for_non_admin(as_user):
+    """[NEG] Usuário comum recebe 403."""
+    as_user(is_admin=False)
+    resp = client.get(f"{BASE}/db/pool")
+
+    assert resp.status_code == 403
@@ -0,0 +1,85 @@
+import random
+import uuid
+
+from models.models import SportsCenter
+from utils.geo import covering_cells, geohash_encode, haversine_km
+
+API_PREFIX = "/api/v1"
+NEARBY_ROUTE = f"{API_PREFIX}/sports_center/nearby"
+
+# Praça Tubal Vilela, Uberlândia
+ORIGIN = (-18.9186, -48.2772)
+
+
+def test_haversine_km():
+    """[POS] Distância conhecida: Uberlândia -> Uberaba ~ 95 km."""
+    assert 90 < haversine_km(-18.9186, -48.2772, -19.7483, -47.9319) < 100
+    assert haversine_km(*ORIGIN, *ORIGIN) == 0
+
+
+def test_covering_cells_cobrem_o_circulo():
+    """[POS] Todo ponto dentro do raio cai num dos prefixos de cobertura."""
+    rnd = random.Random(42)
+    for _ in range(200):
+        lat, lon = rnd.uniform(-60, 60), rnd.uniform(-170, 170)
+        radius = rnd.choice([0.5, 2, 10, 50])
+        cells = covering_cells(lat, lon, radius)
+        assert len(cells) <= 16
+        for _ in range(20):
+            plat = lat + rnd.uniform(-1, 1) * radius / 111
+            plon = lon + rnd.uniform(-1, 1) * radius / 111
+            if haversine_km(lat, lon, plat, plon) <= radius:
+                gh = geohash_encode(plat, plon)
+                assert any(gh.startswith(c) for c in cells)
+
+
+def _center(db_session, name, lat, lon):
+    center = SportsCenter(
+        user_id=uuid.uuid4(),
+        name=name,
+        cnpj=str(random.randint(10**13, 10**14 - 1)),
+        latitude=lat,
+        longitude=lon,
+    )
+    db_session.add(center)
+    return center
+
+
+def test_nearby_ordena_por_distancia(client, db_session):
+    """[POS] /nearby filtra pelo raio e ordena do mais perto ao mais longe."""
+    _center(db_session, "Longe", -18.9500, -48.2772)  # ~3,5 km
+    _center(db_session, "Perto", -18.9200, -48.2772)  # ~150 m
+    _center(db_session, "Fora", -19.7483, -47.9319)  # Uberaba
+    db_session.commit()
+
+    resp = client.get(
+        NEARBY_ROUTE, params={"lat": ORIGIN[0], "lon": ORIGIN[1], "radius_km": 5}
+    )
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert [item["sports_center"]["name"] for item in data] == ["Perto", "Longe"]
+    assert data[0]["distance_km"] < data[1]["distance_km"] <= 5
+
+
+def test_nearby_respeita_limit(client, db_session):
+    """[POS] limit corta a lista nos k mais próximos."""
+    for i in range(5):
+        _center(db_session, f"C{i}", ORIGIN[0] + i * 0.001, ORIGIN[1])
+    db_session.commit()
+
+    resp = client.get(
+        NEARBY_ROUTE, params={"lat": ORIGIN[0], "lon": ORIGIN[1], "limit": 2}
+    )
+
+    assert resp.status_code == 200
+    assert [item["sports_center"]["name"] for item in resp.json()] == ["C0", "C1"]
+
+
+def test_nearby_parametros_invalidos(client):
+    """[NEG] Latitude fora do intervalo ou raio não positivo -> 422."""
+    assert client.get(NEARBY_ROUTE, params={"lat": 91, "lon": 0}).status_code == 422
+    assert (
+        client.get(NEARBY_ROUTE, params={"lat": 0, "lon": 0, "radius_km": 0}).status_code
+        == 422
+    )
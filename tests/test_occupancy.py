@@ -0,0 +1,195 @@
+import random
+import uuid
+from datetime import datetime, time, timedelta
+
+import numpy as np
+import pytest
+
+from models.models import Availability, Booking, Field, SportsCenter
+from services.occupancy_service import (
+    SLOTS_PER_DAY,
+    availability_bits,
+    booking_bits,
+    interval_masks,
+    occupancy_index,
+    week_start,
+)
+
+API_PREFIX = "/api/v1"
+FREE_ROUTE = f"{API_PREFIX}/field/free"
+BOOKING_ROUTE = f"{API_PREFIX}/bookings"
+
+# 19/10/2026 é segunda-feira (day_of_week = 1); a semana começa no domingo 18
+MONDAY = datetime(2026, 10, 19)
+HOUR = timedelta(hours=1)
+ORIGIN = (-18.9186, -48.2772)
+
+
+@pytest.fixture(autouse=True)
+def _clear_occupancy():
+    # IDs são reaproveitados entre testes no SQLite
+    occupancy_index.clear()
+    yield
+    occupancy_index.clear()
+
+
+def test_week_start_e_domingo():
+    """[POS] A semana começa no domingo 00:00."""
+    assert week_start(MONDAY + 15 * HOUR) == datetime(2026, 10, 18)
+    assert week_start(datetime(2026, 10, 18, 23, 59)) == datetime(2026, 10, 18)
+    assert week_start(datetime(2026, 10, 24, 23, 59)) == datetime(2026, 10, 18)
+
+
+def test_bits_conservadores():
+    """[POS] Janela libera só slots inteiros; reserva ocupa todo slot tocado."""
+    bits = availability_bits([(1, time(8, 10), time(9, 50))])
+    monday = SLOTS_PER_DAY
+    assert np.flatnonzero(bits).tolist() == list(range(monday + 33, monday + 39))
+
+    week = week_start(MONDAY)
+    start = MONDAY + 8 * HOUR + timedelta(minutes=10)
+    bits = booking_bits([(start, MONDAY + 9 * HOUR)], week)
+    assert np.flatnonzero(bits).tolist() == list(range(monday + 32, monday + 36))
+
+
+def test_janela_de_sabado_volta_ao_domingo():
+    """[POS] Sábado 22h-02h ocupa o fim do sábado e o começo do domingo."""
+    bits = availability_bits([(6, time(22), time(2))])
+    on = np.flatnonzero(bits).tolist()
+    assert on == list(range(8)) + list(range(7 * SLOTS_PER_DAY - 8, 7 * SLOTS_PER_DAY))
+
+
+def test_intervalo_cruzando_semanas():
+    """[POS] Sábado 23h -> domingo 01h gera máscara em duas semanas."""
+    saturday = datetime(2026, 10, 24, 23)
+    masks = interval_masks(saturday, saturday + 2 * HOUR)
+    assert [w for w, _ in masks] == [datetime(2026, 10, 18), datetime(2026, 10, 25)]
+    assert [int(np.unpackbits(m).sum()) for _, m in masks] == [4, 4]
+
+
+def _setup(db_session, n_fields=3):
+    center = SportsCenter(
+        user_id=uuid.uuid4(), name="Centro", cnpj="44444444000144",
+        latitude=ORIGIN[0] + 0.001, longitude=ORIGIN[1],
+    )
+    db_session.add(center)
+    db_session.flush()
+    fields = []
+    for i in range(n_fields):
+        field = Field(center.id, f"Campo {i}", "futebol" if i else "volei", 100)
+        db_session.add(field)
+        db_session.flush()
+        db_session.add(
+            Availability(field.id, 1, datetime(2026, 1, 1, 18), datetime(2026, 1, 1, 23))
+        )
+        fields.append(field)
+    db_session.commit()
+    return center, fields
+
+
+def _search(client, start, duration=60, **params):
+    resp = client.get(
+        FREE_ROUTE,
+        params={
+            "start": start.isoformat(),
+            "duration": duration,
+            "lat": ORIGIN[0],
+            "lon": ORIGIN[1],
+            **params,
+        },
+    )
+    assert resp.status_code == 200
+    return [r["field_id"] for r in resp.json()]
+
+
+def test_busca_multi_campo(client, db_session):
+    """[POS] /field/free exclui campos reservados, fora da janela ou de outro tipo."""
+    _, fields = _setup(db_session)
+    db_session.add(
+        Booking(uuid.uuid4(), fields[1].id, 1, MONDAY + 19 * HOUR, MONDAY + 20 * HOUR)
+    )
+    db_session.add(
+        Booking(
+            uuid.uuid4(), fields[2].id, 1, MONDAY + 19 * HOUR, MONDAY + 20 * HOUR,
+            "cancelled",
+        )
+    )
+    db_session.commit()
+    ids = [f.id for f in fields]
+
+    assert _search(client, MONDAY + 19 * HOUR) == [ids[0], ids[2]]
+    assert _search(client, MONDAY + 20 * HOUR) == ids
+    assert _search(client, MONDAY + 22 * HOUR, duration=90) == []
+    assert _search(client, MONDAY + 12 * HOUR) == []
+    assert _search(client, MONDAY + 19 * HOUR, field_type="futebol") == [ids[2]]
+
+
+def test_cache_acompanha_escritas(client, db_session):
+    """[POS] Criar, mover e apagar reservas pela API atualiza a busca em cache."""
+    _, fields = _setup(db_session, n_fields=1)
+    field_id = fields[0].id
+    slot = MONDAY + 19 * HOUR
+    assert _search(client, slot) == [field_id]
+
+    payload = {
+        "user_id": str(uuid.uuid4()),
+        "field_id": field_id,
+        "start_time": slot.isoformat(),
+        "end_time": (slot + HOUR).isoformat(),
+    }
+    booking_id = client.post(f"{BOOKING_ROUTE}/create", json=payload).json()["id"]
+    assert _search(client, slot) == []
+
+    payload["start_time"] = (slot + 2 * HOUR).isoformat()
+    payload["end_time"] = (slot + 3 * HOUR).isoformat()
+    assert client.patch(f"{BOOKING_ROUTE}/{booking_id}", json=payload).status_code == 200
+    assert _search(client, slot) == [field_id]
+    assert _search(client, slot + 2 * HOUR) == []
+
+    assert client.delete(f"{BOOKING_ROUTE}/{booking_id}").status_code == 200
+    assert _search(client, slot + 2 * HOUR) == [field_id]
+
+    # Apagar o campo descarta as janelas dele, como no delete em lote
+    assert client.delete(f"{API_PREFIX}/field/{field_id}").status_code == 200
+    assert occupancy_index.available.get(field_id) is None
+
+
+def test_bitmap_igual_a_checagem_por_linha():
+    """[POS] Disponível AND NOT reservado bate com a checagem intervalo a intervalo."""
+    rnd = random.Random(7)
+    week = week_start(MONDAY)
+    for _ in range(200):
+        windows = [
+            (rnd.randrange(7), time(rnd.randrange(24), rnd.choice([0, 15, 30, 45])),
+             time(rnd.randrange(24), rnd.choice([0, 15, 30, 45])))
+            for _ in range(rnd.randrange(1, 4))
+        ]
+        busy = []
+        for _ in range(rnd.randrange(4)):
+            s = week + timedelta(minutes=15 * rnd.randrange(7 * SLOTS_PER_DAY - 8))
+            busy.append((s, s + timedelta(minutes=15 * rnd.randrange(1, 8))))
+        start = week + timedelta(minutes=15 * rnd.randrange(7 * SLOTS_PER_DAY - 8))
+        end = start + timedelta(minutes=15 * rnd.randrange(1, 8))
+
+        available = availability_bits(windows)
+        booked = booking_bits(busy, week)
+        query = booking_bits([(start, end)], week)
+        got = bool(((available & ~booked & query) == query).all())
+
+        def inside(t):
+            for dow, ws, we in windows:
+                day = week + timedelta(days=dow)
+                a = day + timedelta(hours=ws.hour, minutes=ws.minute)
+                b = day + timedelta(hours=we.hour, minutes=we.minute)
+                if b <= a:
+                    b += timedelta(days=1)
+                for shift in (timedelta(0), timedelta(days=7), -timedelta(days=7)):
+                    if a + shift <= t < b + shift:
+                        return True
+            return False
+
+        t, expected = start, True
+        while t < end:
+            expected &= inside(t) and not any(bs <= t < be for bs, be in busy)
+            t += timedelta(minutes=15)
+        assert got == expected
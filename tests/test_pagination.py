@@ -0,0 +1,215 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from main import app
+from models.models import Booking, Field, Review, SportsCenter
+from services.geocoding_service import BoundingBox, get_geocoder
+from services.spatial_index import spatial_index
+from utils.pagination import decode_cursor, encode_cursor
+from utils.security import AuthPrincipal, get_current_user
+
+API_PREFIX = "/api/v1"
+CENTER_ROUTE = f"{API_PREFIX}/sports_center"
+BOOKING_ROUTE = f"{API_PREFIX}/bookings"
+
+T0 = datetime(2026, 10, 19, 8)
+
+
+def _walk(client, url, limit, **extra):
+    """Segue X-Next-Cursor até o fim; devolve as páginas."""
+    pages, params = [], {"limit": limit, **extra}
+    while True:
+        resp = client.get(url, params=params)
+        assert resp.status_code == 200
+        pages.append(resp.json())
+        assert len(pages) < 100, "cursor não avança"
+        cursor = resp.headers.get("X-Next-Cursor")
+        if cursor is None:
+            assert "Link" not in resp.headers
+            return pages
+        assert 'rel="next"' in resp.headers["Link"]
+        params = {"limit": limit, "cursor": cursor, **extra}
+
+
+def _centers(db_session, owner, n, lat=-18.9):
+    centers = [
+        SportsCenter(
+            user_id=owner, name=f"Centro {i}", cnpj=f"{i:014d}",
+            latitude=lat + i * 1e-4, longitude=-48.2,
+        )
+        for i in range(n)
+    ]
+    db_session.add_all(centers)
+    db_session.commit()
+    return centers
+
+
+def test_cursor_ida_e_volta():
+    """[POS] O cursor é opaco e preserva datetime e int."""
+    values = (T0, 42)
+    cursor = encode_cursor(values)
+    assert "42" not in cursor
+    assert decode_cursor(cursor, (datetime, int)) == values
+
+
+@pytest.mark.parametrize("cursor", ["lixo", encode_cursor([1, 2]), "W3siYSI6MX1d"])
+def test_cursor_invalido(client, cursor):
+    """[NEG] Cursor malformado ou com aridade errada -> 400."""
+    resp = client.get(
+        f"{CENTER_ROUTE}/all/{uuid.uuid4()}", params={"cursor": cursor}
+    )
+    assert resp.status_code == 400
+
+
+def test_centros_do_dono_paginados(client, db_session):
+    """[POS] 120 centros em páginas de 50: sem repetição nem buraco, em ordem de id."""
+    owner = uuid.uuid4()
+    centers = _centers(db_session, owner, 120)
+
+    pages = _walk(client, f"{CENTER_ROUTE}/all/{owner}", 50)
+
+    assert [len(p) for p in pages] == [50, 50, 20]
+    ids = [c["id"] for page in pages for c in page]
+    assert ids == sorted(c.id for c in centers)
+
+
+def test_limite_maximo(client):
+    """[NEG] limit acima do teto -> 422."""
+    resp = client.get(f"{CENTER_ROUTE}/all/{uuid.uuid4()}", params={"limit": 1000})
+    assert resp.status_code == 422
+
+
+@pytest.mark.parametrize("use_index", [False, True])
+def test_centros_da_cidade_paginados(client, db_session, use_index):
+    """[POS] Busca por cidade pagina por id, no banco ou pelo índice em memória."""
+    centers = _centers(db_session, uuid.uuid4(), 7)
+    if use_index:
+        spatial_index.build(
+            {c.id: (float(c.latitude), float(c.longitude)) for c in centers}
+        )
+
+    class _Geocoder:
+        async def geocode_city(self, city):
+            return BoundingBox(-19.0, -18.0, -49.0, -48.0)
+
+    app.dependency_overrides[get_geocoder] = lambda: _Geocoder()
+    try:
+        pages = _walk(client, f"{CENTER_ROUTE}/city/Uberlandia", 3)
+    finally:
+        app.dependency_overrides.pop(get_geocoder, None)
+        spatial_index.clear()
+
+    assert [len(p) for p in pages] == [3, 3, 1]
+    assert [c["id"] for p in pages for c in p] == [c.id for c in centers]
+
+
+def test_campos_do_centro(client, db_session):
+    """[POS] /sports_center/{id}/fields lista só os campos daquele centro."""
+    center, other = _centers(db_session, uuid.uuid4(), 2)
+    db_session.add_all(Field(center.id, f"Campo {i}", "futebol", 100) for i in range(5))
+    db_session.add(Field(other.id, "Outro", "futebol", 100))
+    db_session.commit()
+
+    pages = _walk(client, f"{CENTER_ROUTE}/{center.id}/fields", 2)
+
+    names = [f["name"] for p in pages for f in p]
+    assert names == [f"Campo {i}" for i in range(5)]
+
+
+def test_reservas_do_usuario_mais_recentes_primeiro(client, db_session):
+    """[POS] Empates em start_time são desempatados pelo id, sem perder linhas."""
+    user = uuid.uuid4()
+    for field_id in range(1, 4):
+        for day in range(3):
+            start = T0 + timedelta(days=day)
+            db_session.add(
+                Booking(user, field_id, 1, start, start + timedelta(hours=1))
+            )
+    db_session.add(Booking(uuid.uuid4(), 9, 1, T0, T0 + timedelta(hours=1)))
+    db_session.commit()
+
+    app.dependency_overrides[get_current_user] = lambda: AuthPrincipal(user, True, False)
+    try:
+        pages = _walk(client, f"{BOOKING_ROUTE}/user/{user}", 2)
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+
+    items = [b for p in pages for b in p]
+    assert len(items) == 9
+    keys = [(b["start_time"], b["id"]) for b in items]
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_reservas_do_usuario_exigem_o_proprio_usuario(client):
+    """[NEG] Sem token -> 401; outro usuário -> 403; admin pode ver."""
+    user = uuid.uuid4()
+    url = f"{BOOKING_ROUTE}/user/{user}"
+    assert client.get(url).status_code == 401
+
+    try:
+        app.dependency_overrides[get_current_user] = lambda: AuthPrincipal(
+            uuid.uuid4(), True, False
+        )
+        assert client.get(url).status_code == 403
+        app.dependency_overrides[get_current_user] = lambda: AuthPrincipal(
+            uuid.uuid4(), True, True
+        )
+        assert client.get(url).status_code == 200
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+
+
+def test_reviews_do_centro_mais_novas_primeiro(client, db_session):
+    """[POS] Reviews do centro em ordem decrescente de created_at, id."""
+    center, other = _centers(db_session, uuid.uuid4(), 2)
+    for i in range(6):
+        review = Review(center.id, uuid.uuid4(), 1 + i % 5, f"review {i}")
+        review.created_at = T0 + timedelta(minutes=i // 2)  # pares empatados
+        db_session.add(review)
+    db_session.add(Review(other.id, uuid.uuid4(), 5))
+    db_session.commit()
+
+    pages = _walk(client, f"{CENTER_ROUTE}/{center.id}/reviews", 4)
+
+    assert [len(p) for p in pages] == [4, 2]
+    comments = [r["comment"] for p in pages for r in p]
+    assert comments == [f"review {i}" for i in (5, 4, 3, 2, 1, 0)]
+
+
+def test_reviews_com_created_at_do_banco(client, db_session):
+    """[POS] created_at pelo server_default (segundos no SQLite): empates não repetem."""
+    (center,) = _centers(db_session, uuid.uuid4(), 1)
+    db_session.add_all(
+        Review(center.id, uuid.uuid4(), 5, f"review {i}") for i in range(7)
+    )
+    db_session.commit()
+
+    pages = _walk(client, f"{CENTER_ROUTE}/{center.id}/reviews", 2)
+
+    items = [r for p in pages for r in p]
+    assert sorted(r["comment"] for r in items) == [f"review {i}" for i in range(7)]
+    keys = [(r["created_at"], r["id"]) for r in items]
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_reviews_filtradas_por_nota(client, db_session):
+    """[POS] ?rating= filtra as notas e continua paginando pelo keyset."""
+    (center,) = _centers(db_session, uuid.uuid4(), 1)
+    for i in range(10):
+        review = Review(center.id, uuid.uuid4(), 1 + i % 5, f"review {i}")
+        review.created_at = T0 + timedelta(minutes=i)
+        db_session.add(review)
+    db_session.commit()
+
+    pages = _walk(client, f"{CENTER_ROUTE}/{center.id}/reviews", 3, rating=[1, 5])
+
+    comments = [r["comment"] for p in pages for r in p]
+    assert comments == ["review 9", "review 5", "review 4", "review 0"]
+
+
+def test_reviews_nota_invalida(client):
+    """[NEG] rating fora de 1..5 -> 422."""
+    resp = client.get(f"{CENTER_ROUTE}/1/reviews", params={"rating": 7})
+    assert resp.status_code == 422
@@ -0,0 +1,91 @@
+import asyncio
+import uuid
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from models.models import Review, SportsCenter
+from services.rating_service import recompute_ratings
+
+API_PREFIX = "/api/v1"
+REVIEW_ROUTE = f"{API_PREFIX}/review"
+CENTER_ROUTE = f"{API_PREFIX}/sports_center"
+
+
+def _center(db_session, cnpj):
+    center = SportsCenter(
+        user_id=uuid.uuid4(), name="Centro", cnpj=cnpj, latitude=-18.9, longitude=-48.2
+    )
+    db_session.add(center)
+    db_session.commit()
+    return center
+
+
+def _review(client, center_id, rating):
+    resp = client.post(
+        f"{REVIEW_ROUTE}/create",
+        json={
+            "user_id": str(uuid.uuid4()),
+            "sports_center_id": center_id,
+            "rating": rating,
+        },
+    )
+    assert resp.status_code == 201
+    return resp.json()["id"]
+
+
+def test_agregado_acompanha_criacao_e_remocao(client, db_session):
+    """[POS] Criar e apagar reviews ajusta contagem, soma e histograma."""
+    center = _center(db_session, "77777777000177")
+    ids = [_review(client, center.id, r) for r in (5, 4, 5, 1)]
+
+    data = client.get(f"{CENTER_ROUTE}/{center.id}").json()
+    assert (data["rating_count"], data["rating_sum"]) == (4, 15)
+    assert [data[f"stars_{s}"] for s in range(1, 6)] == [1, 0, 0, 1, 2]
+
+    assert client.delete(f"{REVIEW_ROUTE}/{ids[0]}").status_code == 200
+    db_session.expire_all()
+    center = db_session.get(SportsCenter, center.id)
+    assert (center.rating_count, center.rating_sum) == (3, 10)
+    assert center.rating_histogram == {1: 1, 2: 0, 3: 0, 4: 1, 5: 1}
+    assert center.rating_average == 3.33
+
+
+def test_review_de_centro_inexistente(client, db_session):
+    """[NEG] Review para centro que não existe não é gravada."""
+    resp = client.post(
+        f"{REVIEW_ROUTE}/create",
+        json={"user_id": str(uuid.uuid4()), "sports_center_id": 999999, "rating": 5},
+    )
+    assert resp.status_code == 409
+    assert db_session.query(Review).count() == 0
+
+
+def test_centro_sem_reviews(db_session):
+    """[POS] Centro novo começa zerado e sem média."""
+    center = _center(db_session, "88888888000188")
+    assert (center.rating_count, center.rating_sum, center.rating_average) == (0, 0, None)
+
+
+def test_recompute_corrige_divergencias(db_session, async_engine):
+    """[POS] O reparo em lotes recalcula a partir de reviews e conta os corrigidos."""
+    centers = [_center(db_session, f"{i:014d}") for i in range(5)]
+    for center in centers[:3]:
+        for rating in (2, 4):
+            db_session.add(Review(center.id, uuid.uuid4(), rating))
+    centers[3].rating_count = 10  # sem reviews, mas com agregado sujo
+    db_session.commit()
+
+    async def run():
+        sessionmaker = async_sessionmaker(async_engine, expire_on_commit=False)
+        async with sessionmaker() as session:
+            return await recompute_ratings(session, batch_size=2)
+
+    assert asyncio.run(run()) == 4
+    assert asyncio.run(run()) == 0
+
+    db_session.expire_all()
+    for center in centers[:3]:
+        center = db_session.get(SportsCenter, center.id)
+        assert (center.rating_count, center.rating_sum) == (2, 6)
+        assert center.rating_histogram == {1: 0, 2: 1, 3: 0, 4: 1, 5: 0}
+    assert db_session.get(SportsCenter, centers[3].id).rating_count == 0
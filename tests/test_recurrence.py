@@ -0,0 +1,209 @@
+import time as clock
+import uuid
+from datetime import date, datetime, time, timedelta
+
+from models.models import Availability, Booking, Field, SportsCenter
+from services.booking_service import find_conflicts
+from utils.recurrence import expand_weekly, first_overlap
+
+API_PREFIX = "/api/v1"
+AVAILABILITY_ROUTE = f"{API_PREFIX}/availability"
+BOOKING_ROUTE = f"{API_PREFIX}/bookings"
+
+# 19/10/2026 é segunda-feira
+MONDAY = date(2026, 10, 19)
+
+
+def _center_with_fields(db_session, n_fields):
+    center = SportsCenter(
+        user_id=uuid.uuid4(), name="Centro", cnpj="55555555000155",
+        latitude=-18.9, longitude=-48.2,
+    )
+    db_session.add(center)
+    db_session.flush()
+    fields = [Field(center.id, f"Campo {i}", "futebol", 100) for i in range(n_fields)]
+    db_session.add_all(fields)
+    db_session.commit()
+    return center, fields
+
+
+def test_expand_weekly_com_excecoes():
+    """[POS] Segundas e quartas de um mês, menos um feriado, em ordem."""
+    occurrences = expand_weekly(
+        [3, 1], time(19), time(20), MONDAY, MONDAY + timedelta(days=27),
+        except_dates=[MONDAY + timedelta(days=7)],
+    )
+    starts = [s for s, _ in occurrences]
+    assert len(starts) == 7
+    assert starts == sorted(starts)
+    assert datetime(2026, 10, 26, 19) not in starts
+    assert all(s.isoweekday() % 7 in (1, 3) for s in starts)
+
+
+def test_expand_weekly_atravessa_meia_noite():
+    """[POS] Janela 23h-01h termina no dia seguinte."""
+    (start, end), = expand_weekly([1], time(23), time(1), MONDAY, MONDAY)
+    assert (start, end) == (datetime(2026, 10, 19, 23), datetime(2026, 10, 20, 1))
+
+
+def test_first_overlap():
+    """[NEG] Ocorrência que começa antes do fim da anterior é apontada."""
+    h = lambda n: datetime(2026, 10, 19) + timedelta(hours=n)  # noqa: E731
+    assert first_overlap([(h(0), h(2)), (h(2), h(3)), (h(24), h(26))]) is None
+    assert first_overlap([(h(0), h(2)), (h(1), h(3))]) == 1
+
+
+def test_find_conflicts():
+    """[POS] Só ocorrências que cruzam uma reserva são marcadas."""
+    h = lambda n: datetime(2026, 10, 19) + timedelta(hours=n)  # noqa: E731
+    occurrences = [(h(0), h(1)), (h(2), h(3)), (h(4), h(5)), (h(6), h(7))]
+    busy = [(h(1), h(2)), (h(2.5), h(4.5)), (h(7), h(8))]
+    assert find_conflicts(occurrences, busy) == [1, 2]
+
+
+def test_disponibilidade_em_lote_para_o_centro(client, db_session):
+    """[POS] Padrão semanal para todos os campos; repetir não duplica."""
+    center, fields = _center_with_fields(db_session, 3)
+    payload = {
+        "sports_center_id": center.id,
+        "windows": [
+            {"day_of_week": d, "start": "18:00", "end": "23:00"} for d in range(7)
+        ],
+        "starts_on": MONDAY.isoformat(),
+    }
+
+    resp = client.post(f"{AVAILABILITY_ROUTE}/weekly", json=payload)
+    assert resp.status_code == 201
+    assert resp.json() == {"fields": 3, "created": 21, "skipped": 0}
+
+    resp = client.post(f"{AVAILABILITY_ROUTE}/weekly", json=payload)
+    assert resp.json() == {"fields": 3, "created": 0, "skipped": 21}
+
+    rows = db_session.query(Availability).filter_by(day_of_week=0).all()
+    assert len(rows) == 3
+    assert {r.start_time for r in rows} == {datetime(2026, 10, 25, 18)}
+
+
+def test_disponibilidade_em_lote_campo_inexistente(client, db_session):
+    """[NEG] field_ids desconhecido -> 404; alvo ambíguo -> 422."""
+    _, fields = _center_with_fields(db_session, 1)
+    window = [{"day_of_week": 1, "start": "08:00", "end": "12:00"}]
+
+    resp = client.post(
+        f"{AVAILABILITY_ROUTE}/weekly",
+        json={"field_ids": [fields[0].id, 999999], "windows": window},
+    )
+    assert resp.status_code == 404
+
+    resp = client.post(f"{AVAILABILITY_ROUTE}/weekly", json={"windows": window})
+    assert resp.status_code == 422
+
+
+def _recurrence(field_id, **overrides):
+    payload = {
+        "user_id": str(uuid.uuid4()),
+        "field_id": field_id,
+        "days_of_week": [1, 3],
+        "start": "19:00",
+        "end": "20:00",
+        "starts_on": MONDAY.isoformat(),
+        "ends_on": (MONDAY + timedelta(days=90)).isoformat(),
+    }
+    payload.update(overrides)
+    return payload
+
+
+def test_reservas_recorrentes_pulam_conflitos(client, db_session):
+    """[POS] Série de uma temporada pula o horário já reservado e o feriado."""
+    _, fields = _center_with_fields(db_session, 1)
+    field_id = fields[0].id
+    taken = datetime(2026, 11, 4, 19, 30)  # quarta
+    db_session.add(Booking(uuid.uuid4(), field_id, 3, taken, taken + timedelta(hours=1)))
+    db_session.commit()
+
+    resp = client.post(
+        f"{BOOKING_ROUTE}/recurring",
+        json=_recurrence(field_id, except_dates=["2026-11-02"]),
+    )
+
+    assert resp.status_code == 201
+    data = resp.json()
+    assert data["requested"] == 25
+    assert data["created"] == 24 == len(data["ids"])
+    assert data["conflicts"] == [
+        {"start": "2026-11-04T19:00:00", "end": "2026-11-04T20:00:00"}
+    ]
+    assert db_session.query(Booking).count() == 25
+    created = db_session.get(Booking, data["ids"][0])
+    assert (created.start_time, created.day_of_week) == (datetime(2026, 10, 19, 19), 1)
+
+
+def test_reservas_recorrentes_tudo_ou_nada(client, db_session):
+    """[NEG] skip_conflicts=false com conflito -> 409 e nada é gravado."""
+    _, fields = _center_with_fields(db_session, 1)
+    field_id = fields[0].id
+    start = datetime(2026, 10, 21, 19)
+    db_session.add(Booking(uuid.uuid4(), field_id, 3, start, start + timedelta(hours=1)))
+    db_session.commit()
+
+    resp = client.post(
+        f"{BOOKING_ROUTE}/recurring", json=_recurrence(field_id, skip_conflicts=False)
+    )
+
+    assert resp.status_code == 409
+    assert db_session.query(Booking).count() == 1
+
+
+def test_reservas_recorrentes_regra_invalida(client):
+    """[NEG] Fim antes do início ou intervalo acima do máximo -> 422."""
+    resp = client.post(
+        f"{BOOKING_ROUTE}/recurring",
+        json=_recurrence(1, ends_on=(MONDAY - timedelta(days=1)).isoformat()),
+    )
+    assert resp.status_code == 422
+
+    resp = client.post(
+        f"{BOOKING_ROUTE}/recurring",
+        json=_recurrence(1, ends_on=(MONDAY + timedelta(days=400)).isoformat()),
+    )
+    assert resp.status_code == 422
+
+
+def test_reservas_recorrentes_atravessando_meia_noite(client, db_session):
+    """[POS] 22h-02h todos os dias: cada noite termina antes da próxima começar."""
+    _, fields = _center_with_fields(db_session, 1)
+
+    resp = client.post(
+        f"{BOOKING_ROUTE}/recurring",
+        json=_recurrence(
+            fields[0].id,
+            days_of_week=list(range(7)),
+            start="22:00",
+            end="02:00",
+            ends_on=(MONDAY + timedelta(days=13)).isoformat(),
+        ),
+    )
+
+    assert resp.status_code == 201
+    assert resp.json()["created"] == 14
+    assert resp.json()["conflicts"] == []
+
+
+def test_temporada_inteira_em_menos_de_um_segundo(client, db_session):
+    """[POS] Um ano de reservas diárias (366 linhas) numa requisição só."""
+    _, fields = _center_with_fields(db_session, 1)
+
+    t0 = clock.perf_counter()
+    resp = client.post(
+        f"{BOOKING_ROUTE}/recurring",
+        json=_recurrence(
+            fields[0].id,
+            days_of_week=list(range(7)),
+            ends_on=(MONDAY + timedelta(days=365)).isoformat(),
+        ),
+    )
+    elapsed = clock.perf_counter() - t0
+
+    assert resp.status_code == 201
+    assert resp.json()["created"] == 366
+    assert elapsed < 1.0
@@ -0,0 +1,54 @@
+import uuid
+
+from schemas.field_schemas import FieldResponse
+from schemas.sports_center_schemas import SportsCenterResponse
+
+API_PREFIX = "/api/v1"
+CENTER_ROUTE = f"{API_PREFIX}/sports_center"
+FIELD_ROUTE = f"{API_PREFIX}/field"
+
+
+def test_resposta_segue_o_schema(client, db_session):
+    """[POS] GET devolve só os campos do response_model, sem colunas internas."""
+    user_id = str(uuid.uuid4())
+    resp = client.post(
+        f"{CENTER_ROUTE}/create",
+        json={
+            "user_id": user_id,
+            "name": "Centro",
+            "cnpj": "12345678000190",
+            "latitude": -18.9186,
+            "longitude": -48.2772,
+        },
+    )
+    center_id = resp.json()["id"]
+    resp = client.post(
+        f"{FIELD_ROUTE}/create",
+        json={
+            "sports_center_id": center_id,
+            "name": "Quadra",
+            "field_type": "futsal",
+            "price_per_hour": 100,
+        },
+    )
+    field_id = resp.json()["id"]
+
+    resp = client.get(f"{CENTER_ROUTE}/{center_id}")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/json"
+    body = resp.json()
+    assert set(body) == set(SportsCenterResponse.model_fields)
+    assert "geohash" not in body
+    assert body["user_id"] == user_id
+    assert body["latitude"] == -18.9186
+
+    resp = client.get(f"{FIELD_ROUTE}/{field_id}")
+    assert set(resp.json()) == set(FieldResponse.model_fields)
+    assert resp.json()["price_per_hour"] == 100
+
+
+def test_lista_vazia_nao_quebra_o_schema(client, db_session):
+    """[NEG] Página vazia de campos responde lista vazia, não erro de validação."""
+    resp = client.get(f"{CENTER_ROUTE}/999/fields")
+    assert resp.status_code == 200
+    assert resp.json() == []
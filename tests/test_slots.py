@@ -0,0 +1,137 @@
+import random
+import uuid
+from datetime import datetime, time, timedelta
+
+from models.models import Availability, Booking, Field, SportsCenter
+from services.slot_service import compute_free_slots
+
+API_PREFIX = "/api/v1"
+FIELD_ROUTE = f"{API_PREFIX}/field"
+
+# 19/10/2026 é segunda-feira (day_of_week = 1)
+MONDAY = datetime(2026, 10, 19)
+HOUR = timedelta(hours=1)
+
+
+def _brute_force(windows, busy, start, end, min_duration):
+    """Referência minuto a minuto."""
+    free_minutes = []
+    t = start
+    while t < end:
+        dow = (t.weekday() + 1) % 7
+        inside = False
+        for w_dow, w_start, w_end in windows:
+            for day_shift in (0, 1):  # janela de ontem que atravessa a meia-noite
+                day = (t - timedelta(days=day_shift)).replace(hour=0, minute=0)
+                if (dow - day_shift) % 7 != w_dow:
+                    continue
+                ws = day + timedelta(hours=w_start.hour, minutes=w_start.minute)
+                we = day + timedelta(hours=w_end.hour, minutes=w_end.minute)
+                if we <= ws:
+                    we += timedelta(days=1)
+                inside = inside or ws <= t < we
+        booked = any(bs <= t < be for bs, be in busy)
+        free_minutes.append(inside and not booked)
+        t += timedelta(minutes=1)
+
+    runs, run_start = [], None
+    for i, is_free in enumerate(free_minutes + [False]):
+        if is_free and run_start is None:
+            run_start = i
+        elif not is_free and run_start is not None:
+            s = start + timedelta(minutes=run_start)
+            e = start + timedelta(minutes=i)
+            if e - s >= min_duration:
+                runs.append((s, e))
+            run_start = None
+    return runs
+
+
+def test_janela_menos_reservas():
+    """[POS] Segunda 08-12 com reserva 09-10 -> livres 08-09 e 10-12."""
+    windows = {1: [(1, time(8), time(12))]}
+    busy = {1: [(MONDAY + 9 * HOUR, MONDAY + 10 * HOUR)]}
+
+    slots = compute_free_slots(windows, busy, MONDAY, MONDAY + 7 * 24 * HOUR, HOUR)
+
+    assert slots == {
+        1: [
+            (MONDAY + 8 * HOUR, MONDAY + 9 * HOUR),
+            (MONDAY + 10 * HOUR, MONDAY + 12 * HOUR),
+        ]
+    }
+
+
+def test_duracao_minima_e_recorte_do_intervalo():
+    """[POS] Sobras menores que a duração somem; o range recorta as janelas."""
+    windows = {1: [(1, time(8), time(12))]}
+    busy = {1: [(MONDAY + 8.5 * HOUR, MONDAY + 11.5 * HOUR)]}
+
+    assert compute_free_slots(windows, busy, MONDAY, MONDAY + 24 * HOUR, HOUR) == {1: []}
+    assert compute_free_slots(
+        windows, {}, MONDAY + 10 * HOUR, MONDAY + 11 * HOUR, HOUR
+    ) == {1: [(MONDAY + 10 * HOUR, MONDAY + 11 * HOUR)]}
+
+
+def test_igual_forca_bruta_varios_campos():
+    """[POS] Janelas sobrepostas, meia-noite e reservas aleatórias em 3 campos."""
+    rnd = random.Random(3)
+    start, end = MONDAY + 5 * HOUR, MONDAY + 10 * 24 * HOUR
+    windows, busy = {}, {}
+    for field_id in (1, 2, 3):
+        windows[field_id] = [
+            (rnd.randrange(7), time(rnd.randrange(24), rnd.choice((0, 30))),
+             time(rnd.randrange(24), rnd.choice((0, 30))))
+            for _ in range(6)
+        ]
+        busy[field_id] = []
+        for _ in range(15):
+            b_start = start + timedelta(minutes=30 * rnd.randrange(480))
+            busy[field_id].append((b_start, b_start + timedelta(minutes=30 * rnd.randint(1, 6))))
+
+    slots = compute_free_slots(windows, busy, start, end, HOUR)
+
+    for field_id in (1, 2, 3):
+        assert slots[field_id] == _brute_force(
+            windows[field_id], busy[field_id], start, end, HOUR
+        )
+
+
+def test_rota_slots(client, db_session):
+    """[POS] /field/{id}/slots ignora reservas canceladas."""
+    center = SportsCenter(
+        user_id=uuid.uuid4(), name="Centro", cnpj="33333333000133",
+        latitude=-18.9, longitude=-48.2,
+    )
+    db_session.add(center)
+    db_session.flush()
+    field = Field(center.id, "Campo 1", "futebol", 100)
+    db_session.add(field)
+    db_session.flush()
+    db_session.add(Availability(field.id, 1, datetime(2026, 1, 1, 18), datetime(2026, 1, 1, 22)))
+    user_id = uuid.uuid4()
+    db_session.add(Booking(user_id, field.id, 1, MONDAY + 19 * HOUR, MONDAY + 20 * HOUR))
+    db_session.add(
+        Booking(user_id, field.id, 1, MONDAY + 21 * HOUR, MONDAY + 22 * HOUR, "cancelled")
+    )
+    db_session.commit()
+
+    resp = client.get(
+        f"{FIELD_ROUTE}/{field.id}/slots",
+        params={"from": MONDAY.isoformat(), "to": (MONDAY + 24 * HOUR).isoformat()},
+    )
+
+    assert resp.status_code == 200
+    assert resp.json() == [
+        {"start": "2026-10-19T18:00:00", "end": "2026-10-19T19:00:00"},
+        {"start": "2026-10-19T20:00:00", "end": "2026-10-19T22:00:00"},
+    ]
+
+
+def test_rota_slots_parametros_invalidos(client):
+    """[NEG] 'to' antes de 'from' -> 422; campo inexistente -> 404."""
+    params = {"from": "2026-10-20T00:00:00", "to": "2026-10-19T00:00:00"}
+    assert client.get(f"{FIELD_ROUTE}/1/slots", params=params).status_code == 422
+
+    params = {"from": "2026-10-19T00:00:00", "to": "2026-10-20T00:00:00"}
+    assert client.get(f"{FIELD_ROUTE}/999/slots", params=params).status_code == 404
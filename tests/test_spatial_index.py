@@ -0,0 +1,178 @@
+import asyncio
+import random
+import uuid
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from models.models import SportsCenter
+from services.spatial_index import SpatialIndex, spatial_index
+from utils.geo import haversine_km
+
+API_PREFIX = "/api/v1"
+SPORTS_CENTER_ROUTE = f"{API_PREFIX}/sports_center"
+
+
+def _random_points(n, seed=7):
+    rnd = random.Random(seed)
+    return {
+        i: (rnd.uniform(-20.0, -18.0), rnd.uniform(-49.0, -47.0)) for i in range(1, n + 1)
+    }
+
+
+def _brute_box(points, lat_min, lat_max, lon_min, lon_max):
+    return sorted(
+        i
+        for i, (lat, lon) in points.items()
+        if lat_min <= lat <= lat_max and lon_min <= lon <= lon_max
+    )
+
+
+def test_query_box_igual_forca_bruta():
+    """[POS] Consulta por caixa devolve exatamente os pontos de dentro."""
+    points = _random_points(5000)
+    index = SpatialIndex()
+    index.build(points)
+
+    rnd = random.Random(1)
+    for _ in range(50):
+        lat, lon = rnd.uniform(-20, -18), rnd.uniform(-49, -47)
+        box = (lat, lat + rnd.uniform(0, 0.5), lon, lon + rnd.uniform(0, 0.5))
+        assert sorted(index.query_box(*box)) == _brute_box(points, *box)
+
+
+def test_nearby_ordenado_e_limitado():
+    """[POS] nearby = k mais próximos dentro do raio, em ordem de distância."""
+    points = _random_points(5000)
+    index = SpatialIndex()
+    index.build(points)
+    lat, lon = -19.0, -48.0
+
+    expected = sorted(
+        (haversine_km(lat, lon, *p), i)
+        for i, p in points.items()
+        if haversine_km(lat, lon, *p) <= 10
+    )[:15]
+    found = index.nearby(lat, lon, 10, 15)
+
+    assert [i for i, _ in found] == [i for _, i in expected]
+    assert found[0][1] == pytest.approx(expected[0][0])
+
+
+def test_escritas_incrementais():
+    """[POS] upsert/remove aparecem nas consultas antes e depois do rebuild."""
+    points = _random_points(200)
+    index = SpatialIndex(min_rebuild=10, rebuild_ratio=0)
+    index.build(points)
+    box = (-19.01, -18.99, -48.01, -47.99)
+
+    index.upsert(9999, -19.0, -48.0)  # novo
+    index.upsert(1, -19.0, -48.005)  # movido para dentro da caixa
+    assert {1, 9999} <= set(index.query_box(*box))
+
+    index.remove(9999)
+    assert 9999 not in index.query_box(*box)
+
+    for i in range(2, 10):  # 10 ids pendentes: reconstrói a árvore
+        index.upsert(i, -19.0, -48.0)
+    assert not index._delta and not index._removed
+    assert set(range(1, 10)) == set(index.query_box(*box))
+
+
+class _SlowSession:
+    """Sessão falsa cujo SELECT só responde quando o teste libera."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def execute(self, statement):
+        self.started.set()
+        await self.release.wait()
+        return self.rows
+
+
+def test_escritas_durante_load_sao_reaplicadas():
+    """[POS] upsert/remove feitos com o load suspenso sobrevivem à troca da árvore."""
+    index = SpatialIndex()
+    index.build({1: (-19.0, -48.0), 2: (-19.0, -48.0)})
+    session = _SlowSession([(1, -19.0, -48.0), (2, -19.0, -48.0)])
+    box = (-19.01, -18.99, -48.01, -47.99)
+
+    async def scenario():
+        load = asyncio.create_task(index.load(session))
+        await session.started.wait()
+        index.upsert(3, -19.0, -48.0)  # criado depois do SELECT
+        index.remove(2)  # apagado depois do SELECT
+        session.release.set()
+        await load
+
+    asyncio.run(scenario())
+    assert sorted(index.query_box(*box)) == [1, 3]
+
+
+def test_rebuild_fora_do_loop_preserva_escritas():
+    """[POS] O rebuild roda numa thread e as escritas feitas no meio tempo ficam."""
+    index = SpatialIndex(min_rebuild=5, rebuild_ratio=0)
+    index.build(_random_points(200))
+    box = (-19.01, -18.99, -48.01, -47.99)
+
+    async def scenario():
+        for i in range(1, 6):  # 5 ids pendentes: agenda o rebuild
+            index.upsert(i, -19.0, -48.0)
+        task = index._rebuild_task
+        assert task is not None and not task.done()
+        assert index._removed  # ainda não trocou: a escrita não bloqueou
+        await asyncio.sleep(0)  # a construção começa e vai para a thread
+        index.upsert(6, -19.0, -48.0)  # chega durante a construção
+        await task
+
+    asyncio.run(scenario())
+    assert index._delta == {6: (-19.0, -48.0)}
+    assert set(range(1, 7)) == set(index.query_box(*box))
+
+
+def test_rotas_resolvem_pelo_indice(client, db_session, async_engine):
+    """[POS] Com o índice carregado, create/delete o mantêm e /nearby o usa."""
+    center = SportsCenter(
+        user_id=uuid.uuid4(),
+        name="Já no banco",
+        cnpj="11111111000111",
+        latitude=-18.9186,
+        longitude=-48.2772,
+    )
+    db_session.add(center)
+    db_session.commit()
+
+    async def load():
+        async with async_sessionmaker(async_engine)() as session:
+            await spatial_index.load(session)
+
+    asyncio.run(load())
+    try:
+        resp = client.post(
+            f"{SPORTS_CENTER_ROUTE}/create",
+            json={
+                "user_id": str(uuid.uuid4()),
+                "name": "Criado depois",
+                "cnpj": "22222222000122",
+                "latitude": -18.9200,
+                "longitude": -48.2772,
+            },
+        )
+        assert resp.status_code == 201
+        new_id = resp.json()["id"]
+        assert len(spatial_index) == 2
+
+        params = {"lat": -18.9186, "lon": -48.2772, "radius_km": 1}
+        names = [
+            item["sports_center"]["name"]
+            for item in client.get(f"{SPORTS_CENTER_ROUTE}/nearby", params=params).json()
+        ]
+        assert names == ["Já no banco", "Criado depois"]
+
+        assert client.delete(f"{SPORTS_CENTER_ROUTE}/{new_id}").status_code == 200
+        assert spatial_index.query_box(-19.0, -18.9, -48.3, -48.2) == [center.id]
+    finally:
+        spatial_index.clear()
@@ -0,0 +1,60 @@
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from core.sql_instrumentation import SQLInstrumentationMiddleware, instrument_engine
+
+
+@pytest.fixture
+def instrumented_client(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'sql.db'}", poolclass=NullPool
+    )
+    instrument_engine(engine.sync_engine)
+
+    app = FastAPI()
+    app.add_middleware(SQLInstrumentationMiddleware, n_plus_one_threshold=3)
+
+    @app.get("/queries/{n}")
+    async def run_queries(n: int):
+        async with engine.connect() as conn:
+            for _ in range(n):
+                await conn.execute(text("SELECT 1"))
+        return {"ok": True}
+
+    @app.get("/no-db")
+    async def no_db():
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+def test_headers_report_query_count(instrumented_client):
+    """[POS] Server-Timing e X-DB-Query-Count refletem as queries do request."""
+    resp = instrumented_client.get("/queries/2")
+
+    assert resp.status_code == 200
+    assert resp.headers["x-db-query-count"] == "2"
+    assert resp.headers["server-timing"].startswith("db;dur=")
+    assert 'desc="2 queries"' in resp.headers["server-timing"]
+
+
+def test_repeated_statement_flagged_as_n_plus_one(instrumented_client, caplog):
+    """[NEG] Statement idêntico repetido acima do limite gera alerta de N+1."""
+    with caplog.at_level(logging.INFO, logger="core.sql_instrumentation"):
+        instrumented_client.get("/queries/1")
+        assert "N+1" not in caplog.text
+
+        instrumented_client.get("/queries/3")
+        assert "possível N+1, statement executado 3 vezes: SELECT 1" in caplog.text
+
+
+def test_request_without_queries(instrumented_client):
+    """[POS] Request sem acesso ao banco reporta zero queries."""
+    resp = instrumented_client.get("/no-db")
+    assert resp.headers["x-db-query-count"] == "0"
@@ -0,0 +1,184 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from models.models import SportsCenter
+from services.occupancy_service import occupancy_index
+from utils.geo import geohash_encode
+
+API_PREFIX = "/api/v1"
+CENTER_ROUTE = f"{API_PREFIX}/sports_center"
+FIELD_ROUTE = f"{API_PREFIX}/field"
+AVAILABILITY_ROUTE = f"{API_PREFIX}/availability"
+BOOKING_ROUTE = f"{API_PREFIX}/bookings"
+REVIEW_ROUTE = f"{API_PREFIX}/review"
+
+MONDAY = datetime(2026, 10, 19)
+HOUR = timedelta(hours=1)
+
+
+@pytest.fixture
+def statements(async_engine):
+    """Statements SQL executados pelo engine assíncrono durante o teste."""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement.split()[0].upper())
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+
+def _center(client, cnpj="12345678000190"):
+    resp = client.post(
+        f"{CENTER_ROUTE}/create",
+        json={
+            "user_id": str(uuid.uuid4()),
+            "name": "Centro",
+            "cnpj": cnpj,
+            "latitude": -18.9186,
+            "longitude": -48.2772,
+        },
+    )
+    assert resp.status_code == 201
+    return resp.json()["id"]
+
+
+def _field(client, center_id, name="Quadra 1"):
+    return client.post(
+        f"{FIELD_ROUTE}/create",
+        json={
+            "sports_center_id": center_id,
+            "name": name,
+            "field_type": "futsal",
+            "price_per_hour": 100,
+        },
+    )
+
+
+def test_escritas_em_um_statement(client, db_session, statements):
+    """[POS] Create, PATCH e DELETE de campo: um statement SQL cada."""
+    center_id = _center(client)
+
+    statements.clear()
+    resp = _field(client, center_id)
+    assert resp.status_code == 201
+    assert statements == ["INSERT"]
+    field_id = resp.json()["id"]
+
+    statements.clear()
+    resp = client.patch(f"{FIELD_ROUTE}/{field_id}", json={"price_per_hour": 150})
+    assert resp.status_code == 200
+    assert resp.json()["field"]["price_per_hour"] == 150
+    assert statements == ["UPDATE"]
+
+    statements.clear()
+    assert client.delete(f"{FIELD_ROUTE}/{field_id}").status_code == 200
+    assert statements == ["DELETE"]
+
+
+def test_duplicatas_rejeitadas_pelo_banco(client, db_session):
+    """[NEG] CNPJ, nome de campo e disponibilidade repetidos -> 409."""
+    center_id = _center(client)
+    resp = client.post(
+        f"{CENTER_ROUTE}/create",
+        json={
+            "user_id": str(uuid.uuid4()),
+            "name": "Outro",
+            "cnpj": "12345678000190",
+            "latitude": 0,
+            "longitude": 0,
+        },
+    )
+    assert resp.status_code == 409
+    assert resp.json()["detail"] == "CNPJ já cadastrado"
+
+    field_id = _field(client, center_id).json()["id"]
+    resp = _field(client, center_id)
+    assert resp.status_code == 409
+    assert _field(client, center_id, name="Quadra 2").status_code == 201
+
+    payload = {
+        "field_id": field_id,
+        "day_of_week": 1,
+        "start_time": (MONDAY + 8 * HOUR).isoformat(),
+        "end_time": (MONDAY + 22 * HOUR).isoformat(),
+    }
+    assert client.post(f"{AVAILABILITY_ROUTE}/create", json=payload).status_code == 201
+    resp = client.post(f"{AVAILABILITY_ROUTE}/create", json=payload)
+    assert resp.status_code == 409
+    assert resp.json()["detail"] == "Disponibilidade já existe para esse campo e horário."
+
+
+def test_inexistente_responde_404(client, db_session):
+    """[NEG] PATCH/DELETE de id inexistente -> 404 (o RETURNING volta vazio)."""
+    assert client.patch(f"{FIELD_ROUTE}/999", json={"name": "x"}).status_code == 404
+    assert client.delete(f"{FIELD_ROUTE}/999").status_code == 404
+    assert client.patch(
+        f"{AVAILABILITY_ROUTE}/999", json={"day_of_week": 2}
+    ).status_code == 404
+    assert client.delete(f"{AVAILABILITY_ROUTE}/999").status_code == 404
+    booking = {
+        "user_id": str(uuid.uuid4()),
+        "field_id": 1,
+        "start_time": (MONDAY + 19 * HOUR).isoformat(),
+        "end_time": (MONDAY + 20 * HOUR).isoformat(),
+    }
+    assert client.patch(f"{BOOKING_ROUTE}/999", json=booking).status_code == 404
+    assert client.delete(f"{BOOKING_ROUTE}/999").status_code == 404
+    assert client.delete(f"{REVIEW_ROUTE}/999").status_code == 404
+    assert client.delete(f"{CENTER_ROUTE}/999").status_code == 404
+
+
+def test_patch_de_coordenadas_recalcula_geohash(client, db_session):
+    """[POS] Mudar as coordenadas atualiza o geohash no mesmo UPDATE."""
+    center_id = _center(client)
+    resp = client.patch(
+        f"{CENTER_ROUTE}/update/{center_id}",
+        json={"latitude": -23.5, "longitude": -46.6},
+    )
+    assert resp.status_code == 200
+    assert resp.json()["latitude"] == -23.5
+
+    center = db_session.get(SportsCenter, center_id)
+    assert center.geohash == geohash_encode(-23.5, -46.6)
+
+
+def test_patch_de_uma_coordenada_e_rejeitado(client, db_session):
+    """[NEG] Só latitude (ou longitude nula) -> 422, o geohash não fica velho."""
+    center_id = _center(client)
+    url = f"{CENTER_ROUTE}/update/{center_id}"
+    assert client.patch(url, json={"latitude": -23.5}).status_code == 422
+    assert client.patch(
+        url, json={"latitude": -23.5, "longitude": None}
+    ).status_code == 422
+
+
+def test_patch_de_disponibilidade_invalida_campo_antigo(client, db_session):
+    """[POS] Mover a disponibilidade de campo invalida a ocupação dos dois."""
+    center_id = _center(client)
+    old_field = _field(client, center_id).json()["id"]
+    new_field = _field(client, center_id, name="Quadra 2").json()["id"]
+    resp = client.post(
+        f"{AVAILABILITY_ROUTE}/create",
+        json={
+            "field_id": old_field,
+            "day_of_week": 1,
+            "start_time": (MONDAY + 8 * HOUR).isoformat(),
+            "end_time": (MONDAY + 22 * HOUR).isoformat(),
+        },
+    )
+    availability_id = resp.json()["id"]
+    occupancy_index.available.set(old_field, "cached")
+    occupancy_index.available.set(new_field, "cached")
+
+    resp = client.patch(
+        f"{AVAILABILITY_ROUTE}/{availability_id}", json={"field_id": new_field}
+    )
+    assert resp.status_code == 200
+    assert occupancy_index.available.get(old_field) is None
+    assert occupancy_index.available.get(new_field) is None
+    occupancy_index.clear()
@@ -0,0 +1,102 @@
+"""
+Resultado por item das operações em lote (/bulk/*).
+
+Cada item recebe {"index", "status"} e, conforme o caso, "id" ou "detail".
+Itens rejeitados não impedem os demais, a menos que a requisição peça
+`atomic` (aí nada é gravado e a rota responde 409).
+
+As checagens de duplicata/existência são feitas antes do INSERT, numa query
+cada; uma escrita concorrente ainda pode bater numa constraint no INSERT.
+`insert_rows` então refaz o lote item a item (ON CONFLICT DO NOTHING, sem
+SAVEPOINT), para a rejeição continuar sendo por item e não um erro do lote
+inteiro.
+"""
+from fastapi import HTTPException
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class BulkResult:
+    def __init__(self, size: int):
+        self.results: list[dict | None] = [None] * size
+        self.rejected = 0
+
+    def ok(self, index: int, status: str, id: int) -> None:
+        self.results[index] = {"index": index, "status": status, "id": id}
+
+    def reject(self, index: int, status: str, detail: str) -> None:
+        self.results[index] = {"index": index, "status": status, "detail": detail}
+        self.rejected += 1
+
+    def summary(self, done: str) -> dict:
+        # Itens sem resultado foram aceitos mas não gravados (lote atômico)
+        results = [
+            r if r is not None else {"index": i, "status": "skipped"}
+            for i, r in enumerate(self.results)
+        ]
+        return {
+            done: sum(1 for r in results if "id" in r),
+            "rejected": self.rejected,
+            "results": results,
+        }
+
+
+def _insert_skipping(db: AsyncSession, model, unique: tuple[str, ...]):
+    # INSERT ... ON CONFLICT (unique) DO NOTHING: a duplicata não devolve linha
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    return dialect_insert(model).on_conflict_do_nothing(index_elements=list(unique))
+
+
+async def insert_rows(
+    db: AsyncSession,
+    model,
+    result: BulkResult,
+    accepted,
+    rows,
+    atomic: bool,
+    unique: tuple[str, ...],
+    duplicate: str,
+) -> list[dict]:
+    """
+    INSERT ... RETURNING id das linhas aceitas e commit; devolve as linhas
+    gravadas. Se o lote bater no índice único `unique` (corrida), refaz item
+    a item com ON CONFLICT DO NOTHING e rejeita as duplicatas com `duplicate`.
+    """
+    try:
+        ids = (
+            await db.execute(
+                insert(model).returning(model.id, sort_by_parameter_order=True), rows
+            )
+        ).scalars()
+        inserted = list(zip(accepted, rows, ids))
+    except IntegrityError:
+        await db.rollback()
+        statement = _insert_skipping(db, model, unique)
+        inserted = []
+        for index, row in zip(accepted, rows):
+            new_id = (
+                await db.execute(statement.values(row).returning(model.id))
+            ).scalar_one_or_none()
+            if new_id is None:
+                result.reject(index, "duplicate", duplicate)
+            else:
+                inserted.append((index, row, new_id))
+        if atomic and result.rejected:
+            await db.rollback()
+            return []
+
+    await db.commit()
+    for index, _, new_id in inserted:
+        result.ok(index, "created", new_id)
+    return [row for _, row, _ in inserted]
+
+
+def bulk_response(summary: dict, atomic: bool) -> dict:
+    """Lote atômico com rejeições -> 409 com os resultados por item."""
+    if atomic and summary["rejected"]:
+        raise HTTPException(status_code=409, detail=summary)
+    return summary
@@ -0,0 +1,74 @@
+"""
+GET condicional por id: ETag forte a partir da coluna `version` da linha.
+
+Todo UPDATE em sports_centers, fields e availabilities incrementa `version`
+no mesmo statement (`update_returning`, `rating_delta`) ou logo depois, na
+mesma transação (`bump_versions`, para os UPDATEs em lote). A ETag é
+"<schema>-<versão>": o prefixo é um hash do response_model, então mudar o
+formato da resposta num deploy invalida as ETags antigas.
+
+Com If-None-Match, `not_modified` lê só a versão (pela chave primária) e
+responde 304 sem carregar a linha nem serializar nada.
+"""
+import hashlib
+import json
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def bump_versions(model, ids):
+    """UPDATE que incrementa a versão das linhas `ids` (após um UPDATE em lote)."""
+    return (
+        update(model)
+        .where(model.id.in_(ids))
+        .values(version=model.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Comparação fraca do RFC 9110 (W/ ignorado), com lista e "*"."""
+    if if_none_match.strip() == "*":
+        return True
+    tags = (tag.strip() for tag in if_none_match.split(","))
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in tags)
+
+
+class EntityETag:
+    """ETag e Cache-Control do GET por id de um router."""
+
+    def __init__(self, model, schema: type[BaseModel], cache_control: str):
+        self.model = model
+        self.cache_control = cache_control
+        shape = json.dumps(schema.model_json_schema(), sort_keys=True).encode()
+        self.prefix = hashlib.sha1(shape).hexdigest()[:8]
+
+    def etag(self, version: int) -> str:
+        return f'"{self.prefix}-{version}"'
+
+    async def not_modified(
+        self, request: Request, db: AsyncSession, id: int
+    ) -> Response | None:
+        """304 se If-None-Match bate com a versão atual; None caso contrário."""
+        header = request.headers.get("if-none-match")
+        if not header:
+            return None
+        version = (
+            await db.execute(select(self.model.version).where(self.model.id == id))
+        ).scalar_one_or_none()
+        if version is None or not etag_matches(header, self.etag(version)):
+            return None
+        return Response(
+            status_code=304,
+            headers={"ETag": self.etag(version), "Cache-Control": self.cache_control},
+        )
+
+    def tag(self, response: Response, entity) -> None:
+        """Cabeçalhos da resposta 200; sem `version` (ex.: mocks), só Cache-Control."""
+        response.headers["Cache-Control"] = self.cache_control
+        version = getattr(entity, "version", None)
+        if version is not None:
+            response.headers["ETag"] = self.etag(version)
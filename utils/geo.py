@@ -0,0 +1,123 @@
+"""
+Funções geográficas: distância haversine e geohash.
+
+O geohash de um ponto é guardado em sports_centers.geohash (índice B-tree).
+Uma busca por raio vira poucas faixas de prefixo nesse índice, o que funciona
+igual em PostgreSQL e SQLite, sem extensão espacial.
+"""
+import math
+
+EARTH_RADIUS_KM = 6371.0088
+
+GEOHASH_PRECISION = 9  # ~4,8 m x 4,8 m
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def geohash_encode(lat: float, lon: float, precision: int = GEOHASH_PRECISION) -> str:
+    lat_lo, lat_hi = -90.0, 90.0
+    lon_lo, lon_hi = -180.0, 180.0
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True  # bits pares são longitude
+    while len(chars) < precision:
+        if even:
+            mid = (lon_lo + lon_hi) / 2
+            if lon >= mid:
+                bits = bits * 2 + 1
+                lon_lo = mid
+            else:
+                bits = bits * 2
+                lon_hi = mid
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            if lat >= mid:
+                bits = bits * 2 + 1
+                lat_lo = mid
+            else:
+                bits = bits * 2
+                lat_hi = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return "".join(chars)
+
+
+def geohash_cell_size(precision: int) -> tuple[float, float]:
+    """(altura, largura) em graus de uma célula com `precision` caracteres."""
+    lon_bits = (5 * precision + 1) // 2
+    lat_bits = (5 * precision) // 2
+    return 180.0 / 2**lat_bits, 360.0 / 2**lon_bits
+
+
+def bounding_box(lat: float, lon: float, radius_km: float) -> tuple[float, float, float, float]:
+    """(lat_min, lat_max, lon_min, lon_max) que contém o círculo."""
+    dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    cos_lat = math.cos(math.radians(lat))
+    # Perto dos polos o círculo cobre todas as longitudes
+    if cos_lat < 1e-6 or dlat / cos_lat >= 180:
+        dlon = 180.0
+    else:
+        dlon = min(180.0, dlat / cos_lat)
+    return (
+        max(-90.0, lat - dlat),
+        min(90.0, lat + dlat),
+        max(-180.0, lon - dlon),
+        min(180.0, lon + dlon),
+    )
+
+
+def covering_cells(lat: float, lon: float, radius_km: float, max_cells: int = 16) -> list[str]:
+    """
+    Prefixos de geohash cuja união cobre o círculo (lat, lon, radius_km).
+
+    Usa a maior precisão que cubra a bounding box do círculo com até
+    `max_cells` células; mais precisão = menos linhas candidatas.
+    """
+    lat_min, lat_max, lon_min, lon_max = bounding_box(lat, lon, radius_km)
+
+    precision = 1
+    for p in range(2, GEOHASH_PRECISION + 1):
+        h, w = geohash_cell_size(p)
+        rows = math.floor(lat_max / h) - math.floor(lat_min / h) + 1
+        cols = math.floor(lon_max / w) - math.floor(lon_min / w) + 1
+        if rows * cols > max_cells:
+            break
+        precision = p
+
+    h, w = geohash_cell_size(precision)
+    cells = set()
+    # Uma amostra por célula (passo = tamanho da célula), mais as bordas
+    lats = _steps(lat_min, lat_max, h)
+    lons = _steps(lon_min, lon_max, w)
+    for y in lats:
+        for x in lons:
+            cells.add(geohash_encode(y, x, precision))
+    return sorted(cells)
+
+
+def _steps(lo: float, hi: float, step: float) -> list[float]:
+    values = []
+    v = lo
+    while v < hi:
+        values.append(v)
+        v += step
+    values.append(hi)
+    return values
+
+
+def prefix_range(prefix: str) -> tuple[str, str]:
+    """Intervalo [lo, hi] de geohashes completos que começam com `prefix`."""
+    # Só caracteres alfanuméricos: a ordem é a mesma em qualquer collation
+    return prefix, prefix + "z" * (GEOHASH_PRECISION - len(prefix))
@@ -0,0 +1,104 @@
+"""
+Pool de processos para bcrypt.
+
+Este módulo é importado pelos processos worker, então depende só de
+passlib/bcrypt (nada de settings, banco ou rotas).
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from passlib.context import CryptContext
+
+# passlib 1.7 procura bcrypt.__about__ (removido no bcrypt 4.1+) e só loga o erro
+logging.getLogger("passlib").setLevel(logging.ERROR)
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+class HashingUnavailable(Exception):
+    """Pool de hashing saturado ou sem resposta a tempo (a API responde 503)."""
+
+
+def hash_password(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def check_password(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+class HashingPool:
+    """
+    Executa hash/verify do bcrypt fora do event loop, num pool de processos.
+
+    - workers: tamanho do pool (None = nº de CPUs; 0 = threads, sem processos)
+    - queue_depth: quantos pedidos podem esperar além dos que estão rodando;
+      acima disso levanta HashingUnavailable em vez de enfileirar indefinidamente
+    - timeout: segundos máximos de espera por um resultado (HashingUnavailable
+      ao estourar)
+    """
+
+    def __init__(
+        self, workers: int | None = None, queue_depth: int = 32, timeout: float = 5.0
+    ):
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.queue_depth = queue_depth
+        self.timeout = timeout
+        self.pending = 0
+        self._lock = threading.Lock()
+        self._executor: Executor | None = None
+
+    @property
+    def max_pending(self) -> int:
+        return max(self.workers, 1) + self.queue_depth
+
+    def start(self) -> None:
+        if self._executor is not None:
+            return
+        if self.workers == 0:
+            self._executor = ThreadPoolExecutor(max_workers=1)
+        else:
+            # spawn: o worker não herda engines/conexões do processo da API
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+    def _release(self, _future=None) -> None:
+        # Chamado pela thread do executor quando o job termina de fato
+        with self._lock:
+            self.pending -= 1
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def run(self, fn, *args):
+        if self.pending >= self.max_pending:
+            raise HashingUnavailable("Server busy, try again later")
+        self.start()
+        with self._lock:
+            self.pending += 1
+        try:
+            submitted = self._executor.submit(fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        # O slot só é liberado quando o job termina: um bcrypt que estourou o
+        # timeout continua ocupando o worker e precisa continuar contando
+        submitted.add_done_callback(self._release)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(submitted), self.timeout)
+        except asyncio.TimeoutError:
+            raise HashingUnavailable("Password hashing timed out")
+
+    async def hash(self, password: str) -> str:
+        return await self.run(hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self.run(check_password, plain_password, hashed_password)
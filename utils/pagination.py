@@ -0,0 +1,76 @@
+"""
+Paginação por keyset (cursor).
+
+A listagem é ordenada por colunas indexadas que terminam no id (ordem
+estável). O cursor guarda os valores dessas colunas no último item da página,
+codificados em base64 (opaco para o cliente); a próxima página começa logo
+depois dele com `(col1, col2, ...) > (v1, v2, ...)`, sem OFFSET.
+
+O corpo da resposta continua sendo a lista de itens; a próxima página vem nos
+cabeçalhos `X-Next-Cursor` e `Link: <...>; rel="next"`.
+"""
+import base64
+import json
+from datetime import datetime
+
+from fastapi import HTTPException, Request, Response
+from sqlalchemy import literal, tuple_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(values) -> str:
+    raw = json.dumps(
+        [v.isoformat() if isinstance(v, datetime) else v for v in values],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, types) -> tuple:
+    """Valores do cursor convertidos para `types`; ValueError se inválido."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError
+        return tuple(
+            datetime.fromisoformat(v) if t is datetime else t(v)
+            for t, v in zip(types, values)
+        )
+    except (ValueError, TypeError):
+        raise ValueError("Cursor inválido.") from None
+
+
+def cursor_values(cursor: str | None, types) -> tuple | None:
+    """Cursor da query string -> valores do keyset (400 se inválido)."""
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor, types)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def keyset(query, columns, after=None, descending: bool = False, limit: int = 0):
+    """Ordena por `columns`, começa depois de `after` e busca limit + 1 linhas."""
+    if after is not None:
+        # Valores com o tipo da coluna: o bind segue o formato/precisão gravados
+        key = tuple_(*columns)
+        values = tuple_(*(literal(v, type_=c.type) for c, v in zip(columns, after)))
+        query = query.where(key < values if descending else key > values)
+    order = [c.desc() for c in columns] if descending else list(columns)
+    return query.order_by(*order).limit(limit + 1)
+
+
+def paginate(request: Request, response: Response, items, limit: int, key) -> list:
+    """Corta a linha excedente e, se houver, anuncia a próxima página."""
+    if len(items) <= limit:
+        return items
+    items = items[:limit]
+    cursor = encode_cursor(key(items[-1]))
+    response.headers["X-Next-Cursor"] = cursor
+    next_url = request.url.include_query_params(cursor=cursor)
+    response.headers["Link"] = f'<{next_url}>; rel="next"'
+    return items
@@ -0,0 +1,57 @@
+"""
+Regras de recorrência semanal: dias da semana (0 = domingo), horário de
+início e fim, intervalo de datas e datas de exceção.
+
+Janelas com fim <= início atravessam a meia-noite e terminam no dia seguinte.
+"""
+from datetime import date, datetime, time, timedelta
+
+MAX_RECURRENCE_DAYS = 366
+
+
+def day_of_week(d: date) -> int:
+    """0 = domingo, 1 = segunda, ... (convenção das tabelas)."""
+    return d.isoweekday() % 7
+
+
+def window_datetimes(d: date, start: time, end: time) -> tuple[datetime, datetime]:
+    """Início e fim da janela que começa no dia `d`."""
+    s = datetime.combine(d, start)
+    e = datetime.combine(d, end)
+    if e <= s:
+        e += timedelta(days=1)
+    return s, e
+
+
+def first_on_or_after(d: date, dow: int) -> date:
+    """Primeira data >= `d` que cai no dia da semana `dow`."""
+    return d + timedelta(days=(dow - day_of_week(d)) % 7)
+
+
+def expand_weekly(
+    days_of_week,
+    start: time,
+    end: time,
+    starts_on: date,
+    ends_on: date,
+    except_dates=(),
+) -> list[tuple[datetime, datetime]]:
+    """Ocorrências [(início, fim)] em ordem, de starts_on a ends_on inclusive."""
+    skip = set(except_dates)
+    occurrences = []
+    for dow in set(days_of_week):
+        d = first_on_or_after(starts_on, dow)
+        while d <= ends_on:
+            if d not in skip:
+                occurrences.append(window_datetimes(d, start, end))
+            d += timedelta(days=7)
+    occurrences.sort()
+    return occurrences
+
+
+def first_overlap(occurrences) -> int | None:
+    """Índice da primeira ocorrência (ordenadas) que invade a anterior."""
+    for i in range(1, len(occurrences)):
+        if occurrences[i][0] < occurrences[i - 1][1]:
+            return i
+    return None
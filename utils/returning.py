@@ -0,0 +1,71 @@
+"""
+Escritas em um statement: INSERT/UPDATE/DELETE ... RETURNING.
+
+Sem SELECT prévio, quem garante unicidade é o banco; `is_unique_violation`
+diz qual constraint o IntegrityError violou (PostgreSQL cita o nome, SQLite
+as colunas). `update_returning` devolve a linha atualizada e, quando o
+chamador precisa invalidar caches do estado anterior, valores de antes do
+UPDATE. Tabelas com coluna `version` (ETag) têm a versão incrementada no
+mesmo UPDATE.
+"""
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+
+def is_unique_violation(
+    error: IntegrityError, table: str, columns: tuple[str, ...], name: str | None = None
+) -> bool:
+    """IntegrityError veio do unique de `columns` em `table`?"""
+    message = str(error.orig)
+    # Sem nome explícito, o PostgreSQL usa <tabela>_<colunas>_key
+    name = name or f"{table}_{'_'.join(columns)}_key"
+    sqlite = "UNIQUE constraint failed: " + ", ".join(f"{table}.{c}" for c in columns)
+    return f'"{name}"' in message or sqlite in message
+
+
+async def update_returning(
+    db: AsyncSession, model, id: int, values: dict, old: tuple[str, ...] = ()
+):
+    """
+    UPDATE da linha `id` com RETURNING; devolve (linha, valores antigos de
+    `old`) ou (None, None) se não existir.
+
+    No PostgreSQL os valores antigos vêm do mesmo statement (UPDATE ... FROM
+    a própria tabela: o FROM enxerga a versão anterior da linha). O SQLite
+    não aceita colunas do FROM no RETURNING; lá eles vêm de um SELECT antes.
+    """
+    if not values:
+        return await db.get(model, id), None
+    if "version" in model.__table__.c:
+        values = {**values, "version": model.version + 1}
+
+    statement = (
+        update(model)
+        .where(model.id == id)
+        .values(values)
+        .execution_options(synchronize_session=False)
+    )
+    if not old:
+        row = await db.execute(statement.returning(model))
+        return row.scalar_one_or_none(), None
+
+    if db.get_bind().dialect.name == "postgresql":
+        previous = aliased(model)
+        row = (
+            await db.execute(
+                statement.where(previous.id == model.id).returning(
+                    model, *(getattr(previous, c) for c in old)
+                )
+            )
+        ).one_or_none()
+        return (row[0], tuple(row[1:])) if row else (None, None)
+
+    previous = (
+        await db.execute(select(*(getattr(model, c) for c in old)).where(model.id == id))
+    ).one_or_none()
+    if previous is None:
+        return None, None
+    row = await db.execute(statement.returning(model))
+    return row.scalar_one(), tuple(previous)
@@ -1,22 +1,54 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+import hashlib
+import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 import uuid
 from typing import Union
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
-from passlib.context import CryptContext
 
+from core.cache import TTLCache
 from core.config import settings
 from core.database import get_db
 from models.models import User
+from utils.hashing import HashingPool, check_password, hash_password
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/users/token")
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+hashing_pool = HashingPool(
+    workers=settings.HASH_POOL_SIZE,
+    queue_depth=settings.HASH_QUEUE_DEPTH,
+    timeout=settings.HASH_TIMEOUT_SECONDS,
+)
+
+
+@dataclass(frozen=True)
+class AuthPrincipal:
+    """Dados mínimos do usuário autenticado (o que fica no cache)."""
+
+    id: uuid.UUID
+    is_active: bool
+    is_admin: bool
+
+
+# Cache do principal por user_id: evita o SELECT em users a cada request
+# autenticado. É por processo; update/deactivate/delete invalidam a entrada
+# local e o TTL limita quanto tempo outro worker pode ver dados antigos.
+auth_user_cache = TTLCache(
+    maxsize=settings.AUTH_USER_CACHE_SIZE, ttl=settings.AUTH_USER_CACHE_TTL_SECONDS
+)
+
+# Cache de tokens já verificados: sha256(token) -> claims. Cada item vale até
+# o `exp` do token (limitado por JWT_CACHE_MAX_TTL_SECONDS), então um token
+# repetido não passa de novo pela verificação HMAC nem pelo parse das claims.
+jwt_cache = TTLCache(
+    maxsize=settings.JWT_CACHE_SIZE, ttl=settings.JWT_CACHE_MAX_TTL_SECONDS
+)
 
 # 1) Mantém o OAuth2 (password) para login automático via Swagger
 oauth2_scheme = OAuth2PasswordBearer(
@@ -45,15 +77,15 @@ def _pick_token(
     )
 
 
-def get_current_user(
-    db: Session = Depends(get_db),
+async def get_current_user(
+    db: AsyncSession = Depends(get_db),
     oauth2_token: str | None = Depends(oauth2_scheme),
     bearer_creds: HTTPAuthorizationCredentials | None = Depends(http_bearer),
-) -> User:
+) -> AuthPrincipal:
     token = _pick_token(oauth2_token, bearer_creds)
 
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = _decode_token(token)
         sub = payload.get("sub")
         if not sub:
             raise ValueError("missing sub")
@@ -65,20 +97,45 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    user = auth_user_cache.get(user_id)
+    if user is None:
+        row = await db.get(User, user_id)
+        if not row:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found"
+            )
+        user = AuthPrincipal(id=row.id, is_active=row.is_active, is_admin=row.is_admin)
+        auth_user_cache.set(user_id, user)
+
     if not user.is_active:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Inactive user")
     return user
 
 
+def get_current_admin(
+    current_user: AuthPrincipal = Depends(get_current_user),
+) -> AuthPrincipal:
+    if not current_user.is_admin:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin only")
+    return current_user
+
+
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return hash_password(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return check_password(plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash no pool de processos; 503 se o pool estiver saturado."""
+    return await hashing_pool.hash(password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verificação no pool de processos; 503 se o pool estiver saturado."""
+    return await hashing_pool.verify(plain_password, hashed_password)
 
 
 def create_access_token(
@@ -94,11 +151,25 @@ def create_access_token(
     return encoded_jwt
 
 
+def _decode_token(token: str) -> dict:
+    """jwt.decode com cache; lança JWTError para token inválido ou expirado."""
+    key = hashlib.sha256(token.encode()).digest()
+    payload = jwt_cache.get(key)
+    if payload is not None:
+        return payload
+
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    ttl = settings.JWT_CACHE_MAX_TTL_SECONDS
+    if "exp" in payload:
+        ttl = min(ttl, payload["exp"] - time.time())
+    if ttl > 0:
+        jwt_cache.set(key, payload, ttl=ttl)
+    return payload
+
+
 def decode_access_token(token: str) -> Optional[str]:
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
+        payload = _decode_token(token)
         return payload.get("sub")
     except JWTError:
         return None